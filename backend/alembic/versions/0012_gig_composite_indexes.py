@@ -0,0 +1,31 @@
+"""Replace single-column gig profile indexes with (profile_id, date) composites
+
+Revision ID: 0012_gig_composite_indexes
+Revises: 0011_pg_trgm
+Create Date: 2026-02-02
+"""
+
+from alembic import op
+
+revision = "0012_gig_composite_indexes"
+down_revision = "0011_pg_trgm"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_gigs_artist_profile_id_date", "gigs", ["artist_profile_id", "date"]
+    )
+    op.create_index(
+        "ix_gigs_venue_profile_id_date", "gigs", ["venue_profile_id", "date"]
+    )
+    op.drop_index("ix_gigs_artist_profile_id", table_name="gigs")
+    op.drop_index("ix_gigs_venue_profile_id", table_name="gigs")
+
+
+def downgrade() -> None:
+    op.create_index("ix_gigs_venue_profile_id", "gigs", ["venue_profile_id"])
+    op.create_index("ix_gigs_artist_profile_id", "gigs", ["artist_profile_id"])
+    op.drop_index("ix_gigs_venue_profile_id_date", table_name="gigs")
+    op.drop_index("ix_gigs_artist_profile_id_date", table_name="gigs")
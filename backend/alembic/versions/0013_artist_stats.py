@@ -0,0 +1,64 @@
+"""Add artist_stats table with precomputed completed-gig stats
+
+Revision ID: 0013_artist_stats
+Revises: 0012_gig_composite_indexes
+Create Date: 2026-02-03
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_artist_stats"
+down_revision = "0012_gig_composite_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "artist_stats",
+        sa.Column("artist_profile_id", sa.String(), primary_key=True),
+        sa.Column("total_gigs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("verified_gigs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attendance_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attendance_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets_sold_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets_sold_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("unique_venues_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revision", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["artist_profile_id"], ["artist_profiles.id"], ondelete="CASCADE"
+        ),
+    )
+
+    # Backfill from existing completed gigs
+    op.execute(
+        """
+        INSERT INTO artist_stats (
+            artist_profile_id, total_gigs, verified_gigs,
+            attendance_sum, attendance_count,
+            tickets_sold_sum, tickets_sold_count, unique_venues_count
+        )
+        SELECT
+            artist_profile_id,
+            count(id),
+            count(id) FILTER (WHERE artist_confirmed AND venue_confirmed),
+            coalesce(sum(attendance), 0),
+            count(attendance),
+            coalesce(sum(tickets_sold), 0),
+            count(tickets_sold),
+            count(DISTINCT venue_profile_id)
+        FROM gigs
+        WHERE status = 'completed'
+        GROUP BY artist_profile_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("artist_stats")
@@ -0,0 +1,25 @@
+"""Add optimistic-concurrency version column to gigs
+
+Revision ID: 0014_gig_version
+Revises: 0013_artist_stats
+Create Date: 2026-02-04
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_gig_version"
+down_revision = "0013_artist_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "gigs",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("gigs", "version")
@@ -0,0 +1,44 @@
+"""Add pending_closeout gig status, upcoming-gig partial index and job_runs
+
+Revision ID: 0015_gig_closeout
+Revises: 0014_gig_version
+Create Date: 2026-02-05
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015_gig_closeout"
+down_revision = "0014_gig_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE gigstatus ADD VALUE IF NOT EXISTS 'pending_closeout'")
+
+    op.create_index(
+        "ix_gigs_upcoming_date",
+        "gigs",
+        ["date"],
+        postgresql_where=sa.text("status = 'upcoming'"),
+    )
+
+    op.create_table(
+        "job_runs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("job_name", sa.String(80), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("rows_affected", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(), nullable=True),
+    )
+    op.create_index("ix_job_runs_job_name", "job_runs", ["job_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_runs_job_name", table_name="job_runs")
+    op.drop_table("job_runs")
+    op.drop_index("ix_gigs_upcoming_date", table_name="gigs")
+    # Enum value removal is a no-op, as in 0009_add_admin_role.
@@ -0,0 +1,99 @@
+"""Add leaderboard materialized views
+
+Revision ID: 0016_leaderboard_rollup
+Revises: 0015_gig_closeout
+Create Date: 2026-02-06
+"""
+
+from alembic import op
+
+revision = "0016_leaderboard_rollup"
+down_revision = "0015_gig_closeout"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_rollup AS
+        SELECT
+            'venue'::text AS entity_type,
+            v.id AS profile_id,
+            v.venue_name AS name,
+            v.city,
+            v.state,
+            lower(btrim(v.city)) AS city_key,
+            lower(btrim(v.state)) AS state_key,
+            count(g.id)::int AS total_gigs,
+            count(g.id) FILTER (WHERE g.artist_confirmed AND g.venue_confirmed)::int
+                AS verified_gigs,
+            sum(g.attendance)::int AS total_attendance,
+            avg(g.attendance) AS avg_attendance,
+            sum(g.tickets_sold)::int AS total_tickets_sold,
+            count(DISTINCT g.artist_profile_id)::int AS unique_counterparts
+        FROM venue_profiles v
+        JOIN gigs g ON g.venue_profile_id = v.id
+        WHERE g.status <> 'cancelled'
+        GROUP BY v.id
+        UNION ALL
+        SELECT
+            'artist'::text,
+            a.id,
+            a.name,
+            a.city,
+            a.state,
+            lower(btrim(a.city)),
+            lower(btrim(a.state)),
+            count(g.id)::int,
+            count(g.id) FILTER (WHERE g.artist_confirmed AND g.venue_confirmed)::int,
+            sum(g.attendance)::int,
+            avg(g.attendance),
+            sum(g.tickets_sold)::int,
+            count(DISTINCT g.venue_profile_id)::int
+        FROM artist_profiles a
+        JOIN gigs g ON g.artist_profile_id = a.id
+        WHERE g.status <> 'cancelled'
+        GROUP BY a.id
+        """
+    )
+    # Unique index is required for REFRESH ... CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_gigs "
+        "ON leaderboard_rollup (entity_type, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_city_gigs "
+        "ON leaderboard_rollup (entity_type, city_key, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_state_gigs "
+        "ON leaderboard_rollup (entity_type, state_key, total_gigs DESC, profile_id)"
+    )
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_cities AS
+        SELECT
+            lower(btrim(v.city)) AS city_key,
+            min(v.city) AS city,
+            count(g.id)::int AS total_gigs
+        FROM venue_profiles v
+        JOIN gigs g ON g.venue_profile_id = v.id
+        WHERE g.status <> 'cancelled' AND btrim(v.city) <> ''
+        GROUP BY lower(btrim(v.city))
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_rollup")
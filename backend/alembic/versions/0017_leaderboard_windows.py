@@ -0,0 +1,230 @@
+"""Add monthly profile buckets and time-windowed leaderboard rollup
+
+Revision ID: 0017_leaderboard_windows
+Revises: 0016_leaderboard_rollup
+Create Date: 2026-02-07
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0017_leaderboard_windows"
+down_revision = "0016_leaderboard_rollup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profile_monthly_stats",
+        sa.Column("entity_type", sa.String(10), nullable=False),
+        sa.Column("profile_id", sa.String(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("gig_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("verified_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attendance_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attendance_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("entity_type", "profile_id", "month"),
+    )
+
+    for entity_type, profile_col in (
+        ("artist", "artist_profile_id"),
+        ("venue", "venue_profile_id"),
+    ):
+        op.execute(
+            f"""
+            INSERT INTO profile_monthly_stats
+            SELECT
+                '{entity_type}',
+                {profile_col},
+                date_trunc('month', date)::date,
+                count(id),
+                count(id) FILTER (WHERE artist_confirmed AND venue_confirmed),
+                coalesce(sum(attendance), 0),
+                count(attendance),
+                coalesce(sum(tickets_sold), 0),
+                count(tickets_sold)
+            FROM gigs
+            WHERE status <> 'cancelled'
+            GROUP BY {profile_col}, date_trunc('month', date)::date
+            """
+        )
+
+    op.execute("DROP MATERIALIZED VIEW leaderboard_rollup")
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_rollup AS
+        WITH windows (time_window, since) AS (
+            VALUES
+                ('30d', date_trunc('month', current_date - 30)::date),
+                ('90d', date_trunc('month', current_date - 90)::date),
+                ('365d', date_trunc('month', current_date - 365)::date),
+                ('all', NULL::date)
+        ),
+        sums AS (
+            SELECT
+                b.entity_type,
+                b.profile_id,
+                w.time_window,
+                sum(b.gig_count)::int AS total_gigs,
+                sum(b.verified_count)::int AS verified_gigs,
+                sum(b.attendance_sum)::int AS attendance_sum,
+                sum(b.attendance_count)::int AS attendance_count,
+                sum(b.tickets_sum)::int AS tickets_sum,
+                sum(b.tickets_count)::int AS tickets_count
+            FROM profile_monthly_stats b
+            -- Windows end at the current month: upcoming gigs only count in 'all'
+            JOIN windows w ON w.since IS NULL
+                OR (b.month >= w.since AND b.month <= date_trunc('month', current_date))
+            GROUP BY b.entity_type, b.profile_id, w.time_window
+        ),
+        profiles AS (
+            SELECT 'venue'::text AS entity_type, id, venue_name AS name, city, state
+            FROM venue_profiles
+            UNION ALL
+            SELECT 'artist'::text, id, name, city, state
+            FROM artist_profiles
+        ),
+        counterparts AS (
+            SELECT 'venue'::text AS entity_type, venue_profile_id AS profile_id,
+                   count(DISTINCT artist_profile_id)::int AS n
+            FROM gigs WHERE status <> 'cancelled' GROUP BY venue_profile_id
+            UNION ALL
+            SELECT 'artist'::text, artist_profile_id,
+                   count(DISTINCT venue_profile_id)::int
+            FROM gigs WHERE status <> 'cancelled' GROUP BY artist_profile_id
+        )
+        SELECT
+            s.entity_type,
+            s.profile_id,
+            s.time_window,
+            p.name,
+            p.city,
+            p.state,
+            lower(btrim(p.city)) AS city_key,
+            lower(btrim(p.state)) AS state_key,
+            s.total_gigs,
+            s.verified_gigs,
+            CASE WHEN s.attendance_count > 0 THEN s.attendance_sum END AS total_attendance,
+            CASE WHEN s.attendance_count > 0
+                 THEN s.attendance_sum::numeric / s.attendance_count END AS avg_attendance,
+            CASE WHEN s.tickets_count > 0 THEN s.tickets_sum END AS total_tickets_sold,
+            -- Distinct counterparts cannot be summed across buckets
+            CASE WHEN s.time_window = 'all' THEN c.n END AS unique_counterparts
+        FROM sums s
+        JOIN profiles p ON p.entity_type = s.entity_type AND p.id = s.profile_id
+        LEFT JOIN counterparts c
+            ON c.entity_type = s.entity_type AND c.profile_id = s.profile_id
+        WHERE s.total_gigs > 0
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, time_window, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_gigs "
+        "ON leaderboard_rollup (entity_type, time_window, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_city_gigs "
+        "ON leaderboard_rollup "
+        "(entity_type, time_window, city_key, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_state_gigs "
+        "ON leaderboard_rollup "
+        "(entity_type, time_window, state_key, total_gigs DESC, profile_id)"
+    )
+
+    op.execute("DROP MATERIALIZED VIEW leaderboard_cities")
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_cities AS
+        SELECT city_key, min(city) AS city, sum(total_gigs)::int AS total_gigs
+        FROM leaderboard_rollup
+        WHERE entity_type = 'venue' AND time_window = 'all' AND city_key <> ''
+        GROUP BY city_key
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_rollup")
+    op.drop_table("profile_monthly_stats")
+
+    # Restore the 0016 definitions, aggregated straight from gigs
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_rollup AS
+        SELECT
+            'venue'::text AS entity_type, v.id AS profile_id, v.venue_name AS name,
+            v.city, v.state,
+            lower(btrim(v.city)) AS city_key, lower(btrim(v.state)) AS state_key,
+            count(g.id)::int AS total_gigs,
+            count(g.id) FILTER (WHERE g.artist_confirmed AND g.venue_confirmed)::int
+                AS verified_gigs,
+            sum(g.attendance)::int AS total_attendance,
+            avg(g.attendance) AS avg_attendance,
+            sum(g.tickets_sold)::int AS total_tickets_sold,
+            count(DISTINCT g.artist_profile_id)::int AS unique_counterparts
+        FROM venue_profiles v
+        JOIN gigs g ON g.venue_profile_id = v.id
+        WHERE g.status <> 'cancelled'
+        GROUP BY v.id
+        UNION ALL
+        SELECT
+            'artist'::text, a.id, a.name, a.city, a.state,
+            lower(btrim(a.city)), lower(btrim(a.state)),
+            count(g.id)::int,
+            count(g.id) FILTER (WHERE g.artist_confirmed AND g.venue_confirmed)::int,
+            sum(g.attendance)::int,
+            avg(g.attendance),
+            sum(g.tickets_sold)::int,
+            count(DISTINCT g.venue_profile_id)::int
+        FROM artist_profiles a
+        JOIN gigs g ON g.artist_profile_id = a.id
+        WHERE g.status <> 'cancelled'
+        GROUP BY a.id
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_gigs "
+        "ON leaderboard_rollup (entity_type, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_city_gigs "
+        "ON leaderboard_rollup (entity_type, city_key, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_state_gigs "
+        "ON leaderboard_rollup (entity_type, state_key, total_gigs DESC, profile_id)"
+    )
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW leaderboard_cities AS
+        SELECT
+            lower(btrim(v.city)) AS city_key,
+            min(v.city) AS city,
+            count(g.id)::int AS total_gigs
+        FROM venue_profiles v
+        JOIN gigs g ON g.venue_profile_id = v.id
+        WHERE g.status <> 'cancelled' AND btrim(v.city) <> ''
+        GROUP BY lower(btrim(v.city))
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
@@ -0,0 +1,24 @@
+"""Index leaderboard rollup rows by profile for rank lookups
+
+Revision ID: 0018_leaderboard_rank_lookup
+Revises: 0017_leaderboard_windows
+Create Date: 2026-02-08
+"""
+
+from alembic import op
+
+revision = "0018_leaderboard_rank_lookup"
+down_revision = "0017_leaderboard_windows"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_profile_window "
+        "ON leaderboard_rollup (profile_id, time_window)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_leaderboard_rollup_profile_window")
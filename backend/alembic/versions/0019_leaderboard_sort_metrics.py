@@ -0,0 +1,208 @@
+"""Add revenue to monthly buckets and index every leaderboard sort metric
+
+Revision ID: 0019_leaderboard_sort_metrics
+Revises: 0018_leaderboard_rank_lookup
+Create Date: 2026-02-09
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0019_leaderboard_sort_metrics"
+down_revision = "0018_leaderboard_rank_lookup"
+branch_labels = None
+depends_on = None
+
+# Sortable rollup columns, all indexed NULLS LAST to match ORDER BY ... DESC
+# NULLS LAST in the endpoint; the planner only uses an index whose NULLS
+# placement matches, even for columns that are never null.
+SORT_COLUMNS = {
+    "total_gigs": "total_gigs DESC NULLS LAST",
+    "verified_gigs": "verified_gigs DESC NULLS LAST",
+    "avg_attendance": "avg_attendance DESC NULLS LAST",
+    "total_attendance": "total_attendance DESC NULLS LAST",
+    "total_tickets_sold": "total_tickets_sold DESC NULLS LAST",
+    "total_revenue_cents": "total_revenue_cents DESC NULLS LAST",
+}
+SCOPES = {
+    "": "",
+    "_city": "city_key, ",
+    "_state": "state_key, ",
+}
+
+ROLLUP_SQL = """
+CREATE MATERIALIZED VIEW leaderboard_rollup AS
+WITH windows (time_window, since) AS (
+    VALUES
+        ('30d', date_trunc('month', current_date - 30)::date),
+        ('90d', date_trunc('month', current_date - 90)::date),
+        ('365d', date_trunc('month', current_date - 365)::date),
+        ('all', NULL::date)
+),
+sums AS (
+    SELECT
+        b.entity_type,
+        b.profile_id,
+        w.time_window,
+        sum(b.gig_count)::int AS total_gigs,
+        sum(b.verified_count)::int AS verified_gigs,
+        sum(b.attendance_sum)::int AS attendance_sum,
+        sum(b.attendance_count)::int AS attendance_count,
+        sum(b.tickets_sum)::int AS tickets_sum,
+        sum(b.tickets_count)::int AS tickets_count,
+        sum(b.revenue_sum)::bigint AS revenue_sum,
+        sum(b.revenue_count)::int AS revenue_count
+    FROM profile_monthly_stats b
+    -- Windows end at the current month: upcoming gigs only count in 'all'
+    JOIN windows w ON w.since IS NULL
+        OR (b.month >= w.since AND b.month <= date_trunc('month', current_date))
+    GROUP BY b.entity_type, b.profile_id, w.time_window
+),
+profiles AS (
+    SELECT 'venue'::text AS entity_type, id, venue_name AS name, city, state
+    FROM venue_profiles
+    UNION ALL
+    SELECT 'artist'::text, id, name, city, state
+    FROM artist_profiles
+),
+counterparts AS (
+    SELECT 'venue'::text AS entity_type, venue_profile_id AS profile_id,
+           count(DISTINCT artist_profile_id)::int AS n
+    FROM gigs WHERE status <> 'cancelled' GROUP BY venue_profile_id
+    UNION ALL
+    SELECT 'artist'::text, artist_profile_id,
+           count(DISTINCT venue_profile_id)::int
+    FROM gigs WHERE status <> 'cancelled' GROUP BY artist_profile_id
+)
+SELECT
+    s.entity_type,
+    s.profile_id,
+    s.time_window,
+    p.name,
+    p.city,
+    p.state,
+    lower(btrim(p.city)) AS city_key,
+    lower(btrim(p.state)) AS state_key,
+    s.total_gigs,
+    s.verified_gigs,
+    CASE WHEN s.attendance_count > 0 THEN s.attendance_sum END AS total_attendance,
+    CASE WHEN s.attendance_count > 0
+         THEN s.attendance_sum::numeric / s.attendance_count END AS avg_attendance,
+    CASE WHEN s.tickets_count > 0 THEN s.tickets_sum END AS total_tickets_sold,
+    CASE WHEN s.revenue_count > 0 THEN s.revenue_sum END AS total_revenue_cents,
+    CASE WHEN s.time_window = 'all' THEN c.n END AS unique_counterparts
+FROM sums s
+JOIN profiles p ON p.entity_type = s.entity_type AND p.id = s.profile_id
+LEFT JOIN counterparts c
+    ON c.entity_type = s.entity_type AND c.profile_id = s.profile_id
+WHERE s.total_gigs > 0
+"""
+
+CITIES_SQL = """
+CREATE MATERIALIZED VIEW leaderboard_cities AS
+SELECT city_key, min(city) AS city, sum(total_gigs)::int AS total_gigs
+FROM leaderboard_rollup
+WHERE entity_type = 'venue' AND time_window = 'all' AND city_key <> ''
+GROUP BY city_key
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "profile_monthly_stats",
+        sa.Column("revenue_sum", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "profile_monthly_stats",
+        sa.Column("revenue_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    for entity_type, profile_col in (
+        ("artist", "artist_profile_id"),
+        ("venue", "venue_profile_id"),
+    ):
+        op.execute(
+            f"""
+            UPDATE profile_monthly_stats b
+            SET revenue_sum = r.revenue_sum, revenue_count = r.revenue_count
+            FROM (
+                SELECT
+                    {profile_col} AS profile_id,
+                    date_trunc('month', date)::date AS month,
+                    coalesce(sum(gross_revenue_cents), 0) AS revenue_sum,
+                    count(gross_revenue_cents) AS revenue_count
+                FROM gigs
+                WHERE status <> 'cancelled'
+                GROUP BY {profile_col}, date_trunc('month', date)::date
+            ) r
+            WHERE b.entity_type = '{entity_type}'
+              AND b.profile_id = r.profile_id
+              AND b.month = r.month
+            """
+        )
+
+    op.execute("DROP MATERIALIZED VIEW leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW leaderboard_rollup")
+    op.execute(ROLLUP_SQL)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, time_window, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_profile_window "
+        "ON leaderboard_rollup (profile_id, time_window)"
+    )
+    for column, ordering in SORT_COLUMNS.items():
+        for suffix, scope_cols in SCOPES.items():
+            op.execute(
+                f"CREATE INDEX ix_leaderboard_rollup{suffix}_{column} "
+                f"ON leaderboard_rollup "
+                f"(entity_type, time_window, {scope_cols}{ordering}, profile_id)"
+            )
+
+    op.execute(CITIES_SQL)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
+
+
+def downgrade() -> None:
+    # Dropping the views drops their indexes; rebuild the 0017/0018 shape
+    # without the revenue column.
+    op.execute("DROP MATERIALIZED VIEW leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW leaderboard_rollup")
+    op.drop_column("profile_monthly_stats", "revenue_count")
+    op.drop_column("profile_monthly_stats", "revenue_sum")
+
+    op.execute(
+        ROLLUP_SQL.replace(
+            "        sum(b.revenue_sum)::bigint AS revenue_sum,\n"
+            "        sum(b.revenue_count)::int AS revenue_count\n",
+            "",
+        )
+        .replace("        sum(b.tickets_count)::int AS tickets_count,\n",
+                 "        sum(b.tickets_count)::int AS tickets_count\n")
+        .replace(
+            "    CASE WHEN s.revenue_count > 0 THEN s.revenue_sum END AS total_revenue_cents,\n",
+            "",
+        )
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, time_window, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_profile_window "
+        "ON leaderboard_rollup (profile_id, time_window)"
+    )
+    for suffix, scope_cols in SCOPES.items():
+        op.execute(
+            f"CREATE INDEX ix_leaderboard_rollup{suffix}_gigs "
+            f"ON leaderboard_rollup "
+            f"(entity_type, time_window, {scope_cols}total_gigs DESC, profile_id)"
+        )
+    op.execute(CITIES_SQL)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
@@ -0,0 +1,35 @@
+"""Add decayed trending scores per profile
+
+Revision ID: 0020_trending_scores
+Revises: 0019_leaderboard_sort_metrics
+Create Date: 2026-02-10
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0020_trending_scores"
+down_revision = "0019_leaderboard_sort_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trending_scores",
+        sa.Column("entity_type", sa.String(length=10), primary_key=True),
+        sa.Column("profile_id", sa.String(), primary_key=True),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("rank_key", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ix_trending_scores_rank",
+        "trending_scores",
+        ["entity_type", "rank_key"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trending_scores_rank", table_name="trending_scores")
+    op.drop_table("trending_scores")
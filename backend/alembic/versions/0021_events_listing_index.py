@@ -0,0 +1,25 @@
+"""Index events in public listing order
+
+Revision ID: 0021_events_listing_index
+Revises: 0020_trending_scores
+Create Date: 2026-02-11
+"""
+
+from alembic import op
+
+revision = "0021_events_listing_index"
+down_revision = "0020_trending_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (date, id) serves both the default "from today" range and the keyset
+    # cursor; it makes the single-column date index redundant.
+    op.create_index("ix_events_date_id", "events", ["date", "id"])
+    op.drop_index("ix_events_date", table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_date", "events", ["date"])
+    op.drop_index("ix_events_date_id", table_name="events")
@@ -0,0 +1,36 @@
+"""Make (venue, title, date) unique on events
+
+Revision ID: 0022_events_unique_title_date
+Revises: 0021_events_listing_index
+Create Date: 2026-02-12
+"""
+
+from alembic import op
+
+revision = "0022_events_unique_title_date"
+down_revision = "0021_events_listing_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Manually created events were never deduplicated; keep one of each
+    op.execute(
+        """
+        DELETE FROM events a
+        USING events b
+        WHERE a.venue_profile_id = b.venue_profile_id
+          AND a.title = b.title
+          AND a.date = b.date
+          AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_events_venue_title_date",
+        "events",
+        ["venue_profile_id", "title", "date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_events_venue_title_date", "events", type_="unique")
@@ -0,0 +1,55 @@
+"""Add background event import jobs
+
+Revision ID: 0023_event_import_jobs
+Revises: 0022_events_unique_title_date
+Create Date: 2026-02-13
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0023_event_import_jobs"
+down_revision = "0022_events_unique_title_date"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_import_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("venue_profile_id", sa.String(), nullable=False),
+        sa.Column("created_by_user_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("parsed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("imported", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors", sa.JSON(), nullable=False, server_default="[]"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["venue_profile_id"],
+            ["venue_profiles.id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by_user_id"],
+            ["users.id"],
+            ondelete="CASCADE",
+        ),
+    )
+    op.create_index(
+        "ix_event_import_jobs_venue_profile_id",
+        "event_import_jobs",
+        ["venue_profile_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_import_jobs_venue_profile_id", table_name="event_import_jobs")
+    op.drop_table("event_import_jobs")
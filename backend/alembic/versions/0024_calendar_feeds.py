@@ -0,0 +1,74 @@
+"""Add subscribed calendar feeds and track synced events by UID
+
+Revision ID: 0024_calendar_feeds
+Revises: 0023_event_import_jobs
+Create Date: 2026-02-14
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0024_calendar_feeds"
+down_revision = "0023_event_import_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_feeds",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("venue_profile_id", sa.String(), nullable=False),
+        sa.Column("url", sa.String(length=2000), nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column(
+            "next_sync_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("failure_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["venue_profile_id"],
+            ["venue_profiles.id"],
+            ondelete="CASCADE",
+        ),
+        sa.UniqueConstraint("venue_profile_id", "url", name="uq_calendar_feed_venue_url"),
+    )
+    op.create_index(
+        "ix_calendar_feeds_venue_profile_id", "calendar_feeds", ["venue_profile_id"]
+    )
+    op.create_index("ix_calendar_feeds_next_sync_at", "calendar_feeds", ["next_sync_at"])
+
+    op.add_column("events", sa.Column("source_feed_id", sa.String(), nullable=True))
+    op.add_column("events", sa.Column("source_uid", sa.String(), nullable=True))
+    op.create_foreign_key(
+        "fk_events_source_feed_id",
+        "events",
+        "calendar_feeds",
+        ["source_feed_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_unique_constraint(
+        "uq_events_feed_uid", "events", ["source_feed_id", "source_uid"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_events_feed_uid", "events", type_="unique")
+    op.drop_constraint("fk_events_source_feed_id", "events", type_="foreignkey")
+    op.drop_column("events", "source_uid")
+    op.drop_column("events", "source_feed_id")
+    op.drop_index("ix_calendar_feeds_next_sync_at", table_name="calendar_feeds")
+    op.drop_index("ix_calendar_feeds_venue_profile_id", table_name="calendar_feeds")
+    op.drop_table("calendar_feeds")
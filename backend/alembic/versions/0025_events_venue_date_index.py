@@ -0,0 +1,26 @@
+"""Index a venue's events in date order
+
+Revision ID: 0025_events_venue_date_index
+Revises: 0024_calendar_feeds
+Create Date: 2026-02-18
+"""
+
+from alembic import op
+
+revision = "0025_events_venue_date_index"
+down_revision = "0024_calendar_feeds"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Venue profiles read only the next few events and page through the
+    # rest; (venue_profile_id, date, id) serves both and its leading column
+    # covers the plain venue_profile_id lookups.
+    op.create_index("ix_events_venue_date_id", "events", ["venue_profile_id", "date", "id"])
+    op.drop_index("ix_events_venue_profile_id", table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_venue_profile_id", "events", ["venue_profile_id"])
+    op.drop_index("ix_events_venue_date_id", table_name="events")
@@ -0,0 +1,37 @@
+"""Store recurring events as one series and cache upcoming occurrences
+
+Revision ID: 0026_recurring_events
+Revises: 0025_events_venue_date_index
+Create Date: 2026-02-21
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0026_recurring_events"
+down_revision = "0025_events_venue_date_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("rrule", sa.String(length=500), nullable=True))
+    op.add_column("events", sa.Column("series_until", sa.Date(), nullable=True))
+
+    op.create_table(
+        "event_occurrences",
+        sa.Column("event_id", sa.String(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id", "date"),
+    )
+    op.create_index(
+        "ix_event_occurrences_date_event", "event_occurrences", ["date", "event_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_occurrences_date_event", table_name="event_occurrences")
+    op.drop_table("event_occurrences")
+    op.drop_column("events", "series_until")
+    op.drop_column("events", "rrule")
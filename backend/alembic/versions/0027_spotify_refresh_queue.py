@@ -0,0 +1,34 @@
+"""Queue Spotify data refreshes for the background refresher
+
+Revision ID: 0027_spotify_refresh_queue
+Revises: 0026_recurring_events
+Create Date: 2026-02-24
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0027_spotify_refresh_queue"
+down_revision = "0026_recurring_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "spotify_connections",
+        sa.Column("refresh_due_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Due a TTL (24h) after the last fetch; never-fetched connections now
+    op.execute(
+        "UPDATE spotify_connections "
+        "SET refresh_due_at = COALESCE(data_fetched_at + interval '24 hours', now())"
+    )
+    op.create_index(
+        "ix_spotify_connections_refresh_due_at", "spotify_connections", ["refresh_due_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_spotify_connections_refresh_due_at", table_name="spotify_connections")
+    op.drop_column("spotify_connections", "refresh_due_at")
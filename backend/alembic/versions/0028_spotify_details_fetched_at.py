@@ -0,0 +1,27 @@
+"""Track when Spotify top tracks and releases were last fetched
+
+Revision ID: 0028_spotify_details_fetched_at
+Revises: 0027_spotify_refresh_queue
+Create Date: 2026-02-27
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0028_spotify_details_fetched_at"
+down_revision = "0027_spotify_refresh_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "spotify_connections",
+        sa.Column("details_fetched_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Every fetch so far refetched the details too
+    op.execute("UPDATE spotify_connections SET details_fetched_at = data_fetched_at")
+
+
+def downgrade() -> None:
+    op.drop_column("spotify_connections", "details_fetched_at")
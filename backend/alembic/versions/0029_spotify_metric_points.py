@@ -0,0 +1,47 @@
+"""Add the Spotify metrics time series
+
+Revision ID: 0029_spotify_metric_points
+Revises: 0028_spotify_details_fetched_at
+Create Date: 2026-03-02
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0029_spotify_metric_points"
+down_revision = "0028_spotify_details_fetched_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spotify_metric_points",
+        sa.Column("artist_profile_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("followers", sa.Integer(), nullable=True),
+        sa.Column("popularity", sa.SmallInteger(), nullable=True),
+        sa.Column("monthly_listeners", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["artist_profile_id"], ["artist_profiles.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("artist_profile_id", "day"),
+    )
+    # Seed one point per connection from the data already cached
+    op.execute(
+        """
+        INSERT INTO spotify_metric_points
+            (artist_profile_id, day, followers, popularity, monthly_listeners)
+        SELECT artist_profile_id,
+               data_fetched_at::date,
+               (spotify_data->>'followers')::integer,
+               (spotify_data->>'popularity')::smallint,
+               (spotify_data->>'monthly_listeners')::integer
+        FROM spotify_connections
+        WHERE data_fetched_at IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("spotify_metric_points")
@@ -0,0 +1,63 @@
+"""Promote Spotify followers, popularity and genres to columns
+
+Revision ID: 0030_spotify_search_columns
+Revises: 0029_spotify_metric_points
+Create Date: 2026-03-02
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0030_spotify_search_columns"
+down_revision = "0029_spotify_metric_points"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("spotify_connections", sa.Column("followers", sa.Integer(), nullable=True))
+    op.add_column("spotify_connections", sa.Column("popularity", sa.SmallInteger(), nullable=True))
+    op.add_column(
+        "spotify_connections",
+        sa.Column("genres", postgresql.ARRAY(sa.String()), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE spotify_connections
+        SET followers = (spotify_data->>'followers')::integer,
+            popularity = (spotify_data->>'popularity')::smallint,
+            genres = ARRAY(
+                SELECT json_array_elements_text(
+                    CASE WHEN json_typeof(spotify_data->'genres') = 'array'
+                         THEN spotify_data->'genres' ELSE '[]'::json END
+                )
+            )
+        WHERE data_fetched_at IS NOT NULL
+        """
+    )
+    op.create_index(
+        "ix_spotify_connections_followers", "spotify_connections", ["followers"]
+    )
+    op.create_index(
+        "ix_spotify_connections_popularity_followers",
+        "spotify_connections",
+        [sa.text("popularity DESC NULLS LAST"), sa.text("followers DESC NULLS LAST")],
+    )
+    op.create_index(
+        "ix_spotify_connections_genres",
+        "spotify_connections",
+        ["genres"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_spotify_connections_genres", table_name="spotify_connections")
+    op.drop_index(
+        "ix_spotify_connections_popularity_followers", table_name="spotify_connections"
+    )
+    op.drop_index("ix_spotify_connections_followers", table_name="spotify_connections")
+    op.drop_column("spotify_connections", "genres")
+    op.drop_column("spotify_connections", "popularity")
+    op.drop_column("spotify_connections", "followers")
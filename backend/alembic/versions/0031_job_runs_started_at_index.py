@@ -0,0 +1,21 @@
+"""Index job_runs.started_at for the retention prune
+
+Revision ID: 0031_job_runs_started_at_index
+Revises: 0030_spotify_search_columns
+Create Date: 2026-03-03
+"""
+
+from alembic import op
+
+revision = "0031_job_runs_started_at_index"
+down_revision = "0030_spotify_search_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_job_runs_started_at", "job_runs", ["started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_runs_started_at", table_name="job_runs")
@@ -0,0 +1,31 @@
+"""Store venue coordinates for radius filters
+
+Revision ID: 0032_venue_coordinates
+Revises: 0031_job_runs_started_at_index
+Create Date: 2026-03-03
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0032_venue_coordinates"
+down_revision = "0031_job_runs_started_at_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled in by the venue_geocode job
+    op.add_column("venue_profiles", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("venue_profiles", sa.Column("longitude", sa.Float(), nullable=True))
+    op.add_column("venue_profiles", sa.Column("geocoded_zip", sa.String(10), nullable=True))
+    op.create_index(
+        "ix_venue_profiles_lat_lng", "venue_profiles", ["latitude", "longitude"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_venue_profiles_lat_lng", table_name="venue_profiles")
+    op.drop_column("venue_profiles", "geocoded_zip")
+    op.drop_column("venue_profiles", "longitude")
+    op.drop_column("venue_profiles", "latitude")
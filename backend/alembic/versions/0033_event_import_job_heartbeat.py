@@ -0,0 +1,32 @@
+"""Heartbeat and unfinished-job index on event_import_jobs
+
+Revision ID: 0033_event_import_job_heartbeat
+Revises: 0032_venue_coordinates
+Create Date: 2026-03-04
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0033_event_import_job_heartbeat"
+down_revision = "0032_venue_coordinates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event_import_jobs",
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_event_import_jobs_unfinished",
+        "event_import_jobs",
+        ["venue_profile_id"],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_import_jobs_unfinished", table_name="event_import_jobs")
+    op.drop_column("event_import_jobs", "heartbeat_at")
@@ -0,0 +1,21 @@
+"""Index spotify_metric_points.day for the downsample window
+
+Revision ID: 0034_spotify_metric_points_day_index
+Revises: 0033_event_import_job_heartbeat
+Create Date: 2026-03-04
+"""
+
+from alembic import op
+
+revision = "0034_spotify_metric_points_day_index"
+down_revision = "0033_event_import_job_heartbeat"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_spotify_metric_points_day", "spotify_metric_points", ["day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_spotify_metric_points_day", table_name="spotify_metric_points")
@@ -0,0 +1,277 @@
+"""Count the current month up to today and keep artist/venue pairs for the rollup
+
+Revision ID: 0035_leaderboard_current_month
+Revises: 0034_spotify_metric_points_day_index
+Create Date: 2026-03-05
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0035_leaderboard_current_month"
+down_revision = "0034_spotify_metric_points_day_index"
+branch_labels = None
+depends_on = None
+
+# As in 0019
+SORT_COLUMNS = {
+    "total_gigs": "total_gigs DESC NULLS LAST",
+    "verified_gigs": "verified_gigs DESC NULLS LAST",
+    "avg_attendance": "avg_attendance DESC NULLS LAST",
+    "total_attendance": "total_attendance DESC NULLS LAST",
+    "total_tickets_sold": "total_tickets_sold DESC NULLS LAST",
+    "total_revenue_cents": "total_revenue_cents DESC NULLS LAST",
+}
+SCOPES = {
+    "": "",
+    "_city": "city_key, ",
+    "_state": "state_key, ",
+}
+
+SUMS = """
+        sum(b.gig_count)::int AS total_gigs,
+        sum(b.verified_count)::int AS verified_gigs,
+        sum(b.attendance_sum)::int AS attendance_sum,
+        sum(b.attendance_count)::int AS attendance_count,
+        sum(b.tickets_sum)::int AS tickets_sum,
+        sum(b.tickets_count)::int AS tickets_count,
+        sum(b.revenue_sum)::bigint AS revenue_sum,
+        sum(b.revenue_count)::int AS revenue_count"""
+
+CURRENT_MONTH_GIGS = """
+    SELECT
+        '{entity_type}'::text,
+        {profile_col},
+        date_trunc('month', current_date)::date,
+        count(id),
+        count(id) FILTER (WHERE artist_confirmed AND venue_confirmed),
+        coalesce(sum(attendance), 0),
+        count(attendance),
+        coalesce(sum(tickets_sold), 0),
+        count(tickets_sold),
+        coalesce(sum(gross_revenue_cents), 0),
+        count(gross_revenue_cents)
+    FROM gigs
+    WHERE status <> 'cancelled'
+      AND date >= date_trunc('month', current_date)
+      AND date <= current_date
+    GROUP BY {profile_col}"""
+
+ROLLUP_SQL = f"""
+CREATE MATERIALIZED VIEW leaderboard_rollup AS
+WITH windows (time_window, since) AS (
+    VALUES
+        ('30d', date_trunc('month', current_date - 30)::date),
+        ('90d', date_trunc('month', current_date - 90)::date),
+        ('365d', date_trunc('month', current_date - 365)::date)
+),
+-- Windows end today: finished months come from the monthly buckets and the
+-- current month from its gigs up to today, so upcoming gigs only count in
+-- 'all'. Only the current month's gigs are scanned, by date.
+recent AS (
+    SELECT
+        entity_type, profile_id, month, gig_count, verified_count,
+        attendance_sum, attendance_count, tickets_sum, tickets_count,
+        revenue_sum, revenue_count
+    FROM profile_monthly_stats
+    WHERE month >= date_trunc('month', current_date - 365)
+      AND month < date_trunc('month', current_date)
+    UNION ALL{CURRENT_MONTH_GIGS.format(entity_type="venue", profile_col="venue_profile_id")}
+    UNION ALL{CURRENT_MONTH_GIGS.format(entity_type="artist", profile_col="artist_profile_id")}
+),
+sums AS (
+    SELECT b.entity_type, b.profile_id, w.time_window,{SUMS}
+    FROM recent b
+    JOIN windows w ON b.month >= w.since
+    GROUP BY b.entity_type, b.profile_id, w.time_window
+    UNION ALL
+    SELECT b.entity_type, b.profile_id, 'all',{SUMS}
+    FROM profile_monthly_stats b
+    GROUP BY b.entity_type, b.profile_id
+),
+profiles AS (
+    SELECT 'venue'::text AS entity_type, id, venue_name AS name, city, state
+    FROM venue_profiles
+    UNION ALL
+    SELECT 'artist'::text, id, name, city, state
+    FROM artist_profiles
+),
+-- Pairs are maintained on gig writes, so this never scans gigs
+counterparts AS (
+    SELECT 'venue'::text AS entity_type, venue_profile_id AS profile_id,
+           count(*)::int AS n
+    FROM artist_venue_pairs GROUP BY venue_profile_id
+    UNION ALL
+    SELECT 'artist'::text, artist_profile_id, count(*)::int
+    FROM artist_venue_pairs GROUP BY artist_profile_id
+)
+SELECT
+    s.entity_type,
+    s.profile_id,
+    s.time_window,
+    p.name,
+    p.city,
+    p.state,
+    lower(btrim(p.city)) AS city_key,
+    lower(btrim(p.state)) AS state_key,
+    s.total_gigs,
+    s.verified_gigs,
+    CASE WHEN s.attendance_count > 0 THEN s.attendance_sum END AS total_attendance,
+    CASE WHEN s.attendance_count > 0
+         THEN s.attendance_sum::numeric / s.attendance_count END AS avg_attendance,
+    CASE WHEN s.tickets_count > 0 THEN s.tickets_sum END AS total_tickets_sold,
+    CASE WHEN s.revenue_count > 0 THEN s.revenue_sum END AS total_revenue_cents,
+    CASE WHEN s.time_window = 'all' THEN c.n END AS unique_counterparts
+FROM sums s
+JOIN profiles p ON p.entity_type = s.entity_type AND p.id = s.profile_id
+LEFT JOIN counterparts c
+    ON c.entity_type = s.entity_type AND c.profile_id = s.profile_id
+WHERE s.total_gigs > 0
+"""
+
+# The 0019 view, for downgrade
+PREVIOUS_ROLLUP_SQL = """
+CREATE MATERIALIZED VIEW leaderboard_rollup AS
+WITH windows (time_window, since) AS (
+    VALUES
+        ('30d', date_trunc('month', current_date - 30)::date),
+        ('90d', date_trunc('month', current_date - 90)::date),
+        ('365d', date_trunc('month', current_date - 365)::date),
+        ('all', NULL::date)
+),
+sums AS (
+    SELECT
+        b.entity_type,
+        b.profile_id,
+        w.time_window,
+        sum(b.gig_count)::int AS total_gigs,
+        sum(b.verified_count)::int AS verified_gigs,
+        sum(b.attendance_sum)::int AS attendance_sum,
+        sum(b.attendance_count)::int AS attendance_count,
+        sum(b.tickets_sum)::int AS tickets_sum,
+        sum(b.tickets_count)::int AS tickets_count,
+        sum(b.revenue_sum)::bigint AS revenue_sum,
+        sum(b.revenue_count)::int AS revenue_count
+    FROM profile_monthly_stats b
+    -- Windows end at the current month: upcoming gigs only count in 'all'
+    JOIN windows w ON w.since IS NULL
+        OR (b.month >= w.since AND b.month <= date_trunc('month', current_date))
+    GROUP BY b.entity_type, b.profile_id, w.time_window
+),
+profiles AS (
+    SELECT 'venue'::text AS entity_type, id, venue_name AS name, city, state
+    FROM venue_profiles
+    UNION ALL
+    SELECT 'artist'::text, id, name, city, state
+    FROM artist_profiles
+),
+counterparts AS (
+    SELECT 'venue'::text AS entity_type, venue_profile_id AS profile_id,
+           count(DISTINCT artist_profile_id)::int AS n
+    FROM gigs WHERE status <> 'cancelled' GROUP BY venue_profile_id
+    UNION ALL
+    SELECT 'artist'::text, artist_profile_id,
+           count(DISTINCT venue_profile_id)::int
+    FROM gigs WHERE status <> 'cancelled' GROUP BY artist_profile_id
+)
+SELECT
+    s.entity_type,
+    s.profile_id,
+    s.time_window,
+    p.name,
+    p.city,
+    p.state,
+    lower(btrim(p.city)) AS city_key,
+    lower(btrim(p.state)) AS state_key,
+    s.total_gigs,
+    s.verified_gigs,
+    CASE WHEN s.attendance_count > 0 THEN s.attendance_sum END AS total_attendance,
+    CASE WHEN s.attendance_count > 0
+         THEN s.attendance_sum::numeric / s.attendance_count END AS avg_attendance,
+    CASE WHEN s.tickets_count > 0 THEN s.tickets_sum END AS total_tickets_sold,
+    CASE WHEN s.revenue_count > 0 THEN s.revenue_sum END AS total_revenue_cents,
+    CASE WHEN s.time_window = 'all' THEN c.n END AS unique_counterparts
+FROM sums s
+JOIN profiles p ON p.entity_type = s.entity_type AND p.id = s.profile_id
+LEFT JOIN counterparts c
+    ON c.entity_type = s.entity_type AND c.profile_id = s.profile_id
+WHERE s.total_gigs > 0
+"""
+
+CITIES_SQL = """
+CREATE MATERIALIZED VIEW leaderboard_cities AS
+SELECT city_key, min(city) AS city, sum(total_gigs)::int AS total_gigs
+FROM leaderboard_rollup
+WHERE entity_type = 'venue' AND time_window = 'all' AND city_key <> ''
+GROUP BY city_key
+"""
+
+
+def _create_views(rollup_sql: str) -> None:
+    op.execute(rollup_sql)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_rollup_profile "
+        "ON leaderboard_rollup (entity_type, time_window, profile_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_leaderboard_rollup_profile_window "
+        "ON leaderboard_rollup (profile_id, time_window)"
+    )
+    for column, ordering in SORT_COLUMNS.items():
+        for suffix, scope_cols in SCOPES.items():
+            op.execute(
+                f"CREATE INDEX ix_leaderboard_rollup{suffix}_{column} "
+                f"ON leaderboard_rollup "
+                f"(entity_type, time_window, {scope_cols}{ordering}, profile_id)"
+            )
+
+    op.execute(CITIES_SQL)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_leaderboard_cities_city_key "
+        "ON leaderboard_cities (city_key)"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "artist_venue_pairs",
+        sa.Column(
+            "artist_profile_id",
+            sa.String(),
+            sa.ForeignKey("artist_profiles.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "venue_profile_id",
+            sa.String(),
+            sa.ForeignKey("venue_profiles.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("gig_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("artist_profile_id", "venue_profile_id"),
+    )
+    op.create_index(
+        "ix_artist_venue_pairs_venue_profile_id", "artist_venue_pairs", ["venue_profile_id"]
+    )
+    op.execute(
+        """
+        INSERT INTO artist_venue_pairs
+        SELECT artist_profile_id, venue_profile_id, count(id)
+        FROM gigs
+        WHERE status <> 'cancelled'
+        GROUP BY artist_profile_id, venue_profile_id
+        """
+    )
+
+    op.execute("DROP MATERIALIZED VIEW leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW leaderboard_rollup")
+    _create_views(ROLLUP_SQL)
+
+
+def downgrade() -> None:
+    # Dropping the views drops their indexes
+    op.execute("DROP MATERIALIZED VIEW leaderboard_cities")
+    op.execute("DROP MATERIALIZED VIEW leaderboard_rollup")
+    _create_views(PREVIOUS_ROLLUP_SQL)
+    op.drop_index("ix_artist_venue_pairs_venue_profile_id", table_name="artist_venue_pairs")
+    op.drop_table("artist_venue_pairs")
@@ -0,0 +1,21 @@
+"""Keyset (seek) pagination helpers shared by list endpoints."""
+
+from datetime import date
+
+from fastapi import HTTPException, status
+
+
+def encode_date_cursor(row_date: date, row_id: str) -> str:
+    return f"{row_date.isoformat()}|{row_id}"
+
+
+def decode_date_cursor(cursor: str) -> tuple[date, str]:
+    """Parse a ``<iso-date>|<id>`` cursor, raising 400 if it is malformed."""
+    try:
+        raw_date, row_id = cursor.split("|", 1)
+        return date.fromisoformat(raw_date), row_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
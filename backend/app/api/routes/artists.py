@@ -1,12 +1,21 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
 from app.api.routes._profile_utils import upsert_genres
+from app.core.response_cache import conditional_response
 from app.models.artist import ArtistProfile
 from app.models.user import UserRole
 from app.schemas.artist import ArtistProfileIn, ArtistProfileOut
+from app.services.calendar_export import (
+    FEED_CACHE_TTL_SECONDS,
+    FEED_MEDIA_TYPES,
+    feed_cache,
+    render_artist_gigs,
+)
 
 router = APIRouter(prefix="/artist-profile", tags=["artist-profile"])
 
@@ -103,3 +112,22 @@ def get_artist_by_id(artist_id: str, db: Session = Depends(get_db)):
         media_links=prof.media_links,
         genres=[g.name for g in prof.genres],
     )
+
+
+@router.get("/{artist_id}/gigs.{fmt}")
+def get_artist_gigs_feed(
+    artist_id: str,
+    fmt: Literal["ics", "json"],
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    The artist's non-cancelled gigs as a subscribable .ics calendar or JSON,
+    cached per artist and answered with a 304 while unchanged.
+    """
+    if not db.query(ArtistProfile.id).filter(ArtistProfile.id == artist_id).first():
+        raise HTTPException(status_code=404, detail="Artist profile not found")
+    entry = feed_cache.get_or_compute(
+        ("artist", artist_id, fmt), lambda: render_artist_gigs(db, fmt, artist_id)
+    )
+    return conditional_response(request, entry, FEED_MEDIA_TYPES[fmt], FEED_CACHE_TTL_SECONDS)
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_user, get_db
 from app.core.rate_limit import limiter
 from app.models.bookmark import Bookmark, EntityType
+from app.services.trending import BOOKMARK_WEIGHT, record_trending
 
 router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
 
@@ -25,6 +26,8 @@ def create_bookmark(
         to_entity_id=to_entity_id,
     )
     db.add(bm)
+    # Rolled back together with the bookmark if it turns out to be a duplicate
+    record_trending(db, [(to_entity_type.value, to_entity_id, BOOKMARK_WEIGHT)])
     try:
         db.commit()
     except Exception:
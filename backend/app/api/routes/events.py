@@ -1,43 +1,166 @@
+import math
 import uuid
-from datetime import date as dt_date, datetime as dt_datetime
+from datetime import date as dt_date, datetime, timezone
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from icalendar import Calendar
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.api.routes._pagination import decode_date_cursor, encode_date_cursor
+from app.api.routes.search import haversine_miles
+from app.core.config import settings
+from app.core.recurrence import series_until
+from app.core.response_cache import conditional_response
+from app.core.zipcode import ZipCodeResult, lookup_zipcode
+from app.models.calendar_feed import CalendarFeed
 from app.models.event import Event
+from app.models.event_import_job import EventImportJob
+from app.models.genre import Genre
 from app.models.user import UserRole
 from app.models.venue import VenueProfile
-from app.schemas.event import EventImportResult, EventIn, EventOut, EventPublicOut
+from app.schemas.event import (
+    CalendarFeedIn,
+    CalendarFeedOut,
+    EventImportJobOut,
+    EventImportResult,
+    EventIn,
+    EventOut,
+    EventPublicOut,
+)
+from app.services.calendar_export import (
+    FEED_CACHE_TTL_SECONDS,
+    FEED_MEDIA_TYPES,
+    feed_cache,
+    invalidate_event_feeds,
+    render_events,
+)
+from app.services.event_import import (
+    ImportQueueFullError,
+    InvalidCalendarError,
+    count_unfinished_jobs,
+    insert_events,
+    parse_ics,
+    release_import_slot,
+    reserve_import_slot,
+    submit_import_job,
+)
+from app.services.event_occurrences import materialize_occurrences, occurrence_page
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
+# Statute miles per degree of latitude
+MILES_PER_DEGREE = 69.0
+
+
+async def _near_center(
+    near: str | None = Query(None, description="Zip code to search around"),
+) -> ZipCodeResult | None:
+    """Resolve ``near`` (one cached lookup); 400 if it is not a known zip code."""
+    if not near:
+        return None
+    center = await lookup_zipcode(near)
+    if center is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown zip code",
+        )
+    return center
+
+
+def _venue_ids_within(db: Session, center: ZipCodeResult, radius_miles: int) -> list[str]:
+    """
+    Venues within ``radius_miles`` of ``center``, from their stored
+    coordinates: a bounding box on ix_venue_profiles_lat_lng, then the exact
+    distance. Venues not geocoded yet are left out.
+    """
+    dlat = radius_miles / MILES_PER_DEGREE
+    dlng = radius_miles / (MILES_PER_DEGREE * max(math.cos(math.radians(center.lat)), 0.01))
+    rows = db.query(VenueProfile.id, VenueProfile.latitude, VenueProfile.longitude).filter(
+        VenueProfile.latitude.between(center.lat - dlat, center.lat + dlat),
+        VenueProfile.longitude.between(center.lng - dlng, center.lng + dlng),
+    )
+    return [
+        venue_id
+        for venue_id, lat, lng in rows
+        if haversine_miles(center.lat, center.lng, lat, lng) <= radius_miles
+    ]
+
+
 @router.get("", response_model=list[EventPublicOut])
 def list_events(
+    response: Response,
     include_past: bool = False,
+    from_date: dt_date | None = Query(None, alias="from"),
+    to_date: dt_date | None = Query(None, alias="to"),
+    genres: list[str] = Query(default=[]),
+    center: ZipCodeResult | None = Depends(_near_center),
+    radius: int = Query(25, ge=1, le=500, description="Miles from `near`"),
+    cursor: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    q = db.query(Event, VenueProfile).join(VenueProfile, VenueProfile.id == Event.venue_profile_id)
-    if not include_past:
-        q = q.filter(Event.date >= dt_date.today())
-    q = q.order_by(Event.date.asc())
-
-    rows = q.all()
-    return [
-        EventPublicOut(
-            id=e.id,
-            title=e.title,
-            description=e.description,
-            date=e.date,
-            venue_id=v.id,
-            venue_name=v.venue_name,
-            city=v.city,
-            state=v.state,
+    """
+    Public events soonest-first, one page at a time.
+
+    Defaults to events from today on. Pages are keyset-paginated on
+    (date, id), a range scan on ix_events_date_id however deep the caller
+    pages; the cursor for the next page is returned in the X-Next-Cursor
+    header. ``genres`` matches the hosting venue's genres and ``near`` /
+    ``radius`` keeps venues within that many miles of a zip code. A
+    recurring event appears once per occurrence, with that occurrence's date.
+    """
+    criteria = []
+    if genres:
+        criteria.append(
+            VenueProfile.genres.any(Genre.name.in_([g.strip().lower() for g in genres]))
         )
-        for e, v in rows
-    ]
+    if center:
+        nearby = _venue_ids_within(db, center, radius)
+        if not nearby:
+            return []
+        criteria.append(VenueProfile.id.in_(nearby))
+
+    start = from_date or (None if include_past else dt_date.today())
+    after = decode_date_cursor(cursor) if cursor else None
+    page = occurrence_page(db, criteria, start, to_date, after, limit)
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_date_cursor(*page[-1])
+
+    # Only the venue columns the response needs: loading VenueProfile
+    # entities would also eager-load every venue's genres.
+    details = {
+        e.id: (e, venue_name, city, state)
+        for e, venue_name, city, state in db.query(
+            Event,
+            VenueProfile.venue_name,
+            VenueProfile.city,
+            VenueProfile.state,
+        )
+        .join(VenueProfile, VenueProfile.id == Event.venue_profile_id)
+        .filter(Event.id.in_({event_id for _, event_id in page}))
+    }
+    out = []
+    for occurrence_date, event_id in page:
+        e, venue_name, city, state = details[event_id]
+        out.append(
+            EventPublicOut(
+                id=e.id,
+                title=e.title,
+                description=e.description,
+                date=occurrence_date,
+                venue_id=e.venue_profile_id,
+                venue_name=venue_name,
+                city=city,
+                state=state,
+                rrule=e.rrule,
+            )
+        )
+    return out
 
 
 @router.post("", response_model=EventOut, status_code=status.HTTP_201_CREATED)
@@ -59,15 +182,36 @@ def create_event(
             detail="Venue profile not found",
         )
 
+    existing = (
+        db.query(Event.id)
+        .filter(
+            Event.venue_profile_id == prof.id,
+            Event.title == payload.title,
+            Event.date == payload.date,
+        )
+        .first()
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An event with this title already exists on this date",
+        )
+
     event = Event(
         id=str(uuid.uuid4()),
         venue_profile_id=prof.id,
         title=payload.title,
         description=payload.description,
         date=payload.date,
+        rrule=payload.rrule,
+        series_until=series_until(payload.rrule, payload.date) if payload.rrule else None,
     )
     db.add(event)
+    if event.rrule:
+        db.flush()
+        materialize_occurrences(db, [event.id])
     db.commit()
+    invalidate_event_feeds(prof.id)
     db.refresh(event)
 
     return EventOut(
@@ -75,27 +219,123 @@ def create_event(
         title=event.title,
         description=event.description,
         date=event.date,
+        rrule=event.rrule,
     )
 
 
-@router.post("/import", response_model=EventImportResult)
+MAX_IMPORT_BYTES = 10 * 1024 * 1024
+IMPORT_RETRY_AFTER_SECONDS = 30
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it exceeds ``max_bytes``."""
+    chunks: list[bytes] = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.",
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _importing_venue_id(db: Session, user_id: str) -> str:
+    prof_id = db.query(VenueProfile.id).filter(VenueProfile.user_id == user_id).scalar()
+    if not prof_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Venue profile not found",
+        )
+    return prof_id
+
+
+def _enqueue_import(db: Session, venue_id: str, user_id: str, contents: bytes) -> EventImportJobOut:
+    """Create a background import job, within the per-venue and global caps."""
+    # Lock the venue row so concurrent uploads can't both pass the cap
+    db.query(VenueProfile.id).filter(VenueProfile.id == venue_id).with_for_update().one()
+    if count_unfinished_jobs(db, venue_id) >= settings.EVENT_IMPORT_MAX_UNFINISHED_PER_VENUE:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="This venue already has imports in progress. Wait for them to finish.",
+            headers={"Retry-After": str(IMPORT_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        reserve_import_slot()
+    except ImportQueueFullError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many imports in progress. Try again shortly.",
+            headers={"Retry-After": str(IMPORT_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        job = EventImportJob(
+            id=str(uuid.uuid4()),
+            venue_profile_id=venue_id,
+            created_by_user_id=user_id,
+            status="pending",
+            errors=[],
+            heartbeat_at=datetime.now(timezone.utc),
+        )
+        db.add(job)
+        db.commit()
+        submit_import_job(job.id, contents)
+    except BaseException:
+        release_import_slot()
+        raise
+    # Built here: reading the job after the commit queries it again
+    return _import_job_out(job)
+
+
+def _import_now(db: Session, venue_id: str, contents: bytes) -> EventImportResult:
+    try:
+        parsed = parse_ics(contents)
+    except InvalidCalendarError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    imported = insert_events(db, venue_id, parsed.events)
+    db.commit()
+    invalidate_event_feeds(venue_id)
+    return EventImportResult(
+        imported=imported,
+        # Events that parsed but already existed count as skipped
+        skipped=parsed.skipped + len(parsed.events) - imported,
+        errors=parsed.errors,
+    )
+
+
+@router.post("/import", response_model=EventImportResult | EventImportJobOut)
 async def import_events(
+    response: Response,
     file: UploadFile = File(...),
+    background: bool = Query(False, description="Import in a background job and return its id"),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
+    """
+    Import events from an uploaded .ics file.
+
+    With ``background=true`` the upload is only read and validated here; the
+    parse and insert run in a background worker and the response is a 202
+    with the job, whose progress GET /events/import/{job_id} reports.
+    """
     if user.role not in (UserRole.venue, UserRole.admin):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only venues can import events",
         )
 
-    prof = db.query(VenueProfile).filter(VenueProfile.user_id == user.id).first()
-    if not prof:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Venue profile not found",
-        )
+    # The upload is read asynchronously, but the session is synchronous:
+    # every database step runs in the threadpool, off the event loop
+    venue_id = await run_in_threadpool(_importing_venue_id, db, user.id)
 
     # Validate content type
     if file.content_type and file.content_type not in (
@@ -108,98 +348,168 @@ async def import_events(
             detail="File must be an .ics (iCalendar) file",
         )
 
-    # Read with size limit (2 MB)
-    MAX_SIZE = 2 * 1024 * 1024
-    contents = await file.read()
-    if len(contents) > MAX_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File too large. Maximum size is 2 MB.",
-        )
+    contents = await _read_upload(file, MAX_IMPORT_BYTES)
     if not contents.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File is empty",
         )
 
-    # Parse .ics
-    try:
-        cal = Calendar.from_ical(contents)
-    except Exception:
+    if background:
+        job = await run_in_threadpool(_enqueue_import, db, venue_id, user.id, contents)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job
+
+    # Parsing a large calendar is CPU-bound too
+    return await run_in_threadpool(_import_now, db, venue_id, contents)
+
+
+def _import_job_out(job: EventImportJob) -> EventImportJobOut:
+    return EventImportJobOut(
+        id=job.id,
+        status=job.status,
+        parsed=job.parsed or 0,
+        imported=job.imported or 0,
+        skipped=job.skipped or 0,
+        errors=job.errors or [],
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get("/import/{job_id}", response_model=EventImportJobOut)
+def get_import_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    job = db.get(EventImportJob, job_id)
+    if not job or (user.role != UserRole.admin and job.created_by_user_id != user.id):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid .ics file. Could not parse calendar data.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
         )
+    return _import_job_out(job)
+
+
+@router.get("/feed.{fmt}")
+def get_events_feed(
+    fmt: Literal["ics", "json"],
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Upcoming events platform-wide (next PUBLIC_FEED_DAYS days) as a
+    subscribable .ics calendar or JSON. Cached and conditional: polling
+    clients get a 304 while nothing has changed.
+    """
+    entry = feed_cache.get_or_compute(
+        ("events", fmt), lambda: render_events(db, fmt)
+    )
+    return conditional_response(request, entry, FEED_MEDIA_TYPES[fmt], FEED_CACHE_TTL_SECONDS)
+
+
+def _get_own_venue_profile(db: Session, user) -> VenueProfile:
+    if user.role not in (UserRole.venue, UserRole.admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only venues can manage calendar feeds",
+        )
+    prof = db.query(VenueProfile).filter(VenueProfile.user_id == user.id).first()
+    if not prof:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Venue profile not found",
+        )
+    return prof
+
+
+def _feed_out(feed: CalendarFeed) -> CalendarFeedOut:
+    return CalendarFeedOut(
+        id=feed.id,
+        url=feed.url,
+        last_synced_at=feed.last_synced_at,
+        next_sync_at=feed.next_sync_at,
+        failure_count=feed.failure_count,
+        last_error=feed.last_error,
+        created_at=feed.created_at,
+    )
+
+
+@router.post("/feeds", response_model=CalendarFeedOut, status_code=status.HTTP_201_CREATED)
+def create_calendar_feed(
+    payload: CalendarFeedIn,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Subscribe the caller's venue to a remote .ics URL. The background syncer
+    picks it up on its next tick and keeps the venue's events in step with it.
+    """
+    prof = _get_own_venue_profile(db, user)
+    url = str(payload.url)
 
-    # Load existing events for duplicate detection
     existing = (
-        db.query(Event.title, Event.date)
-        .filter(Event.venue_profile_id == prof.id)
-        .all()
+        db.query(CalendarFeed.id)
+        .filter(CalendarFeed.venue_profile_id == prof.id, CalendarFeed.url == url)
+        .first()
     )
-    existing_set = {(row.title, row.date) for row in existing}
-
-    imported = 0
-    skipped = 0
-    errors: list[str] = []
-
-    for i, component in enumerate(cal.walk()):
-        if component.name != "VEVENT":
-            continue
-
-        # SUMMARY -> title
-        raw_title = component.get("SUMMARY")
-        if not raw_title:
-            errors.append(f"Event #{i + 1}: missing title, skipped")
-            skipped += 1
-            continue
-        title = str(raw_title).strip()
-        if not title:
-            errors.append(f"Event #{i + 1}: empty title, skipped")
-            skipped += 1
-            continue
-        if len(title) > 200:
-            title = title[:200]
-            errors.append(f"Event '{title[:30]}...': title truncated to 200 characters")
-
-        # DTSTART -> date
-        dt_prop = component.get("DTSTART")
-        if not dt_prop:
-            errors.append(f"Event '{title[:50]}': missing date, skipped")
-            skipped += 1
-            continue
-        dt_val = dt_prop.dt
-        if isinstance(dt_val, dt_datetime):
-            event_date = dt_val.date()
-        elif isinstance(dt_val, dt_date):
-            event_date = dt_val
-        else:
-            errors.append(f"Event '{title[:50]}': unrecognized date format, skipped")
-            skipped += 1
-            continue
-
-        # DESCRIPTION -> description (optional)
-        raw_desc = component.get("DESCRIPTION")
-        description = str(raw_desc).strip() if raw_desc else ""
-
-        # Duplicate check
-        if (title, event_date) in existing_set:
-            skipped += 1
-            continue
-
-        event = Event(
-            id=str(uuid.uuid4()),
-            venue_profile_id=prof.id,
-            title=title,
-            description=description,
-            date=event_date,
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This calendar feed is already registered",
         )
-        db.add(event)
-        existing_set.add((title, event_date))
-        imported += 1
 
+    feed = CalendarFeed(
+        id=str(uuid.uuid4()),
+        venue_profile_id=prof.id,
+        url=url,
+        failure_count=0,
+        next_sync_at=datetime.now(timezone.utc),
+    )
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
+    return _feed_out(feed)
+
+
+@router.get("/feeds", response_model=list[CalendarFeedOut])
+def list_calendar_feeds(
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    prof = _get_own_venue_profile(db, user)
+    feeds = (
+        db.query(CalendarFeed)
+        .filter(CalendarFeed.venue_profile_id == prof.id)
+        .order_by(CalendarFeed.created_at.asc())
+        .all()
+    )
+    return [_feed_out(f) for f in feeds]
+
+
+@router.delete("/feeds/{feed_id}")
+def delete_calendar_feed(
+    feed_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Unsubscribe; events synced from the feed are deleted with it."""
+    prof = _get_own_venue_profile(db, user)
+    feed = (
+        db.query(CalendarFeed)
+        .filter(CalendarFeed.id == feed_id, CalendarFeed.venue_profile_id == prof.id)
+        .first()
+    )
+    if not feed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found",
+        )
+    db.delete(feed)
     db.commit()
-    return EventImportResult(imported=imported, skipped=skipped, errors=errors)
+    invalidate_event_feeds(prof.id)
+    return {"ok": True}
 
 
 @router.get("/mine", response_model=list[EventOut])
@@ -224,7 +534,7 @@ def list_my_events(
         .all()
     )
     return [
-        EventOut(id=e.id, title=e.title, description=e.description, date=e.date)
+        EventOut(id=e.id, title=e.title, description=e.description, date=e.date, rrule=e.rrule)
         for e in events
     ]
 
@@ -255,6 +565,7 @@ def get_event(
         venue_name=v.venue_name,
         city=v.city,
         state=v.state,
+        rrule=e.rrule,
     )
 
 
@@ -290,4 +601,5 @@ def delete_event(
 
     db.delete(event)
     db.commit()
+    invalidate_event_feeds(prof.id)
     return {"ok": True}
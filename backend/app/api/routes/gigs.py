@@ -1,19 +1,32 @@
 import uuid
+from datetime import date, datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, case
-from sqlalchemy import func as sa_func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.api.routes._pagination import decode_date_cursor, encode_date_cursor
+from app.core.http_cache import etag_matches, if_match_failed, make_etag
 from app.models.artist import ArtistProfile
 from app.models.gig import Gig, GigStatus
 from app.models.match import Match
 from app.models.user import User, UserRole
 from app.models.venue import VenueProfile
-from app.services.relationship_log import log_relationship_action
+from app.services.artist_stats import get_or_create_artist_stats, refresh_artist_stats
+from app.services.calendar_export import invalidate_gig_feeds
+from app.services.leaderboard import refresh_artist_venue_pairs, refresh_monthly_buckets
+from app.services.relationship_log import (
+    log_relationship_action,
+    log_relationship_actions,
+)
+from app.services.trending import record_trending, verified_gig_weight
 from app.schemas.gig import (
     ArtistStatsOut,
+    GigBatchConfirmIn,
+    GigBatchItemResult,
+    GigBatchMetricsIn,
+    GigBatchResult,
     GigCreateIn,
     GigHistoryItem,
     GigMetricsIn,
@@ -45,6 +58,7 @@ def _gig_out(gig: Gig, artist_name: str, venue_name: str) -> GigOut:
         gross_revenue_cents=gig.gross_revenue_cents,
         artist_confirmed=gig.artist_confirmed,
         venue_confirmed=gig.venue_confirmed,
+        version=gig.version,
         created_by_user_id=gig.created_by_user_id,
         created_at=gig.created_at,
         updated_at=gig.updated_at,
@@ -85,35 +99,208 @@ def _has_mutual_match(db: Session, user_id_a: str, user_id_b: str) -> bool:
     return fwd is not None and rev is not None
 
 
-def _load_gig_row(db: Session, gig_id: str):
-    """Load gig with joined artist/venue names. Returns (Gig, artist_name, venue_name) or None."""
-    return (
-        db.query(Gig, ArtistProfile.name, VenueProfile.venue_name)
+def _load_gig_row(db: Session, gig_id: str, for_update: bool = False):
+    """
+    Load a gig together with both parties' user IDs and names in one query.
+
+    Returns a row with attributes (Gig, artist_user_id, artist_name,
+    venue_user_id, venue_name) or None. With ``for_update`` the gig row is
+    locked until the transaction ends.
+    """
+    q = (
+        db.query(
+            Gig,
+            ArtistProfile.user_id.label("artist_user_id"),
+            ArtistProfile.name.label("artist_name"),
+            VenueProfile.user_id.label("venue_user_id"),
+            VenueProfile.venue_name.label("venue_name"),
+        )
         .join(ArtistProfile, ArtistProfile.id == Gig.artist_profile_id)
         .join(VenueProfile, VenueProfile.id == Gig.venue_profile_id)
         .filter(Gig.id == gig_id)
-        .first()
     )
+    if for_update:
+        q = q.with_for_update(of=Gig)
+    return q.first()
 
 
-def _assert_participant(db: Session, gig: Gig, user: User):
+def _assert_participant(user: User, row) -> None:
     """Raise 403 if user is not the artist or venue for this gig."""
-    artist_prof = db.get(ArtistProfile, gig.artist_profile_id)
-    venue_prof = db.get(VenueProfile, gig.venue_profile_id)
     if user.role == UserRole.admin:
-        return artist_prof, venue_prof
-    if user.id != artist_prof.user_id and user.id != venue_prof.user_id:
+        return
+    if user.id != row.artist_user_id and user.id != row.venue_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not part of this gig",
         )
-    return artist_prof, venue_prof
 
 
-def _get_target_info(user: User, artist_prof: ArtistProfile, venue_prof: VenueProfile) -> tuple:
-    if user.id == artist_prof.user_id:
-        return (venue_prof.user_id, venue_prof.venue_name, "venue")
-    return (artist_prof.user_id, artist_prof.name, "artist")
+def _get_target_info(
+    user: User,
+    artist_user_id: str,
+    artist_name: str,
+    venue_user_id: str,
+    venue_name: str,
+) -> tuple:
+    if user.id == artist_user_id:
+        return (venue_user_id, venue_name, "venue")
+    return (artist_user_id, artist_name, "artist")
+
+
+def _gig_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _check_if_match(request: Request, gig: Gig) -> None:
+    """Raise 412 if the client's If-Match names a version other than the locked row's."""
+    if if_match_failed(request, _gig_etag(gig.version)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Gig was modified by someone else. Reload and try again.",
+            headers={"ETag": _gig_etag(gig.version)},
+        )
+
+
+def _update_gig(db: Session, gig_id: str, values: dict) -> Gig:
+    """Apply ``values`` with a single UPDATE ... RETURNING and return the fresh Gig."""
+    stmt = (
+        update(Gig)
+        .where(Gig.id == gig_id)
+        .values(version=Gig.version + 1, **values)
+        .returning(Gig)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def _load_gig_rows_for_update(db: Session, gig_ids: list[str]) -> dict:
+    """Lock and load many gigs (same shape as ``_load_gig_row``), keyed by gig ID.
+
+    Rows are locked in ID order so concurrent batches cannot deadlock.
+    """
+    rows = (
+        db.query(
+            Gig,
+            ArtistProfile.user_id.label("artist_user_id"),
+            ArtistProfile.name.label("artist_name"),
+            VenueProfile.user_id.label("venue_user_id"),
+            VenueProfile.venue_name.label("venue_name"),
+        )
+        .join(ArtistProfile, ArtistProfile.id == Gig.artist_profile_id)
+        .join(VenueProfile, VenueProfile.id == Gig.venue_profile_id)
+        .filter(Gig.id.in_(gig_ids))
+        .order_by(Gig.id)
+        .with_for_update(of=Gig)
+        .all()
+    )
+    return {row.Gig.id: row for row in rows}
+
+
+def _batch_row_error(user: User, row) -> str | None:
+    """Per-item equivalent of the 404/403/cancelled checks in single-gig mutations."""
+    if row is None:
+        return "Gig not found"
+    if user.role != UserRole.admin and user.id not in (
+        row.artist_user_id,
+        row.venue_user_id,
+    ):
+        return "You are not part of this gig"
+    if row.Gig.status == GigStatus.cancelled:
+        return "Gig is cancelled"
+    return None
+
+
+def _batch_version_error(row, expected_version: int | None) -> str | None:
+    if expected_version is not None and expected_version != row.Gig.version:
+        return "Gig was modified by someone else. Reload and try again."
+    return None
+
+
+def _verified_gig_bumps(gig: Gig, attendance: int | None) -> list[tuple]:
+    """Trending bumps for a gig that just became confirmed by both parties."""
+    points = verified_gig_weight(attendance)
+    return [
+        ("artist", gig.artist_profile_id, points),
+        ("venue", gig.venue_profile_id, points),
+    ]
+
+
+def _apply_batch(
+    db: Session,
+    user: User,
+    action: str,
+    updates: list[tuple],
+    results: list[GigBatchItemResult],
+) -> None:
+    """
+    Write a batch of (result_index, row, values, details) updates: one
+    executemany UPDATE by primary key, one multi-row log INSERT, one trending
+    upsert and one stats refresh per artist. Successful entries in ``results``
+    are filled in place.
+    """
+    if not updates:
+        return
+
+    # The rows still hold their pre-update values here
+    trending = []
+    for _, row, values, _ in updates:
+        gig = row.Gig
+        if gig.artist_confirmed and gig.venue_confirmed:
+            continue
+        if values.get("artist_confirmed", gig.artist_confirmed) and values.get(
+            "venue_confirmed", gig.venue_confirmed
+        ):
+            trending.extend(
+                _verified_gig_bumps(gig, values.get("attendance", gig.attendance))
+            )
+
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(Gig),
+        [{"id": row.Gig.id, "updated_at": now, **values} for _, row, values, _ in updates],
+    )
+
+    log_entries = []
+    for idx, row, values, details in updates:
+        gig = row.Gig
+        target_user_id, target_name, target_role = _get_target_info(
+            user, row.artist_user_id, row.artist_name, row.venue_user_id, row.venue_name
+        )
+        log_entries.append(
+            {
+                "actor_user_id": user.id,
+                "target_user_id": target_user_id,
+                "action": action,
+                "entity_type": "gig",
+                "entity_id": gig.id,
+                "details": {
+                    "gig_title": gig.title,
+                    "gig_date": str(gig.date),
+                    "target_name": target_name,
+                    "target_role": target_role,
+                    **details,
+                },
+            }
+        )
+        out = _gig_out(gig, row.artist_name, row.venue_name).model_copy(
+            update={"updated_at": now, **values}
+        )
+        results[idx] = GigBatchItemResult(gig_id=gig.id, ok=True, gig=out)
+    log_relationship_actions(db, log_entries)
+    record_trending(db, trending, now)
+
+    for artist_profile_id in sorted({row.Gig.artist_profile_id for _, row, _, _ in updates}):
+        refresh_artist_stats(db, artist_profile_id)
+    refresh_monthly_buckets(db, [row.Gig for _, row, _, _ in updates])
+
+
+def _batch_result(results: list[GigBatchItemResult]) -> GigBatchResult:
+    succeeded = sum(1 for r in results if r.ok)
+    return GigBatchResult(
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -180,7 +367,11 @@ def create_gig(
     )
     db.add(gig)
     target_user_id, target_name, target_role = _get_target_info(
-        user, artist_prof, venue_prof
+        user,
+        artist_prof.user_id,
+        artist_prof.name,
+        venue_prof.user_id,
+        venue_prof.venue_name,
     )
     log_relationship_action(
         db,
@@ -196,7 +387,10 @@ def create_gig(
             "target_role": target_role,
         },
     )
+    refresh_monthly_buckets(db, [gig])
+    refresh_artist_venue_pairs(db, [gig])
     db.commit()
+    invalidate_gig_feeds(gig.artist_profile_id)
     db.refresh(gig)
 
     return _gig_out(gig, artist_prof.name, venue_prof.venue_name)
@@ -209,10 +403,22 @@ def create_gig(
 
 @router.get("", response_model=list[GigOut])
 def list_gigs(
-    status_filter: GigStatus | None = Query(None, alias="status"),
+    response: Response,
+    status_filter: list[GigStatus] = Query(default=[], alias="status"),
+    from_date: date | None = Query(None, alias="from"),
+    to_date: date | None = Query(None, alias="to"),
+    cursor: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    """
+    List the caller's gigs newest-first, one page at a time.
+
+    Pages are keyset-paginated on (date, id) so each page is a range scan on
+    the (profile_id, date) index regardless of how deep the caller pages.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
     artist_id, venue_id = _get_user_profile_ids(db, user)
 
     q = (
@@ -229,9 +435,20 @@ def list_gigs(
         return []
 
     if status_filter:
-        q = q.filter(Gig.status == status_filter)
-
-    rows = q.order_by(Gig.date.desc()).all()
+        q = q.filter(Gig.status.in_(status_filter))
+    if from_date:
+        q = q.filter(Gig.date >= from_date)
+    if to_date:
+        q = q.filter(Gig.date <= to_date)
+    if cursor:
+        cursor_date, cursor_id = decode_date_cursor(cursor)
+        q = q.filter(tuple_(Gig.date, Gig.id) < tuple_(cursor_date, cursor_id))
+
+    rows = q.order_by(Gig.date.desc(), Gig.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_date_cursor(last.date, last.id)
     return [_gig_out(g, aname, vname) for g, aname, vname in rows]
 
 
@@ -244,57 +461,66 @@ def list_gigs(
 @router.get("/stats/{artist_profile_id}", response_model=ArtistStatsOut)
 def get_artist_stats(
     artist_profile_id: str,
+    request: Request,
+    response: Response,
+    history_cursor: str | None = Query(None),
+    history_limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
 ):
+    """
+    Public completed-gig stats for an artist.
+
+    Aggregates come from the precomputed artist_stats row; only the requested
+    page of gig history is read from gigs. Responses carry an ETag derived
+    from the stats revision, which renaming a venue in the history also bumps,
+    so unchanged stats are answered with a 304.
+    """
     artist_prof = db.get(ArtistProfile, artist_profile_id)
     if not artist_prof:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Artist profile not found"
         )
 
-    # SQL-level aggregation for completed gigs
-    stats = (
-        db.query(
-            sa_func.count(Gig.id).label("total_gigs"),
-            sa_func.count(
-                case(
-                    (
-                        and_(
-                            Gig.artist_confirmed == True,  # noqa: E712
-                            Gig.venue_confirmed == True,  # noqa: E712
-                        ),
-                        Gig.id,
-                    ),
-                )
-            ).label("verified_gigs"),
-            sa_func.avg(Gig.attendance).label("avg_attendance"),
-            sa_func.avg(Gig.tickets_sold).label("avg_tickets_sold"),
-            sa_func.coalesce(sa_func.sum(Gig.tickets_sold), 0).label(
-                "total_tickets_sold"
-            ),
-            sa_func.count(sa_func.distinct(Gig.venue_profile_id)).label(
-                "unique_venues_count"
-            ),
-        )
-        .filter(
-            Gig.artist_profile_id == artist_profile_id,
-            Gig.status == GigStatus.completed,
-        )
-        .first()
+    stats = get_or_create_artist_stats(db, artist_profile_id)
+
+    etag = make_etag(
+        artist_profile_id,
+        stats.revision,
+        artist_prof.name,
+        history_cursor,
+        history_limit,
     )
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "public, no-cache"
 
-    # Gig history
-    history_rows = (
+    # Gig history page
+    history_q = (
         db.query(Gig, VenueProfile.venue_name)
         .join(VenueProfile, VenueProfile.id == Gig.venue_profile_id)
         .filter(
             Gig.artist_profile_id == artist_profile_id,
             Gig.status == GigStatus.completed,
         )
-        .order_by(Gig.date.desc())
+    )
+    if history_cursor:
+        cursor_date, cursor_id = decode_date_cursor(history_cursor)
+        history_q = history_q.filter(
+            tuple_(Gig.date, Gig.id) < tuple_(cursor_date, cursor_id)
+        )
+    history_rows = (
+        history_q.order_by(Gig.date.desc(), Gig.id.desc())
+        .limit(history_limit + 1)
         .all()
     )
 
+    next_history_cursor = None
+    if len(history_rows) > history_limit:
+        history_rows = history_rows[:history_limit]
+        last = history_rows[-1][0]
+        next_history_cursor = encode_date_cursor(last.date, last.id)
+
     gig_history = [
         GigHistoryItem(
             gig_id=gig.id,
@@ -310,24 +536,135 @@ def get_artist_stats(
     return ArtistStatsOut(
         artist_profile_id=artist_profile_id,
         artist_name=artist_prof.name,
-        total_gigs=stats.total_gigs or 0,
-        verified_gigs=stats.verified_gigs or 0,
+        total_gigs=stats.total_gigs,
+        verified_gigs=stats.verified_gigs,
         avg_attendance=(
-            round(float(stats.avg_attendance), 1)
-            if stats.avg_attendance is not None
+            round(stats.attendance_sum / stats.attendance_count, 1)
+            if stats.attendance_count
             else None
         ),
         avg_tickets_sold=(
-            round(float(stats.avg_tickets_sold), 1)
-            if stats.avg_tickets_sold is not None
+            round(stats.tickets_sold_sum / stats.tickets_sold_count, 1)
+            if stats.tickets_sold_count
             else None
         ),
-        total_tickets_sold=stats.total_tickets_sold or 0,
-        unique_venues_count=stats.unique_venues_count or 0,
+        total_tickets_sold=stats.tickets_sold_sum,
+        unique_venues_count=stats.unique_venues_count,
         gig_history=gig_history,
+        next_history_cursor=next_history_cursor,
     )
 
 
+# ---------------------------------------------------------------------------
+# 3b) PATCH /gigs/batch/metrics  –  Submit metrics for many gigs
+#     POST  /gigs/batch/confirm  –  Confirm metrics for many gigs
+#     MUST be defined before /{gig_id} routes
+# ---------------------------------------------------------------------------
+
+
+@router.patch("/batch/metrics", response_model=GigBatchResult)
+def batch_update_metrics(
+    payload: GigBatchMetricsIn,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Submit metrics for up to 100 gigs at once. Invalid items are reported
+    individually; the valid ones are still applied.
+    """
+    rows = _load_gig_rows_for_update(db, list({i.gig_id for i in payload.items}))
+
+    results: list[GigBatchItemResult] = []
+    updates: list[tuple] = []
+    seen: set[str] = set()
+    for item in payload.items:
+        if item.gig_id in seen:
+            results.append(
+                GigBatchItemResult(gig_id=item.gig_id, ok=False, error="Duplicate gig in batch")
+            )
+            continue
+        seen.add(item.gig_id)
+
+        row = rows.get(item.gig_id)
+        error = _batch_row_error(user, row) or _batch_version_error(
+            row, item.expected_version
+        )
+        if error:
+            results.append(GigBatchItemResult(gig_id=item.gig_id, ok=False, error=error))
+            continue
+
+        changed = item.model_dump(exclude={"gig_id", "expected_version"}, exclude_none=True)
+        if not changed:
+            results.append(
+                GigBatchItemResult(gig_id=item.gig_id, ok=False, error="No metrics provided")
+            )
+            continue
+
+        # Reset OTHER party's confirmation when metrics change. The row is
+        # locked, so its next version can be computed here for the bulk UPDATE.
+        values = dict(changed, version=row.Gig.version + 1)
+        if user.id == row.artist_user_id:
+            values["venue_confirmed"] = False
+        else:
+            values["artist_confirmed"] = False
+        updates.append((len(results), row, values, {"changes": changed}))
+        results.append(GigBatchItemResult(gig_id=item.gig_id, ok=True))
+
+    _apply_batch(db, user, "gig_metrics_updated", updates, results)
+    artist_profile_ids = {row.Gig.artist_profile_id for _, row, _, _ in updates}
+    db.commit()
+    invalidate_gig_feeds(*artist_profile_ids)
+    return _batch_result(results)
+
+
+@router.post("/batch/confirm", response_model=GigBatchResult)
+def batch_confirm_gigs(
+    payload: GigBatchConfirmIn,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Confirm metrics for up to 100 gigs at once. Invalid items are reported
+    individually; the valid ones are still applied.
+    """
+    rows = _load_gig_rows_for_update(db, list(set(payload.gig_ids)))
+
+    results: list[GigBatchItemResult] = []
+    updates: list[tuple] = []
+    seen: set[str] = set()
+    for gig_id in payload.gig_ids:
+        if gig_id in seen:
+            results.append(
+                GigBatchItemResult(gig_id=gig_id, ok=False, error="Duplicate gig in batch")
+            )
+            continue
+        seen.add(gig_id)
+
+        row = rows.get(gig_id)
+        error = _batch_row_error(user, row) or _batch_version_error(
+            row, payload.expected_versions.get(gig_id)
+        )
+        if not error and row.Gig.tickets_sold is None and row.Gig.attendance is None:
+            error = "No metrics to confirm. Submit metrics first."
+        if error:
+            results.append(GigBatchItemResult(gig_id=gig_id, ok=False, error=error))
+            continue
+
+        values = {"version": row.Gig.version + 1}
+        if user.id == row.artist_user_id:
+            values["artist_confirmed"] = True
+        else:
+            values["venue_confirmed"] = True
+        updates.append((len(results), row, values, {}))
+        results.append(GigBatchItemResult(gig_id=gig_id, ok=True))
+
+    _apply_batch(db, user, "gig_metrics_confirmed", updates, results)
+    artist_profile_ids = {row.Gig.artist_profile_id for _, row, _, _ in updates}
+    db.commit()
+    invalidate_gig_feeds(*artist_profile_ids)
+    return _batch_result(results)
+
+
 # ---------------------------------------------------------------------------
 # 4) GET /gigs/{gig_id}  –  Gig detail
 # ---------------------------------------------------------------------------
@@ -336,6 +673,7 @@ def get_artist_stats(
 @router.get("/{gig_id}", response_model=GigOut)
 def get_gig(
     gig_id: str,
+    response: Response,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -345,9 +683,20 @@ def get_gig(
             status_code=status.HTTP_404_NOT_FOUND, detail="Gig not found"
         )
 
-    gig, aname, vname = row
-    _assert_participant(db, gig, user)  # return value unused; read-only endpoint
-    return _gig_out(gig, aname, vname)
+    _assert_participant(user, row)
+    response.headers["ETag"] = _gig_etag(row.Gig.version)
+    return _gig_out(row.Gig, row.artist_name, row.venue_name)
+
+
+# ---------------------------------------------------------------------------
+# Mutations below follow the same round-trip-minimal shape:
+#   1. SELECT gig + both parties ... FOR UPDATE   (one query, row locked)
+#      An If-Match header naming a stale version is rejected with 412.
+#   2. UPDATE gigs ... RETURNING *                (no follow-up refresh)
+#      version is bumped; the new value is returned as the ETag.
+#   3. INSERT relationship log + stats upsert, COMMIT
+# The response is built before COMMIT so expired attributes are never reloaded.
+# ---------------------------------------------------------------------------
 
 
 # ---------------------------------------------------------------------------
@@ -358,53 +707,50 @@ def get_gig(
 @router.patch("/{gig_id}/metrics", response_model=GigOut)
 def update_metrics(
     gig_id: str,
+    request: Request,
+    response: Response,
     payload: GigMetricsIn,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    row = _load_gig_row(db, gig_id)
+    row = _load_gig_row(db, gig_id, for_update=True)
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Gig not found"
         )
 
-    gig, aname, vname = row
-    artist_prof, venue_prof = _assert_participant(db, gig, user)
+    _assert_participant(user, row)
+    _check_if_match(request, row.Gig)
 
-    if gig.status == GigStatus.cancelled:
+    if row.Gig.status == GigStatus.cancelled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot update metrics for a cancelled gig",
         )
 
     # Update only provided fields
+    changed = {}
     if payload.tickets_sold is not None:
-        gig.tickets_sold = payload.tickets_sold
+        changed["tickets_sold"] = payload.tickets_sold
     if payload.attendance is not None:
-        gig.attendance = payload.attendance
+        changed["attendance"] = payload.attendance
     if payload.ticket_price_cents is not None:
-        gig.ticket_price_cents = payload.ticket_price_cents
+        changed["ticket_price_cents"] = payload.ticket_price_cents
     if payload.gross_revenue_cents is not None:
-        gig.gross_revenue_cents = payload.gross_revenue_cents
+        changed["gross_revenue_cents"] = payload.gross_revenue_cents
 
     # Reset OTHER party's confirmation when metrics change
-    if user.id == artist_prof.user_id:
-        gig.venue_confirmed = False
+    values = dict(changed)
+    if user.id == row.artist_user_id:
+        values["venue_confirmed"] = False
     else:
-        gig.artist_confirmed = False
+        values["artist_confirmed"] = False
+
+    gig = _update_gig(db, gig_id, values)
 
     target_user_id, target_name, target_role = _get_target_info(
-        user, artist_prof, venue_prof
+        user, row.artist_user_id, row.artist_name, row.venue_user_id, row.venue_name
     )
-    changed = {}
-    if payload.tickets_sold is not None:
-        changed["tickets_sold"] = payload.tickets_sold
-    if payload.attendance is not None:
-        changed["attendance"] = payload.attendance
-    if payload.ticket_price_cents is not None:
-        changed["ticket_price_cents"] = payload.ticket_price_cents
-    if payload.gross_revenue_cents is not None:
-        changed["gross_revenue_cents"] = payload.gross_revenue_cents
     log_relationship_action(
         db,
         actor_user_id=user.id,
@@ -420,10 +766,14 @@ def update_metrics(
             "changes": changed,
         },
     )
+    refresh_artist_stats(db, gig.artist_profile_id)
+    refresh_monthly_buckets(db, [gig])
 
+    response.headers["ETag"] = _gig_etag(gig.version)
+    out = _gig_out(gig, row.artist_name, row.venue_name)
     db.commit()
-    db.refresh(gig)
-    return _gig_out(gig, aname, vname)
+    invalidate_gig_feeds(out.artist_profile_id)
+    return out
 
 
 # ---------------------------------------------------------------------------
@@ -434,37 +784,44 @@ def update_metrics(
 @router.post("/{gig_id}/confirm", response_model=GigOut)
 def confirm_gig(
     gig_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    row = _load_gig_row(db, gig_id)
+    row = _load_gig_row(db, gig_id, for_update=True)
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Gig not found"
         )
 
-    gig, aname, vname = row
-    artist_prof, venue_prof = _assert_participant(db, gig, user)
+    _assert_participant(user, row)
+    _check_if_match(request, row.Gig)
 
-    if gig.status == GigStatus.cancelled:
+    if row.Gig.status == GigStatus.cancelled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot confirm a cancelled gig",
         )
 
-    if gig.tickets_sold is None and gig.attendance is None:
+    if row.Gig.tickets_sold is None and row.Gig.attendance is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No metrics to confirm. Submit metrics first.",
         )
 
-    if user.id == artist_prof.user_id:
-        gig.artist_confirmed = True
+    if user.id == row.artist_user_id:
+        values = {"artist_confirmed": True}
     else:
-        gig.venue_confirmed = True
+        values = {"venue_confirmed": True}
+    was_verified = row.Gig.artist_confirmed and row.Gig.venue_confirmed
+
+    gig = _update_gig(db, gig_id, values)
+    if gig.artist_confirmed and gig.venue_confirmed and not was_verified:
+        record_trending(db, _verified_gig_bumps(gig, gig.attendance))
 
     target_user_id, target_name, target_role = _get_target_info(
-        user, artist_prof, venue_prof
+        user, row.artist_user_id, row.artist_name, row.venue_user_id, row.venue_name
     )
     log_relationship_action(
         db,
@@ -480,10 +837,14 @@ def confirm_gig(
             "target_role": target_role,
         },
     )
+    refresh_artist_stats(db, gig.artist_profile_id)
+    refresh_monthly_buckets(db, [gig])
 
+    response.headers["ETag"] = _gig_etag(gig.version)
+    out = _gig_out(gig, row.artist_name, row.venue_name)
     db.commit()
-    db.refresh(gig)
-    return _gig_out(gig, aname, vname)
+    invalidate_gig_feeds(out.artist_profile_id)
+    return out
 
 
 # ---------------------------------------------------------------------------
@@ -494,34 +855,37 @@ def confirm_gig(
 @router.patch("/{gig_id}/status", response_model=GigOut)
 def update_gig_status(
     gig_id: str,
+    request: Request,
+    response: Response,
     payload: GigStatusIn,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    row = _load_gig_row(db, gig_id)
+    row = _load_gig_row(db, gig_id, for_update=True)
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Gig not found"
         )
 
-    gig, aname, vname = row
-    artist_prof, venue_prof = _assert_participant(db, gig, user)
+    _assert_participant(user, row)
+    _check_if_match(request, row.Gig)
 
-    if gig.status == GigStatus.cancelled:
+    if row.Gig.status == GigStatus.cancelled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cancelled gigs cannot be updated",
         )
 
-    if gig.status == GigStatus.completed and payload.status == "completed":
+    if row.Gig.status == GigStatus.completed and payload.status == "completed":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Gig is already completed",
         )
 
-    gig.status = GigStatus(payload.status)
+    gig = _update_gig(db, gig_id, {"status": GigStatus(payload.status)})
+
     target_user_id, target_name, target_role = _get_target_info(
-        user, artist_prof, venue_prof
+        user, row.artist_user_id, row.artist_name, row.venue_user_id, row.venue_name
     )
     log_relationship_action(
         db,
@@ -538,6 +902,13 @@ def update_gig_status(
             "target_role": target_role,
         },
     )
+    refresh_artist_stats(db, gig.artist_profile_id)
+    refresh_monthly_buckets(db, [gig])
+    if gig.status == GigStatus.cancelled:
+        refresh_artist_venue_pairs(db, [gig])
+
+    response.headers["ETag"] = _gig_etag(gig.version)
+    out = _gig_out(gig, row.artist_name, row.venue_name)
     db.commit()
-    db.refresh(gig)
-    return _gig_out(gig, aname, vname)
+    invalidate_gig_feeds(out.artist_profile_id)
+    return out
@@ -1,77 +1,136 @@
+import json
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import case, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core.config import settings
+from app.core.http_cache import etag_matches
+from app.core.response_cache import CachedResponse, ResponseCache
 from app.models.artist import ArtistProfile
-from app.models.gig import Gig, GigStatus
+from app.models.leaderboard import (
+    leaderboard_cities,
+    leaderboard_rollup,
+    normalize_location_key,
+)
+from app.models.trending_score import TrendingScore
 from app.models.venue import VenueProfile
 from app.schemas.leaderboard import (
     ArtistLeaderboardEntry,
+    LeaderboardMetric,
     LeaderboardOut,
+    LeaderboardWindow,
+    RankEntry,
+    RankOut,
+    TrendingEntry,
+    TrendingOut,
     VenueLeaderboardEntry,
 )
+from app.services.trending import decayed_score
 
 router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
 
+# Short TTL: the rollup views themselves only refresh every few minutes
+CACHE_TTL_SECONDS = 30
+_cache = ResponseCache(ttl_seconds=CACHE_TTL_SECONDS)
+
+
+def _cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}",
+    }
+    if etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Public sort names -> rollup columns. Every column has a per-scope index
+# ordered (column DESC NULLS LAST, profile_id), matching _top_rows.
+_METRIC_COLUMNS = {
+    "total_gigs": leaderboard_rollup.c.total_gigs,
+    "verified_gigs": leaderboard_rollup.c.verified_gigs,
+    "total_attendance": leaderboard_rollup.c.total_attendance,
+    "avg_attendance": leaderboard_rollup.c.avg_attendance,
+    "tickets": leaderboard_rollup.c.total_tickets_sold,
+    "revenue": leaderboard_rollup.c.total_revenue_cents,
+}
+
+
+def _scope_filters(
+    entity_type: str,
+    window: str,
+    city: Optional[str],
+    state: Optional[str],
+) -> list:
+    """WHERE clauses selecting one leaderboard scope; each combination has a matching index."""
+    lb = leaderboard_rollup.c
+    filters = [lb.entity_type == entity_type, lb.time_window == window]
+    if city:
+        filters.append(lb.city_key == normalize_location_key(city))
+    if state:
+        filters.append(lb.state_key == normalize_location_key(state))
+    return filters
+
+
+def _top_rows(
+    db: Session,
+    entity_type: str,
+    window: str,
+    city: Optional[str],
+    state: Optional[str],
+    sort: str,
+    min_verified_gigs: int,
+    limit: int,
+):
+    """Top-N read from the rollup view, walking the sort column's index."""
+    lb = leaderboard_rollup.c
+    sort_col = _METRIC_COLUMNS[sort]
+    filters = _scope_filters(entity_type, window, city, state)
+    if min_verified_gigs:
+        filters.append(lb.verified_gigs >= min_verified_gigs)
+    q = (
+        select(leaderboard_rollup)
+        .where(*filters)
+        .order_by(sort_col.desc().nulls_last(), lb.profile_id)
+        .limit(limit)
+    )
+    return db.execute(q).all()
+
 
 @router.get("", response_model=LeaderboardOut)
 def get_leaderboard(
+    request: Request,
+    window: LeaderboardWindow = Query("all"),
     city: Optional[str] = Query(None),
     state: Optional[str] = Query(None),
+    sort: LeaderboardMetric = Query("total_gigs"),
+    min_verified_gigs: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
 ):
     """
     Public leaderboard showing top venues and artists by gig count,
-    attendance, and more. Optionally filter by city/state.
-    """
-
-    # ── Venue leaderboard ──
-    verified_case = case(
-        (
-            (Gig.artist_confirmed == True) & (Gig.venue_confirmed == True),  # noqa: E712
-            1,
-        ),
-        else_=0,
-    )
-
-    venue_q = (
-        db.query(
-            VenueProfile.id.label("venue_profile_id"),
-            VenueProfile.venue_name,
-            VenueProfile.city,
-            VenueProfile.state,
-            func.count(Gig.id).label("total_gigs"),
-            func.sum(verified_case).label("verified_gigs"),
-            func.sum(Gig.attendance).label("total_attendance"),
-            func.avg(Gig.attendance).label("avg_attendance"),
-            func.sum(Gig.tickets_sold).label("total_tickets_sold"),
-            func.count(func.distinct(Gig.artist_profile_id)).label("unique_artists"),
-        )
-        .join(Gig, Gig.venue_profile_id == VenueProfile.id)
-        .filter(Gig.status != GigStatus.cancelled)
-    )
-
-    if city:
-        venue_q = venue_q.filter(func.lower(VenueProfile.city) == city.lower())
-    if state:
-        venue_q = venue_q.filter(func.lower(VenueProfile.state) == state.lower())
+    attendance, and more. Optionally filter by city/state, restrict to a
+    trailing 30/90/365-day window, sort by another metric, and require a
+    minimum number of verified gigs (e.g. to keep one-off averages out).
 
-    venue_q = (
-        venue_q.group_by(VenueProfile.id)
-        .order_by(func.count(Gig.id).desc())
-        .limit(limit)
-    )
+    Rows come precomputed from the leaderboard_rollup materialized view, which
+    the scheduler rebuilds every few minutes from the monthly buckets. Windows
+    start on a month boundary and end today: "30d" covers every month that
+    overlaps the last 30 days, up to today's gigs. Profiles without a value
+    for the sort metric are listed last. Serialized responses are cached per
+    query for CACHE_TTL_SECONDS.
+    """
 
-    venues = []
-    for row in venue_q.all():
-        venues.append(
+    def compute() -> bytes:
+        venues = [
             VenueLeaderboardEntry(
-                venue_profile_id=row.venue_profile_id,
-                venue_name=row.venue_name,
+                venue_profile_id=row.profile_id,
+                venue_name=row.name,
                 city=row.city,
                 state=row.state,
                 total_gigs=row.total_gigs,
@@ -79,45 +138,18 @@ def get_leaderboard(
                 total_attendance=row.total_attendance,
                 avg_attendance=round(row.avg_attendance, 1) if row.avg_attendance else None,
                 total_tickets_sold=row.total_tickets_sold,
-                unique_artists=row.unique_artists,
+                total_revenue_cents=row.total_revenue_cents,
+                unique_artists=row.unique_counterparts,
             )
-        )
-
-    # ── Artist leaderboard ──
-    artist_q = (
-        db.query(
-            ArtistProfile.id.label("artist_profile_id"),
-            ArtistProfile.name.label("artist_name"),
-            ArtistProfile.city,
-            ArtistProfile.state,
-            func.count(Gig.id).label("total_gigs"),
-            func.sum(verified_case).label("verified_gigs"),
-            func.sum(Gig.attendance).label("total_attendance"),
-            func.avg(Gig.attendance).label("avg_attendance"),
-            func.sum(Gig.tickets_sold).label("total_tickets_sold"),
-            func.count(func.distinct(Gig.venue_profile_id)).label("unique_venues"),
-        )
-        .join(Gig, Gig.artist_profile_id == ArtistProfile.id)
-        .filter(Gig.status != GigStatus.cancelled)
-    )
-
-    if city:
-        artist_q = artist_q.filter(func.lower(ArtistProfile.city) == city.lower())
-    if state:
-        artist_q = artist_q.filter(func.lower(ArtistProfile.state) == state.lower())
-
-    artist_q = (
-        artist_q.group_by(ArtistProfile.id)
-        .order_by(func.count(Gig.id).desc())
-        .limit(limit)
-    )
+            for row in _top_rows(
+                db, "venue", window, city, state, sort, min_verified_gigs, limit
+            )
+        ]
 
-    artists = []
-    for row in artist_q.all():
-        artists.append(
+        artists = [
             ArtistLeaderboardEntry(
-                artist_profile_id=row.artist_profile_id,
-                artist_name=row.artist_name,
+                artist_profile_id=row.profile_id,
+                artist_name=row.name,
                 city=row.city,
                 state=row.state,
                 total_gigs=row.total_gigs,
@@ -125,28 +157,224 @@ def get_leaderboard(
                 total_attendance=row.total_attendance,
                 avg_attendance=round(row.avg_attendance, 1) if row.avg_attendance else None,
                 total_tickets_sold=row.total_tickets_sold,
-                unique_venues=row.unique_venues,
+                total_revenue_cents=row.total_revenue_cents,
+                unique_venues=row.unique_counterparts,
             )
-        )
+            for row in _top_rows(
+                db, "artist", window, city, state, sort, min_verified_gigs, limit
+            )
+        ]
 
-    return LeaderboardOut(
-        city=city,
-        state=state,
-        venues=venues,
-        artists=artists,
-    )
+        return LeaderboardOut(
+            window=window,
+            sort=sort,
+            min_verified_gigs=min_verified_gigs,
+            city=city,
+            state=state,
+            venues=venues,
+            artists=artists,
+        ).model_dump_json().encode()
+
+    key = ("leaderboard", window, city, state, sort, min_verified_gigs, limit)
+    entry = _cache.get_or_compute(key, compute)
+    return _cached_json_response(request, entry)
 
 
 @router.get("/cities", response_model=list[str])
-def get_available_cities(db: Session = Depends(get_db)):
+def get_available_cities(request: Request, db: Session = Depends(get_db)):
     """Return cities that have at least one non-cancelled gig."""
-    rows = (
-        db.query(VenueProfile.city)
-        .join(Gig, Gig.venue_profile_id == VenueProfile.id)
-        .filter(Gig.status != GigStatus.cancelled)
-        .filter(VenueProfile.city != "")
-        .group_by(VenueProfile.city)
-        .order_by(func.count(Gig.id).desc())
-        .all()
+
+    def compute() -> bytes:
+        lc = leaderboard_cities.c
+        rows = db.execute(
+            select(lc.city).order_by(lc.total_gigs.desc(), lc.city_key)
+        ).all()
+        return json.dumps([r[0] for r in rows]).encode()
+
+    entry = _cache.get_or_compute(("cities",), compute)
+    return _cached_json_response(request, entry)
+
+
+def _trending_rows(
+    db: Session,
+    entity_type: str,
+    city: Optional[str],
+    state: Optional[str],
+    limit: int,
+):
+    """Top-N by rank_key, walking ix_trending_scores_rank."""
+    if entity_type == "artist":
+        profile, name_col = ArtistProfile, ArtistProfile.name
+    else:
+        profile, name_col = VenueProfile, VenueProfile.venue_name
+    q = (
+        select(
+            TrendingScore.profile_id,
+            TrendingScore.rank_key,
+            name_col.label("name"),
+            profile.city,
+            profile.state,
+        )
+        .join(profile, profile.id == TrendingScore.profile_id)
+        .where(TrendingScore.entity_type == entity_type)
+    )
+    if city:
+        q = q.where(func.lower(func.btrim(profile.city)) == normalize_location_key(city))
+    if state:
+        q = q.where(func.lower(func.btrim(profile.state)) == normalize_location_key(state))
+    q = q.order_by(TrendingScore.rank_key.desc(), TrendingScore.profile_id).limit(limit)
+    return db.execute(q).all()
+
+
+@router.get("/trending", response_model=TrendingOut)
+def get_trending(
+    request: Request,
+    city: Optional[str] = Query(None),
+    state: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Venues and artists ranked by recent activity: verified gigs (weighted by
+    attendance), bookmarks and new mutual matches, each decaying with a
+    TRENDING_HALF_LIFE_HOURS half-life.
+
+    Scores are maintained on those write paths in trending_scores; reading
+    only decays each stored score to now.
+    """
+
+    def compute() -> bytes:
+        now = datetime.now(timezone.utc)
+
+        def entries(entity_type: str) -> list[TrendingEntry]:
+            return [
+                TrendingEntry(
+                    profile_id=row.profile_id,
+                    name=row.name,
+                    city=row.city,
+                    state=row.state,
+                    score=round(decayed_score(row.rank_key, now), 3),
+                )
+                for row in _trending_rows(db, entity_type, city, state, limit)
+            ]
+
+        return TrendingOut(
+            half_life_hours=settings.TRENDING_HALF_LIFE_HOURS,
+            city=city,
+            state=state,
+            venues=entries("venue"),
+            artists=entries("artist"),
+        ).model_dump_json().encode()
+
+    entry = _cache.get_or_compute(("trending", city, state, limit), compute)
+    return _cached_json_response(request, entry)
+
+
+@router.get("/rank/{profile_id}", response_model=RankOut)
+def get_profile_rank(
+    profile_id: str,
+    metric: LeaderboardMetric = Query("total_gigs"),
+    window: LeaderboardWindow = Query("all"),
+    city: Optional[str] = Query(None),
+    state: Optional[str] = Query(None),
+    neighbors: int = Query(2, ge=0, le=10),
+    db: Session = Depends(get_db),
+):
+    """
+    Where a profile stands on the leaderboard, plus the entries around it.
+
+    Rank is the profile's position in the same (metric DESC, profile_id)
+    order the leaderboard lists, counted over the scope's rollup index rather
+    than by ranking gigs. Profiles with no value for the metric are unranked.
+    """
+    lb = leaderboard_rollup.c
+    me = db.execute(
+        select(leaderboard_rollup).where(
+            lb.profile_id == profile_id,
+            lb.time_window == window,
+        )
+    ).first()
+    if me is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile has no gigs in this window",
+        )
+
+    metric_col = _METRIC_COLUMNS[metric]
+    my_value = me._mapping[metric_col]
+    if my_value is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile has no value for this metric",
+        )
+
+    if city and me.city_key != normalize_location_key(city):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile is not in this city",
+        )
+    if state and me.state_key != normalize_location_key(state):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile is not in this state",
+        )
+
+    scope = _scope_filters(me.entity_type, window, city, state)
+    scope.append(metric_col.isnot(None))
+
+    ahead = or_(
+        metric_col > my_value,
+        and_(metric_col == my_value, lb.profile_id < profile_id),
+    )
+    behind = or_(
+        metric_col < my_value,
+        and_(metric_col == my_value, lb.profile_id > profile_id),
+    )
+
+    ahead_count = db.execute(select(func.count()).where(*scope, ahead)).scalar_one()
+    total = db.execute(select(func.count()).where(*scope)).scalar_one()
+    rank = ahead_count + 1
+
+    # Both walk the (metric DESC NULLS LAST, profile_id) index, "above"
+    # backwards, so their NULLS placement must match it
+    above = db.execute(
+        select(leaderboard_rollup)
+        .where(*scope, ahead)
+        .order_by(metric_col.asc().nulls_first(), lb.profile_id.desc())
+        .limit(neighbors)
+    ).all()
+    below = db.execute(
+        select(leaderboard_rollup)
+        .where(*scope, behind)
+        .order_by(metric_col.desc().nulls_last(), lb.profile_id)
+        .limit(neighbors)
+    ).all()
+
+    def entry(row, row_rank: int) -> RankEntry:
+        value = row._mapping[metric_col]
+        return RankEntry(
+            rank=row_rank,
+            profile_id=row.profile_id,
+            name=row.name,
+            city=row.city,
+            state=row.state,
+            value=float(value) if value is not None else None,
+        )
+
+    window_rows = [entry(r, rank - i - 1) for i, r in enumerate(above)][::-1]
+    window_rows.append(entry(me, rank))
+    window_rows.extend(entry(r, rank + i + 1) for i, r in enumerate(below))
+
+    return RankOut(
+        profile_id=profile_id,
+        entity_type=me.entity_type,
+        window=window,
+        metric=metric,
+        city=city,
+        state=state,
+        rank=rank,
+        total_ranked=total,
+        percentile=round(100.0 * (total - rank + 1) / total, 1),
+        value=float(my_value),
+        neighbors=window_rows,
     )
-    return [r[0] for r in rows]
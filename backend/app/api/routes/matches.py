@@ -10,6 +10,7 @@ from app.models.user import UserRole
 from app.models.venue import VenueProfile
 from app.schemas.match import MatchCreateIn, MatchOut
 from app.services.relationship_log import log_relationship_action
+from app.services.trending import MATCH_WEIGHT, record_trending
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
@@ -23,6 +24,20 @@ def has_reciprocal(db: Session, from_user_id: str, to_user_id: str) -> bool:
     return reciprocal is not None
 
 
+def record_match_trending(db: Session, user, target_type: str, target_id: str) -> None:
+    """Credit both sides of a newly mutual match on the trending board."""
+    bumps = [(target_type, target_id, MATCH_WEIGHT)]
+    if user.role == UserRole.artist:
+        own = db.query(ArtistProfile.id).filter(ArtistProfile.user_id == user.id).first()
+        if own:
+            bumps.append(("artist", own[0], MATCH_WEIGHT))
+    elif user.role == UserRole.venue:
+        own = db.query(VenueProfile.id).filter(VenueProfile.user_id == user.id).first()
+        if own:
+            bumps.append(("venue", own[0], MATCH_WEIGHT))
+    record_trending(db, bumps)
+
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_match(
     payload: MatchCreateIn,
@@ -79,8 +94,11 @@ def create_match(
             "target_role": target_role,
         },
     )
+    matched = has_reciprocal(db, user.id, target_user_id)
+    if matched:
+        record_match_trending(db, user, target_role, profile.id)
     db.commit()
-    return {"ok": True, "id": match.id, "matched": has_reciprocal(db, user.id, target_user_id)}
+    return {"ok": True, "id": match.id, "matched": matched}
 
 
 @router.post("/accept", status_code=status.HTTP_201_CREATED)
@@ -145,6 +163,7 @@ def accept_match(
             "target_role": target_role,
         },
     )
+    record_match_trending(db, user, target_role, profile.id)
     db.commit()
     return {"ok": True, "id": match.id, "matched": True}
 
@@ -10,6 +10,7 @@ from app.core.zipcode import lookup_zipcode
 from app.models.artist import ArtistProfile
 from app.models.genre import Genre
 from app.models.gig import Gig, GigStatus
+from app.models.spotify_connection import SpotifyConnection
 from app.models.venue import VenueProfile
 
 router = APIRouter(prefix="/search", tags=["search"])
@@ -59,9 +60,11 @@ async def search_artists(
     min_draw: int | None = None,
     max_rate: int | None = None,
     min_verified_gigs: int | None = None,
+    min_followers: int | None = Query(default=None, ge=0),
+    min_popularity: int | None = Query(default=None, ge=0, le=100),
     distance_miles: int | None = None,
     zip_code: str | None = None,
-    sort: str = "distance",  # distance|draw|rate|verified_draw
+    sort: str = "distance",  # distance|draw|rate|verified_draw|spotify_popularity
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
 ):
@@ -87,7 +90,11 @@ async def search_artists(
         ArtistProfile,
         verified_stats.c.verified_gig_count,
         verified_stats.c.verified_avg_attendance,
-    ).outerjoin(verified_stats, ArtistProfile.id == verified_stats.c.artist_id)
+        SpotifyConnection.followers,
+        SpotifyConnection.popularity,
+    ).outerjoin(verified_stats, ArtistProfile.id == verified_stats.c.artist_id).outerjoin(
+        SpotifyConnection, SpotifyConnection.artist_profile_id == ArtistProfile.id
+    )
 
     db_query = _apply_fuzzy_filter(
         db_query,
@@ -110,6 +117,12 @@ async def search_artists(
     if min_verified_gigs is not None:
         db_query = db_query.filter(verified_stats.c.verified_gig_count >= min_verified_gigs)
 
+    if min_followers is not None:
+        db_query = db_query.filter(SpotifyConnection.followers >= min_followers)
+
+    if min_popularity is not None:
+        db_query = db_query.filter(SpotifyConnection.popularity >= min_popularity)
+
     # Lookup searcher's coordinates from zip code
     search_coords = None
     if distance_miles is not None and zip_code:
@@ -126,6 +139,11 @@ async def search_artists(
         db_query = db_query.order_by(ArtistProfile.min_rate.asc())
     elif sort == "verified_draw":
         db_query = db_query.order_by(verified_stats.c.verified_avg_attendance.desc().nullslast())
+    elif sort == "spotify_popularity":
+        db_query = db_query.order_by(
+            SpotifyConnection.popularity.desc().nullslast(),
+            SpotifyConnection.followers.desc().nullslast(),
+        )
 
     # Fetch more than needed to allow for distance filtering
     fetch_limit = page_size * 5 if search_coords else page_size
@@ -134,7 +152,7 @@ async def search_artists(
 
     items = []
     for row in candidates:
-        a, v_gig_count, v_avg_attendance = row
+        a, v_gig_count, v_avg_attendance, spotify_followers, spotify_popularity = row
         dist = None
 
         # Calculate distance if we have search coordinates
@@ -167,6 +185,8 @@ async def search_artists(
                 if v_avg_attendance is not None
                 else None
             ),
+            "spotify_followers": spotify_followers,
+            "spotify_popularity": spotify_popularity,
         })
 
     # Sort by distance if requested
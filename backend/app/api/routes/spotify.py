@@ -1,8 +1,10 @@
+import asyncio
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -18,13 +20,17 @@ from app.schemas.spotify import (
     SpotifyConnectionOut,
     SpotifyPublicData,
     SpotifySetArtistId,
+    SpotifyTrendOut,
 )
 from app.services.spotify import (
     exchange_code_for_tokens,
     fetch_and_cache_spotify_data,
     get_authorize_url,
-    get_spotify_data_if_fresh,
+    is_stale,
+    request_refresh,
+    spotify_get,
 )
+from app.services.spotify_metrics import metric_growth, metric_points
 
 router = APIRouter(prefix="/spotify", tags=["spotify"])
 
@@ -77,8 +83,52 @@ def spotify_authorize(
     return SpotifyAuthURL(url=url)
 
 
+def _artist_profile_id(db: Session, user_id: str) -> str:
+    prof_id = db.query(ArtistProfile.id).filter(ArtistProfile.user_id == user_id).scalar()
+    if not prof_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Artist profile not found",
+        )
+    return prof_id
+
+
+def _save_connection(db: Session, prof_id: str, spotify_user_id: str, token_data: dict) -> None:
+    """Create or update the profile's connection with freshly issued tokens."""
+    access_token = token_data["access_token"]
+    refresh_token = token_data["refresh_token"]
+    expires_in = token_data["expires_in"]
+    token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+
+    conn = (
+        db.query(SpotifyConnection)
+        .filter(SpotifyConnection.artist_profile_id == prof_id)
+        .first()
+    )
+    if conn:
+        conn.spotify_user_id = spotify_user_id
+        conn.access_token = encrypt_token(access_token)
+        conn.refresh_token = encrypt_token(refresh_token)
+        conn.token_expires_at = token_expires_at
+        conn.refresh_due_at = datetime.now(timezone.utc)
+    else:
+        conn = SpotifyConnection(
+            id=str(uuid.uuid4()),
+            artist_profile_id=prof_id,
+            spotify_user_id=spotify_user_id,
+            access_token=encrypt_token(access_token),
+            refresh_token=encrypt_token(refresh_token),
+            token_expires_at=token_expires_at,
+            # First fetch on the refresher's next tick
+            refresh_due_at=datetime.now(timezone.utc),
+        )
+        db.add(conn)
+
+    db.commit()
+
+
 @router.post("/callback")
-def spotify_callback(
+async def spotify_callback(
     body: SpotifyCallbackIn,
     db: Session = Depends(get_db),
 ):
@@ -100,72 +150,40 @@ def spotify_callback(
             detail="Invalid or expired state parameter",
         )
 
-    prof = (
-        db.query(ArtistProfile)
-        .filter(ArtistProfile.user_id == user_id)
-        .first()
-    )
-    if not prof:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Artist profile not found",
-        )
+    # The handler awaits Spotify, but the session is synchronous: its steps
+    # run in the threadpool, off the event loop
+    prof_id = await run_in_threadpool(_artist_profile_id, db, user_id)
 
     # Exchange code for tokens
     try:
-        token_data = exchange_code_for_tokens(body.code)
+        token_data = await exchange_code_for_tokens(body.code)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to exchange Spotify authorization code",
         )
 
-    access_token = token_data["access_token"]
-    refresh_token = token_data["refresh_token"]
-    expires_in = token_data["expires_in"]
-    token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-
     # Fetch Spotify user profile
     try:
-        me_resp = httpx.get(
-            "https://api.spotify.com/v1/me",
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=10.0,
-        )
-        me_resp.raise_for_status()
-        me = me_resp.json()
+        me = await spotify_get(token_data["access_token"], "/me")
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to fetch Spotify user profile",
         )
 
-    spotify_user_id = me["id"]
+    await run_in_threadpool(_save_connection, db, prof_id, me["id"], token_data)
+    return {"ok": True}
 
-    # Upsert SpotifyConnection
-    conn = (
-        db.query(SpotifyConnection)
-        .filter(SpotifyConnection.artist_profile_id == prof.id)
-        .first()
-    )
-    if conn:
-        conn.spotify_user_id = spotify_user_id
-        conn.access_token = encrypt_token(access_token)
-        conn.refresh_token = encrypt_token(refresh_token)
-        conn.token_expires_at = token_expires_at
-    else:
-        conn = SpotifyConnection(
-            id=str(uuid.uuid4()),
-            artist_profile_id=prof.id,
-            spotify_user_id=spotify_user_id,
-            access_token=encrypt_token(access_token),
-            refresh_token=encrypt_token(refresh_token),
-            token_expires_at=token_expires_at,
-        )
-        db.add(conn)
 
-    db.commit()
-    return {"ok": True}
+async def _fetch_or_502(fetch) -> dict:
+    try:
+        return await fetch
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Spotify is unavailable, try again later",
+        )
 
 
 @router.get("/connection", response_model=SpotifyConnectionOut)
@@ -189,21 +207,21 @@ def get_my_spotify_connection(
     if not conn:
         return SpotifyConnectionOut(connected=False)
 
-    data = get_spotify_data_if_fresh(db, conn)
+    # Serve what is cached right away; a stale copy is refreshed in the
+    # background instead of making this request wait on Spotify.
+    stale = is_stale(conn)
+    if stale:
+        request_refresh(db, conn)
     return SpotifyConnectionOut(
         connected=True,
         spotify_artist_id=conn.spotify_artist_id,
-        spotify_data=data,
+        spotify_data=conn.spotify_data or {},
         data_fetched_at=conn.data_fetched_at,
+        stale=stale,
     )
 
 
-@router.post("/artist-id", response_model=SpotifyConnectionOut)
-def set_spotify_artist_id(
-    payload: SpotifySetArtistId,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-):
+def _set_artist_id(db: Session, user: User, spotify_artist_id: str) -> SpotifyConnection:
     prof = _get_artist_profile(db, user)
     conn = (
         db.query(SpotifyConnection)
@@ -216,10 +234,21 @@ def set_spotify_artist_id(
             detail="Spotify not connected",
         )
 
-    conn.spotify_artist_id = payload.spotify_artist_id
+    conn.spotify_artist_id = spotify_artist_id
     db.commit()
+    # Loaded here, not lazily on the event loop
+    db.refresh(conn)
+    return conn
+
 
-    data = fetch_and_cache_spotify_data(db, conn)
+@router.post("/artist-id", response_model=SpotifyConnectionOut)
+async def set_spotify_artist_id(
+    payload: SpotifySetArtistId,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    conn = await run_in_threadpool(_set_artist_id, db, user, payload.spotify_artist_id)
+    data = await _fetch_or_502(fetch_and_cache_spotify_data(db, conn))
     return SpotifyConnectionOut(
         connected=True,
         spotify_artist_id=conn.spotify_artist_id,
@@ -299,3 +328,26 @@ def get_artist_spotify_public(
         recent_releases=recent_releases,
         artist_url=data.get("artist_url"),
     )
+
+
+@router.get("/public/{artist_profile_id}/trend", response_model=SpotifyTrendOut)
+def get_artist_spotify_trend(
+    artist_profile_id: str,
+    days: int = Query(default=90, ge=1, le=730),
+    db: Session = Depends(get_db),
+):
+    since = date.today() - timedelta(days=days)
+    return SpotifyTrendOut(
+        artist_profile_id=artist_profile_id,
+        days=days,
+        points=[
+            {
+                "day": p.day,
+                "followers": p.followers,
+                "popularity": p.popularity,
+                "monthly_listeners": p.monthly_listeners,
+            }
+            for p in metric_points(db, artist_profile_id, since)
+        ],
+        **metric_growth(db, artist_profile_id, since),
+    )
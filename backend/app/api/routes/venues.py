@@ -1,16 +1,76 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date as dt_date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.api.routes._pagination import decode_date_cursor, encode_date_cursor
 from app.api.routes._profile_utils import upsert_genres
+from app.core.response_cache import conditional_response
+from app.models.event import Event
 from app.models.user import UserRole
 from app.models.venue import VenueProfile
 from app.schemas.event import EventOut
 from app.schemas.venue import VenueProfileIn, VenueProfileOut
+from app.services.artist_stats import bump_venue_artists_revisions
+from app.services.calendar_export import (
+    FEED_CACHE_TTL_SECONDS,
+    FEED_MEDIA_TYPES,
+    feed_cache,
+    render_events,
+)
+from app.services.event_occurrences import occurrence_page
 
 router = APIRouter(prefix="/venue-profile", tags=["venue-profile"])
 
+# Upcoming events embedded in a venue profile response
+PROFILE_EVENTS_LIMIT = 5
+
+
+def _occurrences_out(db: Session, page: list[tuple[dt_date, str]]) -> list[EventOut]:
+    events = {e.id: e for e in db.query(Event).filter(Event.id.in_({i for _, i in page}))}
+    return [
+        EventOut(
+            id=event_id,
+            title=events[event_id].title,
+            description=events[event_id].description,
+            date=occurrence_date,
+            rrule=events[event_id].rrule,
+        )
+        for occurrence_date, event_id in page
+    ]
+
+
+def _venue_out(db: Session, prof: VenueProfile) -> VenueProfileOut:
+    # One bounded read on (venue_profile_id, date) instead of loading every
+    # event the venue ever had
+    upcoming = occurrence_page(
+        db,
+        [Event.venue_profile_id == prof.id],
+        dt_date.today(),
+        None,
+        None,
+        PROFILE_EVENTS_LIMIT,
+    )
+    return VenueProfileOut(
+        id=prof.id,
+        venue_name=prof.venue_name,
+        description=prof.description,
+        address=prof.address,
+        city=prof.city,
+        state=prof.state,
+        country=prof.country,
+        zip_code=prof.zip_code,
+        capacity=prof.capacity,
+        max_budget=prof.max_budget,
+        amenities=prof.amenities,
+        genres=[g.name for g in prof.genres],
+        events=_occurrences_out(db, upcoming[:PROFILE_EVENTS_LIMIT]),
+        has_more_events=len(upcoming) > PROFILE_EVENTS_LIMIT,
+    )
+
 
 @router.post("", response_model=VenueProfileOut)
 def create_or_update_venue_profile(
@@ -25,6 +85,9 @@ def create_or_update_venue_profile(
     if not prof:
         prof = VenueProfile(id=str(uuid.uuid4()), user_id=user.id, venue_name=payload.venue_name)
         db.add(prof)
+    elif payload.venue_name != prof.venue_name:
+        # Artist stats list gigs by venue name; change their ETags
+        bump_venue_artists_revisions(db, prof.id)
 
     prof.venue_name = payload.venue_name
     prof.description = payload.description
@@ -37,6 +100,9 @@ def create_or_update_venue_profile(
     prof.max_budget = payload.max_budget
     prof.amenities = payload.amenities
 
+    if payload.zip_code != prof.zip_code:
+        # Stale until the venue_geocode job resolves the new zip code
+        prof.latitude = prof.longitude = None
     prof.zip_code = payload.zip_code
 
     prof.genres = upsert_genres(db, payload.genre_names)
@@ -44,21 +110,7 @@ def create_or_update_venue_profile(
     db.commit()
     db.refresh(prof)
 
-    return VenueProfileOut(
-        id=prof.id,
-        venue_name=prof.venue_name,
-        description=prof.description,
-        address=prof.address,
-        city=prof.city,
-        state=prof.state,
-        country=prof.country,
-        zip_code=prof.zip_code,
-        capacity=prof.capacity,
-        max_budget=prof.max_budget,
-        amenities=prof.amenities,
-        genres=[g.name for g in prof.genres],
-        events=[EventOut(id=e.id, title=e.title, description=e.description, date=e.date) for e in prof.events],
-    )
+    return _venue_out(db, prof)
 
 
 @router.get("/me", response_model=VenueProfileOut)
@@ -67,21 +119,7 @@ def get_my_venue_profile(db: Session = Depends(get_db), user=Depends(get_current
     if not prof:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Venue profile not found")
 
-    return VenueProfileOut(
-        id=prof.id,
-        venue_name=prof.venue_name,
-        description=prof.description,
-        address=prof.address,
-        city=prof.city,
-        state=prof.state,
-        country=prof.country,
-        zip_code=prof.zip_code,
-        capacity=prof.capacity,
-        max_budget=prof.max_budget,
-        amenities=prof.amenities,
-        genres=[g.name for g in prof.genres],
-        events=[EventOut(id=e.id, title=e.title, description=e.description, date=e.date) for e in prof.events],
-    )
+    return _venue_out(db, prof)
 
 
 @router.get("/{venue_id}", response_model=VenueProfileOut)
@@ -89,13 +127,50 @@ def get_venue_by_id(venue_id: str, db: Session = Depends(get_db)):
     prof = db.get(VenueProfile, venue_id)
     if not prof:
         raise HTTPException(status_code=404, detail="Venue profile not found")
-    return VenueProfileOut(
-        id=prof.id, venue_name=prof.venue_name, description=prof.description,
-        address=prof.address, city=prof.city, state=prof.state, country=prof.country,
-        zip_code=prof.zip_code,
-        capacity=prof.capacity,
-        max_budget=prof.max_budget,
-        amenities=prof.amenities,
-        genres=[g.name for g in prof.genres],
-        events=[EventOut(id=e.id, title=e.title, description=e.description, date=e.date) for e in prof.events],
+    return _venue_out(db, prof)
+
+
+@router.get("/{venue_id}/events", response_model=list[EventOut])
+def list_venue_events(
+    venue_id: str,
+    response: Response,
+    include_past: bool = False,
+    from_date: dt_date | None = Query(None, alias="from"),
+    cursor: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """
+    The venue's events soonest-first, keyset-paginated on (date, id) like
+    GET /events, recurring events once per occurrence; the next page's
+    cursor is in the X-Next-Cursor header.
+    """
+    if not db.query(VenueProfile.id).filter(VenueProfile.id == venue_id).first():
+        raise HTTPException(status_code=404, detail="Venue profile not found")
+
+    start = from_date or (None if include_past else dt_date.today())
+    after = decode_date_cursor(cursor) if cursor else None
+    page = occurrence_page(db, [Event.venue_profile_id == venue_id], start, None, after, limit)
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_date_cursor(*page[-1])
+    return _occurrences_out(db, page)
+
+
+@router.get("/{venue_id}/calendar.{fmt}")
+def get_venue_calendar_feed(
+    venue_id: str,
+    fmt: Literal["ics", "json"],
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    The venue's events as a subscribable .ics calendar or JSON, cached per
+    venue and answered with a 304 while unchanged.
+    """
+    if not db.query(VenueProfile.id).filter(VenueProfile.id == venue_id).first():
+        raise HTTPException(status_code=404, detail="Venue profile not found")
+    entry = feed_cache.get_or_compute(
+        ("venue", venue_id, fmt), lambda: render_events(db, fmt, venue_id)
     )
+    return conditional_response(request, entry, FEED_MEDIA_TYPES[fmt], FEED_CACHE_TTL_SECONDS)
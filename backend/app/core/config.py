@@ -17,5 +17,35 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     SPOTIFY_TOKEN_ENCRYPTION_KEY: str | None = None
 
+    SCHEDULER_ENABLED: bool = True
+    GIG_CLOSEOUT_INTERVAL_SECONDS: int = 3600
+    JOB_RUN_RETENTION_DAYS: int = 14
+    JOB_RUN_PRUNE_INTERVAL_SECONDS: int = 86400
+    LEADERBOARD_REFRESH_INTERVAL_SECONDS: int = 300
+    TRENDING_HALF_LIFE_HOURS: float = 72.0
+    TRENDING_PRUNE_INTERVAL_SECONDS: int = 86400
+    EVENT_IMPORT_WORKERS: int = 2
+    # Background imports queued or running per API worker, and per venue
+    EVENT_IMPORT_QUEUE_SIZE: int = 8
+    EVENT_IMPORT_MAX_UNFINISHED_PER_VENUE: int = 2
+    # Unfinished imports with no progress for this long are failed
+    EVENT_IMPORT_STALE_SECONDS: int = 1800
+    EVENT_IMPORT_REAP_INTERVAL_SECONDS: int = 300
+    CALENDAR_SYNC_INTERVAL_SECONDS: int = 60
+    CALENDAR_FEED_REFRESH_SECONDS: int = 900
+    CALENDAR_FEED_MAX_BACKOFF_SECONDS: int = 86400
+    CALENDAR_SYNC_PER_HOST_LIMIT: int = 2
+    CALENDAR_FEEDS_ALLOW_PRIVATE_HOSTS: bool = False
+    EVENT_OCCURRENCE_CACHE_DAYS: int = 90
+    EVENT_OCCURRENCE_REFRESH_INTERVAL_SECONDS: int = 3600
+    VENUE_GEOCODE_INTERVAL_SECONDS: int = 60
+    SPOTIFY_REFRESH_INTERVAL_SECONDS: int = 30
+    # Global Spotify API budget of the background refresher
+    SPOTIFY_REFRESH_CALLS_PER_MINUTE: int = 120
+    SPOTIFY_TOKEN_REFRESH_INTERVAL_SECONDS: int = 60
+    SPOTIFY_METRICS_DOWNSAMPLE_INTERVAL_SECONDS: int = 86400
+    # Per-process budget for all Spotify Web API calls
+    SPOTIFY_API_CALLS_PER_MINUTE: int = 600
+
 
 settings = Settings()
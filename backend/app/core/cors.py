@@ -7,4 +7,5 @@ def add_cors(app, origins: list[str]) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
     )
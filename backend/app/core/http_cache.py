@@ -0,0 +1,57 @@
+"""Helpers for conditional GET handling (ETag / If-None-Match, If-Modified-Since)."""
+
+import hashlib
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the values that determine a response body."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def if_match_failed(request: Request, etag: str) -> bool:
+    """True if the request carries an If-Match header that ``etag`` does not satisfy."""
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return False
+    return etag not in {tag.strip() for tag in header.split(",")}
+
+
+def http_date(timestamp: float) -> str:
+    """Format a Unix timestamp as an HTTP date (for Last-Modified)."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def not_modified_since(request: Request, last_modified: float) -> bool:
+    """
+    True if If-Modified-Since is at or after ``last_modified``.
+
+    Ignored when the request also sends If-None-Match, which takes precedence.
+    """
+    if request.headers.get("if-none-match"):
+        return False
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return int(last_modified) <= since.timestamp()
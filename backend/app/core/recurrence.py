@@ -0,0 +1,163 @@
+"""iCalendar RRULE handling for recurring (all-day) events."""
+
+import re
+from datetime import date, datetime, time
+from typing import Iterator
+
+from dateutil.rrule import rrule, rrulestr
+
+MAX_RRULE_LENGTH = 500
+# Events are all-day, so rules that repeat within a day make no sense
+SUPPORTED_FREQS = {"DAILY", "WEEKLY", "MONTHLY", "YEARLY"}
+# BYSETPOS, BYYEARDAY, BYWEEKNO and the sub-day parts can describe rules that
+# never occur, which dateutil only finds out by scanning to year 9999
+SUPPORTED_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "WKST", "BYDAY", "BYMONTH", "BYMONTHDAY"}
+MAX_RRULE_COUNT = 1000
+# UNTIL is capped this far past the series start, so expanding or measuring a
+# bounded series is at most a few thousand steps
+MAX_SERIES_YEARS = 5
+
+# Longest each month can be (February in a leap year)
+_MONTH_DAYS = {1: 31, 2: 29, 3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31}
+_BYDAY = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class InvalidRecurrenceError(ValueError):
+    """A recurrence rule that cannot be parsed or is not supported."""
+
+
+def normalize_rrule(value: str) -> str:
+    """Canonical stored form: upper-case, no ``RRULE:`` prefix."""
+    value = value.strip()
+    if value.upper().startswith("RRULE:"):
+        value = value[len("RRULE:"):]
+    return value.upper()
+
+
+def _horizon(dtstart: date) -> datetime:
+    year = dtstart.year + MAX_SERIES_YEARS
+    if year > date.max.year:
+        return datetime.combine(date.max, time())
+    try:
+        end = dtstart.replace(year=year)
+    except ValueError:
+        # February 29th
+        end = dtstart.replace(year=year, day=28)
+    return datetime.combine(end, time())
+
+
+def _ints(value: str) -> list[int]:
+    try:
+        return [int(v) for v in value.split(",")]
+    except ValueError:
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+
+
+def _int(value: str) -> int:
+    ints = _ints(value)
+    if len(ints) != 1:
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+    return ints[0]
+
+
+def _check_parts(parts: dict[str, str]) -> None:
+    """Reject the BY-part combinations that can never produce a date."""
+    unsupported = set(parts) - SUPPORTED_PARTS
+    if unsupported:
+        raise InvalidRecurrenceError(f"Recurrence {sorted(unsupported)[0]} is not supported")
+
+    # INTERVAL=0 repeats dtstart forever, so no end date is ever passed
+    if "INTERVAL" in parts and _int(parts["INTERVAL"]) < 1:
+        raise InvalidRecurrenceError("Recurrence INTERVAL must be at least 1")
+    if "COUNT" in parts and not 0 < _int(parts["COUNT"]) <= MAX_RRULE_COUNT:
+        raise InvalidRecurrenceError(f"Recurrence COUNT must be between 1 and {MAX_RRULE_COUNT}")
+
+    months = _ints(parts["BYMONTH"]) if "BYMONTH" in parts else list(_MONTH_DAYS)
+    if any(m not in _MONTH_DAYS for m in months):
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+    if "BYMONTHDAY" in parts:
+        longest = max(_MONTH_DAYS[m] for m in months)
+        if not any(0 < abs(d) <= longest for d in _ints(parts["BYMONTHDAY"])):
+            raise InvalidRecurrenceError("Recurrence rule has no occurrences")
+
+    if "BYDAY" in parts:
+        # An ordinal (2MO, -1FR) counts within the month, or within the year
+        # for YEARLY rules without BYMONTH
+        in_year = parts["FREQ"] == "YEARLY" and "BYMONTH" not in parts
+        for day in parts["BYDAY"].split(","):
+            match = _BYDAY.match(day)
+            if not match:
+                raise InvalidRecurrenceError("Invalid recurrence rule")
+            if match.group(1) is None:
+                continue
+            if parts["FREQ"] not in ("MONTHLY", "YEARLY") or "BYMONTHDAY" in parts:
+                raise InvalidRecurrenceError(
+                    "Numbered weekdays need a MONTHLY or YEARLY rule without BYMONTHDAY"
+                )
+            if not 0 < abs(int(match.group(1))) <= (53 if in_year else 5):
+                raise InvalidRecurrenceError("Recurrence rule has no occurrences")
+
+
+def build_rule(value: str, dtstart: date) -> rrule:
+    """
+    Parse a normalized RRULE anchored at ``dtstart``. UNTIL is capped at
+    MAX_SERIES_YEARS after ``dtstart`` and COUNT at MAX_RRULE_COUNT, and the
+    rule must occur within MAX_SERIES_YEARS.
+    """
+    if not value or len(value) > MAX_RRULE_LENGTH or "\n" in value or "\r" in value:
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+    try:
+        parts = dict(p.split("=", 1) for p in value.split(";"))
+    except ValueError:
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+    if parts.get("FREQ") not in SUPPORTED_FREQS:
+        raise InvalidRecurrenceError(
+            "Recurrence must be DAILY, WEEKLY, MONTHLY or YEARLY"
+        )
+    _check_parts(parts)
+    start = datetime.combine(dtstart, time())
+    horizon = _horizon(dtstart)
+    try:
+        # ignoretz: UNTIL is usually given in UTC while dtstart is a plain date
+        rule = rrulestr(value, dtstart=start, ignoretz=True)
+        if "UNTIL" in parts and rule._until > horizon:
+            rule = rule.replace(until=horizon)
+    except (ValueError, TypeError):
+        raise InvalidRecurrenceError("Invalid recurrence rule")
+    # _check_parts ruled out rules that never occur, so this search ends at
+    # the first occurrence
+    first = rule.after(start, inc=True)
+    if first is None or first > horizon:
+        raise InvalidRecurrenceError("Recurrence rule has no occurrences")
+    return rule
+
+
+def occurrence_dates(
+    value: str,
+    dtstart: date,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[date]:
+    """
+    Lazily yield the distinct occurrence dates of a series within
+    [start, end]; open-ended rules with no ``end`` never stop on their own.
+    """
+    rule = build_rule(value, dtstart)
+    occurrences = rule.xafter(datetime.combine(start, time()), inc=True) if start else iter(rule)
+    last = None
+    for dt in occurrences:
+        d = dt.date()
+        if end and d > end:
+            return
+        if d != last:
+            last = d
+            yield d
+
+
+def series_until(value: str, dtstart: date) -> date | None:
+    """The series' last occurrence, or None if it repeats forever."""
+    parts = dict(p.split("=", 1) for p in value.split(";"))
+    if "COUNT" not in parts and "UNTIL" not in parts:
+        return None
+    # Bounded by the COUNT and UNTIL caps in build_rule
+    return build_rule(value, dtstart)[-1].date()
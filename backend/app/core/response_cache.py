@@ -0,0 +1,113 @@
+"""In-memory TTL cache for public responses with per-key request coalescing."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from fastapi import Request, Response, status
+
+from app.core.http_cache import etag_matches, http_date, make_etag, not_modified_since
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+    # Unix time the body last changed; kept across recomputes that produce
+    # the same body
+    last_modified: float = 0.0
+
+
+class ResponseCache:
+    """
+    Cache of serialized response bodies keyed by request parameters.
+
+    Endpoints run in FastAPI's threadpool, so a per-key lock makes concurrent
+    misses on the same key wait for the first caller's result instead of
+    each running the underlying query ("single flight").
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, CachedResponse] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Hashable) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry and entry.expires_at > time.monotonic():
+            return entry
+        return None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], bytes]) -> CachedResponse:
+        entry = self._fresh(key)
+        if entry:
+            return entry
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have filled the entry while we waited
+            entry = self._fresh(key)
+            if entry:
+                return entry
+
+            body = compute()
+            etag = make_etag(body)
+            previous = self._entries.get(key)
+            entry = CachedResponse(
+                body=body,
+                etag=etag,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                last_modified=(
+                    previous.last_modified
+                    if previous and previous.etag == etag
+                    else time.time()
+                ),
+            )
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._evict_expired()
+                self._entries[key] = entry
+            return entry
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for k in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._entries.pop(k, None)
+            self._key_locks.pop(k, None)
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop ``keys`` so the next request recomputes them (e.g. after a write)."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+
+def conditional_response(
+    request: Request,
+    entry: CachedResponse,
+    media_type: str,
+    max_age: int,
+) -> Response:
+    """Serve a cached body, or a 304 if the client's ETag / date is current."""
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": http_date(entry.last_modified),
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if etag_matches(request, entry.etag) or not_modified_since(request, entry.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
@@ -16,17 +16,26 @@ class ZipCodeResult:
     state: str
 
 
-# In-memory cache: zip_code -> (result, timestamp)
+class ZipCodeLookupError(Exception):
+    """The lookup service could not be reached or gave no usable answer."""
+
+
+# In-memory cache: zip_code -> (result, timestamp). Only definitive answers
+# are cached here; None means the zip code does not exist.
 _cache: dict[str, tuple[ZipCodeResult | None, float]] = {}
 CACHE_TTL_SECONDS = 86400  # 24 hours
 
+# Zip codes whose lookup recently failed: zip_code -> timestamp
+_failures: dict[str, float] = {}
+FAILURE_TTL_SECONDS = 60
 
-async def lookup_zipcode(zip_code: str) -> ZipCodeResult | None:
+
+async def fetch_zipcode(zip_code: str) -> ZipCodeResult | None:
     """
     Lookup coordinates and location info for a US zip code.
 
-    Uses Zippopotam.us API with in-memory caching.
-    Returns None if zip code is invalid or API fails.
+    Returns None if the zip code is invalid or unknown, and raises
+    ZipCodeLookupError if the API fails, so callers can retry later.
     """
     if not zip_code:
         return None
@@ -47,9 +56,10 @@ async def lookup_zipcode(zip_code: str) -> ZipCodeResult | None:
     try:
         async with httpx.AsyncClient(timeout=5.0) as client:
             resp = await client.get(f"https://api.zippopotam.us/us/{zip_code}")
-            if resp.status_code != 200:
+            if resp.status_code == 404:
                 _cache[zip_code] = (None, now)
                 return None
+            resp.raise_for_status()
 
             data = resp.json()
             places = data.get("places", [])
@@ -64,10 +74,25 @@ async def lookup_zipcode(zip_code: str) -> ZipCodeResult | None:
                 city=place["place name"],
                 state=place["state abbreviation"],
             )
-            _cache[zip_code] = (result, now)
-            return result
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        raise ZipCodeLookupError(f"Zip code lookup failed for {zip_code}") from e
+
+    _cache[zip_code] = (result, now)
+    return result
+
 
-    except Exception:
-        # On any error, cache as None to avoid repeated failures
-        _cache[zip_code] = (None, now)
+async def lookup_zipcode(zip_code: str) -> ZipCodeResult | None:
+    """
+    Like fetch_zipcode, but returns None if the API fails too.
+
+    A failed zip code is not looked up again for FAILURE_TTL_SECONDS, to
+    avoid repeated failures.
+    """
+    failed_at = _failures.get(zip_code)
+    if failed_at is not None and time.time() - failed_at < FAILURE_TTL_SECONDS:
+        return None
+    try:
+        return await fetch_zipcode(zip_code)
+    except ZipCodeLookupError:
+        _failures[zip_code] = time.time()
         return None
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -17,8 +19,91 @@ from app.api.routes.spotify import router as spotify_router
 from app.core.cors import add_cors
 from app.core.config import settings
 from app.api.routes.users import router as users_router
+from app.services.calendar_sync import sync_calendar_feeds
+from app.services.event_import import fail_orphaned_import_jobs, shutdown_import_executor
+from app.services.event_occurrences import materialize_occurrences
+from app.services.gig_lifecycle import close_out_past_gigs
+from app.services.leaderboard import refresh_leaderboards
+from app.services.scheduler import (
+    prune_job_runs,
+    register_job,
+    start_scheduler,
+    stop_scheduler,
+)
+from app.services.spotify import close_client as close_spotify_client
+from app.services.spotify import refresh_due_connections, refresh_expiring_tokens
+from app.services.spotify_metrics import downsample_metric_points
+from app.services.trending import prune_trending_scores
+from app.services.venue_geocoding import geocode_venues
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SCHEDULER_ENABLED:
+        register_job(
+            "gig_closeout",
+            settings.GIG_CLOSEOUT_INTERVAL_SECONDS,
+            close_out_past_gigs,
+        )
+        register_job(
+            "job_run_prune",
+            settings.JOB_RUN_PRUNE_INTERVAL_SECONDS,
+            prune_job_runs,
+        )
+        # Also runs at startup, failing jobs a previous process left behind
+        register_job(
+            "event_import_reap",
+            settings.EVENT_IMPORT_REAP_INTERVAL_SECONDS,
+            fail_orphaned_import_jobs,
+        )
+        register_job(
+            "leaderboard_refresh",
+            settings.LEADERBOARD_REFRESH_INTERVAL_SECONDS,
+            refresh_leaderboards,
+        )
+        register_job(
+            "trending_prune",
+            settings.TRENDING_PRUNE_INTERVAL_SECONDS,
+            prune_trending_scores,
+        )
+        register_job(
+            "calendar_feed_sync",
+            settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+            sync_calendar_feeds,
+        )
+        register_job(
+            "event_occurrence_refresh",
+            settings.EVENT_OCCURRENCE_REFRESH_INTERVAL_SECONDS,
+            materialize_occurrences,
+        )
+        register_job(
+            "venue_geocode",
+            settings.VENUE_GEOCODE_INTERVAL_SECONDS,
+            geocode_venues,
+        )
+        register_job(
+            "spotify_refresh",
+            settings.SPOTIFY_REFRESH_INTERVAL_SECONDS,
+            refresh_due_connections,
+        )
+        register_job(
+            "spotify_token_refresh",
+            settings.SPOTIFY_TOKEN_REFRESH_INTERVAL_SECONDS,
+            refresh_expiring_tokens,
+        )
+        register_job(
+            "spotify_metrics_downsample",
+            settings.SPOTIFY_METRICS_DOWNSAMPLE_INTERVAL_SECONDS,
+            downsample_metric_points,
+        )
+        start_scheduler()
+    yield
+    shutdown_import_executor()
+    await stop_scheduler()
+    await close_spotify_client()
+
 
-app = FastAPI(title="Band x Venue Matching API")
+app = FastAPI(title="Band x Venue Matching API", lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
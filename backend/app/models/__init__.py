@@ -8,3 +8,12 @@ from app.models.event import Event  # noqa: F401
 from app.models.gig import Gig  # noqa: F401
 from app.models.relationship_log import RelationshipLog  # noqa: F401
 from app.models.spotify_connection import SpotifyConnection  # noqa: F401
+from app.models.artist_stats import ArtistStats  # noqa: F401
+from app.models.job_run import JobRun  # noqa: F401
+from app.models.profile_monthly_stats import ProfileMonthlyStats  # noqa: F401
+from app.models.artist_venue_pair import ArtistVenuePair  # noqa: F401
+from app.models.trending_score import TrendingScore  # noqa: F401
+from app.models.event_import_job import EventImportJob  # noqa: F401
+from app.models.calendar_feed import CalendarFeed  # noqa: F401
+from app.models.event_occurrence import EventOccurrence  # noqa: F401
+from app.models.spotify_metric_point import SpotifyMetricPoint  # noqa: F401
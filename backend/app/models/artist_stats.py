@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ArtistStats(Base):
+    """Precomputed completed-gig stats per artist, refreshed on gig writes."""
+
+    __tablename__ = "artist_stats"
+
+    artist_profile_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("artist_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    total_gigs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    verified_gigs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Sums and counts (not averages) so averages stay exact across refreshes
+    attendance_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attendance_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tickets_sold_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tickets_sold_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    unique_venues_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Bumped on every refresh and when a venue in the gig history is renamed;
+    # used as the HTTP ETag for /gigs/stats
+    revision: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ArtistVenuePair(Base):
+    """
+    Non-cancelled gig count per artist and venue that have played together.
+
+    Maintained on gig writes alongside the monthly buckets; the leaderboard
+    rollup counts a profile's pairs for its unique artists or venues instead
+    of rescanning gigs.
+    """
+
+    __tablename__ = "artist_venue_pairs"
+    __table_args__ = (
+        Index("ix_artist_venue_pairs_venue_profile_id", "venue_profile_id"),
+    )
+
+    artist_profile_id: Mapped[str] = mapped_column(
+        String, ForeignKey("artist_profiles.id", ondelete="CASCADE"), primary_key=True
+    )
+    venue_profile_id: Mapped[str] = mapped_column(
+        String, ForeignKey("venue_profiles.id", ondelete="CASCADE"), primary_key=True
+    )
+    gig_count: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class CalendarFeed(Base):
+    """A remote .ics URL a venue subscribes to; its events are kept in sync."""
+
+    __tablename__ = "calendar_feeds"
+    __table_args__ = (
+        UniqueConstraint("venue_profile_id", "url", name="uq_calendar_feed_venue_url"),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    venue_profile_id: Mapped[str] = mapped_column(
+        String, ForeignKey("venue_profiles.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    url: Mapped[str] = mapped_column(String(2000), nullable=False)
+
+    # Validators from the last 200 response, sent back as If-None-Match /
+    # If-Modified-Since
+    etag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    next_sync_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True, nullable=False
+    )
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Consecutive failed syncs; drives the retry backoff
+    failure_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
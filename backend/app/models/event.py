@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from typing import Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -9,16 +10,37 @@ from app.db.base import Base
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset order of the public listing
+        Index("ix_events_date_id", "date", "id"),
+        # Keyset order of one venue's events (profile preview and its listing)
+        Index("ix_events_venue_date_id", "venue_profile_id", "date", "id"),
+        # Imports rely on this to skip events that already exist
+        UniqueConstraint("venue_profile_id", "title", "date", name="uq_events_venue_title_date"),
+        # Feed syncs diff a feed's events by VEVENT UID
+        UniqueConstraint("source_feed_id", "source_uid", name="uq_events_feed_uid"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     venue_profile_id: Mapped[str] = mapped_column(
-        String, ForeignKey("venue_profiles.id", ondelete="CASCADE"),
-        index=True, nullable=False,
+        String, ForeignKey("venue_profiles.id", ondelete="CASCADE"), nullable=False,
     )
 
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(String, default="", nullable=False)
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # Recurring series are stored once: ``date`` is the series start (DTSTART)
+    # and occurrences are expanded from ``rrule`` per query window.
+    # ``series_until`` is the last occurrence, None if the series never ends.
+    rrule: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    series_until: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+
+    # Set for events synced from a subscribed calendar feed
+    source_feed_id: Mapped[Optional[str]] = mapped_column(
+        String, ForeignKey("calendar_feeds.id", ondelete="CASCADE"), nullable=True,
+    )
+    source_uid: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(),
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class EventImportJob(Base):
+    """A background .ics import and its progress."""
+
+    __tablename__ = "event_import_jobs"
+    __table_args__ = (
+        # Per-venue caps and the orphan sweep only look at unfinished jobs
+        Index(
+            "ix_event_import_jobs_unfinished",
+            "venue_profile_id",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    venue_profile_id: Mapped[str] = mapped_column(
+        String, ForeignKey("venue_profiles.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    created_by_user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)  # pending|running|completed|failed
+    # VEVENTs found in the file; known once parsing finishes
+    parsed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    imported: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[list[Any]] = mapped_column(JSON, default=list, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Touched when queued and at every step of the run; jobs that go quiet
+    # were orphaned by a restart
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
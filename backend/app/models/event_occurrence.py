@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EventOccurrence(Base):
+    """
+    Materialized upcoming occurrence of a recurring event.
+
+    Only the next EVENT_OCCURRENCE_CACHE_DAYS (plus a small margin) are kept,
+    so listings of the near future are plain index scans; occurrences outside
+    that window are expanded from the series' rrule when a query reaches them.
+    """
+
+    __tablename__ = "event_occurrences"
+    __table_args__ = (
+        Index("ix_event_occurrences_date_event", "date", "event_id"),
+    )
+
+    event_id: Mapped[str] = mapped_column(
+        String, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
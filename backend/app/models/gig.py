@@ -9,18 +9,21 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.db.base import Base
 
 
 class GigStatus(str, enum.Enum):
     upcoming = "upcoming"
+    # Date has passed but nobody has marked it completed or cancelled yet
+    pending_closeout = "pending_closeout"
     completed = "completed"
     cancelled = "cancelled"
 
@@ -34,19 +37,27 @@ class Gig(Base):
             "date",
             name="uq_gig_artist_venue_date",
         ),
+        # Composite indexes back per-profile, date-ordered listings and also
+        # serve plain profile_id lookups via their leading column.
+        Index("ix_gigs_artist_profile_id_date", "artist_profile_id", "date"),
+        Index("ix_gigs_venue_profile_id_date", "venue_profile_id", "date"),
+        # Small partial index for the scheduled close-out sweep
+        Index(
+            "ix_gigs_upcoming_date",
+            "date",
+            postgresql_where=text("status = 'upcoming'"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     artist_profile_id: Mapped[str] = mapped_column(
         String,
         ForeignKey("artist_profiles.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
     venue_profile_id: Mapped[str] = mapped_column(
         String,
         ForeignKey("venue_profiles.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
@@ -70,6 +81,9 @@ class Gig(Base):
         Boolean, default=False, nullable=False
     )
 
+    # Incremented on every write; exposed as the ETag for If-Match updates
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
     created_by_user_id: Mapped[str] = mapped_column(
         String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class JobRun(Base):
+    """One execution of a scheduled background job."""
+
+    __tablename__ = "job_runs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    job_name: Mapped[str] = mapped_column(String(80), index=True, nullable=False)
+
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_affected: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
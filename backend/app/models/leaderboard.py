@@ -0,0 +1,45 @@
+"""
+Read-only mappings for the leaderboard materialized views.
+
+The views are created and altered by Alembic migrations and refreshed by the
+scheduler, so they live on their own MetaData rather than Base.metadata.
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Numeric, String, Table
+
+views_metadata = MetaData()
+
+leaderboard_rollup = Table(
+    "leaderboard_rollup",
+    views_metadata,
+    Column("entity_type", String, primary_key=True),  # "artist" | "venue"
+    Column("profile_id", String, primary_key=True),
+    Column("time_window", String, primary_key=True),  # "30d" | "90d" | "365d" | "all"
+    Column("name", String),
+    Column("city", String),
+    Column("state", String),
+    Column("city_key", String),
+    Column("state_key", String),
+    Column("total_gigs", Integer),
+    Column("verified_gigs", Integer),
+    Column("total_attendance", Integer),
+    Column("avg_attendance", Numeric),
+    Column("total_tickets_sold", Integer),
+    Column("total_revenue_cents", BigInteger),
+    # Distinct artists for a venue row, distinct venues for an artist row.
+    # Only set for the "all" window; distinct counts do not sum across months.
+    Column("unique_counterparts", Integer),
+)
+
+leaderboard_cities = Table(
+    "leaderboard_cities",
+    views_metadata,
+    Column("city_key", String, primary_key=True),
+    Column("city", String),
+    Column("total_gigs", Integer),
+)
+
+
+def normalize_location_key(value: str) -> str:
+    """Python twin of the views' lower(btrim(...)) city/state key."""
+    return value.strip().lower()
@@ -0,0 +1,30 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ProfileMonthlyStats(Base):
+    """
+    Per-profile, per-month totals over non-cancelled gigs.
+
+    Maintained on gig writes; windowed leaderboards sum a handful of these
+    buckets per profile instead of rescanning gigs.
+    """
+
+    __tablename__ = "profile_monthly_stats"
+
+    entity_type: Mapped[str] = mapped_column(String(10), primary_key=True)  # "artist" | "venue"
+    profile_id: Mapped[str] = mapped_column(String, primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of month
+
+    gig_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    verified_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attendance_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attendance_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tickets_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tickets_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)  # cents
+    revenue_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, JSON, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, SmallInteger, String, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -10,6 +11,15 @@ from app.db.base import Base
 
 class SpotifyConnection(Base):
     __tablename__ = "spotify_connections"
+    __table_args__ = (
+        # Search's sort=spotify_popularity order (NULLS LAST is Postgres syntax)
+        Index(
+            "ix_spotify_connections_popularity_followers",
+            text("popularity DESC NULLS LAST"),
+            text("followers DESC NULLS LAST"),
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_spotify_connections_genres", "genres", postgresql_using="gin"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     artist_profile_id: Mapped[str] = mapped_column(
@@ -30,9 +40,25 @@ class SpotifyConnection(Base):
     )
 
     spotify_data: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    # Copies of spotify_data's artist metrics, written with it, for search
+    followers: Mapped[Optional[int]] = mapped_column(Integer, index=True, nullable=True)
+    popularity: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)  # 0-100
+    genres: Mapped[Optional[list[str]]] = mapped_column(
+        JSON().with_variant(ARRAY(String), "postgresql"), nullable=True
+    )
     data_fetched_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Last fetch of top tracks, releases and the account profile, which the
+    # background refresher refetches less often than artist metadata
+    details_fetched_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # When the background refresher should next refetch spotify_data: set a
+    # TTL ahead on every fetch, pulled to now when stale data is read
+    refresh_due_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), index=True, nullable=True
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
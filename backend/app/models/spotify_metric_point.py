@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SpotifyMetricPoint(Base):
+    """
+    One snapshot of an artist's Spotify metrics.
+
+    Daily points (the last refresh of the day wins) for the most recent
+    DAILY_RETENTION_DAYS; older ones are folded into one point per ISO week,
+    dated that week's Monday.
+    """
+
+    __tablename__ = "spotify_metric_points"
+    __table_args__ = (
+        # The downsample job reads one window of days across all artists
+        Index("ix_spotify_metric_points_day", "day"),
+    )
+
+    artist_profile_id: Mapped[str] = mapped_column(
+        String, ForeignKey("artist_profiles.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    followers: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    popularity: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)  # 0-100
+    monthly_listeners: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
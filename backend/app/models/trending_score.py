@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TrendingScore(Base):
+    """
+    Exponentially decayed activity score per profile.
+
+    ``score`` is the value as of ``updated_at``; its value at any later time t
+    is score * exp(-lambda * (t - updated_at)). ``rank_key`` is
+    ln(score) + lambda * epoch(updated_at), which orders rows by their decayed
+    score at *any* common read time, so ranking is a plain index scan.
+    """
+
+    __tablename__ = "trending_scores"
+    __table_args__ = (
+        Index("ix_trending_scores_rank", "entity_type", "rank_key"),
+    )
+
+    entity_type: Mapped[str] = mapped_column(String(10), primary_key=True)  # "artist" | "venue"
+    profile_id: Mapped[str] = mapped_column(String, primary_key=True)
+
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    rank_key: Mapped[float] = mapped_column(Float, nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +11,10 @@ from app.models.genre import Genre, venue_genres
 
 class VenueProfile(Base):
     __tablename__ = "venue_profiles"
+    __table_args__ = (
+        # Bounding-box prefilter of radius searches
+        Index("ix_venue_profiles_lat_lng", "latitude", "longitude"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)  # UUID string
     user_id: Mapped[str] = mapped_column(
@@ -26,6 +30,12 @@ class VenueProfile(Base):
     country: Mapped[str] = mapped_column(String, default="US", nullable=False)
 
     zip_code: Mapped[Optional[str]] = mapped_column(String(10), nullable=True, index=True)
+    # Coordinates of zip_code, filled in by the venue_geocode job.
+    # geocoded_zip is the zip they were resolved for (even if that failed),
+    # so a changed zip code is picked up again.
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    geocoded_zip: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
 
     capacity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     max_budget: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -37,4 +47,6 @@ class VenueProfile(Base):
 
     user = relationship("User", back_populates="venue_profile")
     genres = relationship(Genre, secondary=venue_genres, lazy="joined")
-    events = relationship("Event", back_populates="venue_profile", lazy="joined", order_by="Event.date")
+    # A venue can have thousands of events (imports, feeds): never load them
+    # implicitly, query the bounded slice that is needed instead.
+    events = relationship("Event", back_populates="venue_profile", lazy="raise", order_by="Event.date")
@@ -1,19 +1,35 @@
-from datetime import date
+from datetime import date, datetime
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, HttpUrl, model_validator
+
+from app.core.recurrence import MAX_RRULE_LENGTH, build_rule, normalize_rrule
 
 
 class EventIn(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: str = ""
     date: date
+    # iCalendar RRULE, e.g. "FREQ=WEEKLY;BYDAY=TH"; ``date`` is the first night
+    rrule: Optional[str] = Field(None, max_length=MAX_RRULE_LENGTH)
+
+    @model_validator(mode="after")
+    def check_rrule(self) -> "EventIn":
+        if self.rrule:
+            self.rrule = normalize_rrule(self.rrule)
+            build_rule(self.rrule, self.date)
+        else:
+            self.rrule = None
+        return self
 
 
 class EventOut(BaseModel):
     id: str
     title: str
     description: str
+    # For recurring events in listings, the occurrence's date
     date: date
+    rrule: Optional[str] = None
 
 
 class EventPublicOut(BaseModel):
@@ -25,9 +41,35 @@ class EventPublicOut(BaseModel):
     venue_name: str
     city: str
     state: str
+    rrule: Optional[str] = None
 
 
 class EventImportResult(BaseModel):
     imported: int
     skipped: int
     errors: list[str] = []
+
+
+class EventImportJobOut(BaseModel):
+    id: str
+    status: Literal["pending", "running", "completed", "failed"]
+    parsed: int
+    imported: int
+    skipped: int
+    errors: list[str] = []
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class CalendarFeedIn(BaseModel):
+    url: HttpUrl
+
+
+class CalendarFeedOut(BaseModel):
+    id: str
+    url: str
+    last_synced_at: Optional[datetime] = None
+    next_sync_at: datetime
+    failure_count: int
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,13 +19,14 @@ class GigOut(BaseModel):
     venue_name: str
     title: str
     date: date
-    status: Literal["upcoming", "completed", "cancelled"]
+    status: Literal["upcoming", "pending_closeout", "completed", "cancelled"]
     tickets_sold: Optional[int] = None
     attendance: Optional[int] = None
     ticket_price_cents: Optional[int] = None
     gross_revenue_cents: Optional[int] = None
     artist_confirmed: bool
     venue_confirmed: bool
+    version: int
     created_by_user_id: str
     created_at: datetime
     updated_at: datetime
@@ -38,6 +39,21 @@ class GigMetricsIn(BaseModel):
     gross_revenue_cents: Optional[int] = Field(None, ge=0)
 
 
+class GigBatchMetricsItem(GigMetricsIn):
+    gig_id: str
+    expected_version: Optional[int] = None
+
+
+class GigBatchMetricsIn(BaseModel):
+    items: List[GigBatchMetricsItem] = Field(..., min_length=1, max_length=100)
+
+
+class GigBatchConfirmIn(BaseModel):
+    gig_ids: List[str] = Field(..., min_length=1, max_length=100)
+    # Optional gig_id -> version the client last saw, checked like If-Match
+    expected_versions: Dict[str, int] = Field(default_factory=dict)
+
+
 class GigStatusIn(BaseModel):
     status: Literal["completed", "cancelled"]
 
@@ -61,3 +77,17 @@ class ArtistStatsOut(BaseModel):
     total_tickets_sold: Optional[int] = None
     unique_venues_count: int
     gig_history: List[GigHistoryItem]
+    next_history_cursor: Optional[str] = None
+
+
+class GigBatchItemResult(BaseModel):
+    gig_id: str
+    ok: bool
+    error: Optional[str] = None
+    gig: Optional[GigOut] = None
+
+
+class GigBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[GigBatchItemResult]
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -13,7 +13,8 @@ class VenueLeaderboardEntry(BaseModel):
     total_attendance: Optional[int] = None
     avg_attendance: Optional[float] = None
     total_tickets_sold: Optional[int] = None
-    unique_artists: int
+    total_revenue_cents: Optional[int] = None
+    unique_artists: Optional[int] = None
 
 
 class ArtistLeaderboardEntry(BaseModel):
@@ -26,11 +27,67 @@ class ArtistLeaderboardEntry(BaseModel):
     total_attendance: Optional[int] = None
     avg_attendance: Optional[float] = None
     total_tickets_sold: Optional[int] = None
-    unique_venues: int
+    total_revenue_cents: Optional[int] = None
+    unique_venues: Optional[int] = None
+
+
+LeaderboardWindow = Literal["30d", "90d", "365d", "all"]
+LeaderboardMetric = Literal[
+    "total_gigs",
+    "verified_gigs",
+    "total_attendance",
+    "avg_attendance",
+    "tickets",
+    "revenue",
+]
 
 
 class LeaderboardOut(BaseModel):
+    window: LeaderboardWindow = "all"
+    sort: LeaderboardMetric = "total_gigs"
+    min_verified_gigs: int = 0
     city: Optional[str] = None
     state: Optional[str] = None
     venues: List[VenueLeaderboardEntry]
     artists: List[ArtistLeaderboardEntry]
+
+
+class RankEntry(BaseModel):
+    rank: int
+    profile_id: str
+    name: str
+    city: str
+    state: str
+    value: Optional[float] = None
+
+
+class RankOut(BaseModel):
+    profile_id: str
+    entity_type: Literal["artist", "venue"]
+    window: LeaderboardWindow
+    metric: LeaderboardMetric
+    city: Optional[str] = None
+    state: Optional[str] = None
+    rank: int
+    total_ranked: int
+    # Share of ranked profiles at or below this one, 100 = top
+    percentile: float
+    value: Optional[float] = None
+    neighbors: List[RankEntry]
+
+
+class TrendingEntry(BaseModel):
+    profile_id: str
+    name: str
+    city: str
+    state: str
+    # Decayed score as of the response time
+    score: float
+
+
+class TrendingOut(BaseModel):
+    half_life_hours: float
+    city: Optional[str] = None
+    state: Optional[str] = None
+    venues: List[TrendingEntry]
+    artists: List[TrendingEntry]
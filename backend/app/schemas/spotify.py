@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel
@@ -13,6 +13,8 @@ class SpotifyConnectionOut(BaseModel):
     spotify_artist_id: Optional[str] = None
     spotify_data: dict[str, Any] = {}
     data_fetched_at: Optional[datetime] = None
+    # spotify_data is past its TTL and a background refresh is queued
+    stale: bool = False
 
 
 class SpotifyTopTrack(BaseModel):
@@ -46,5 +48,32 @@ class SpotifyPublicData(BaseModel):
     artist_url: Optional[str] = None
 
 
+class SpotifyMetricPointOut(BaseModel):
+    day: date
+    followers: Optional[int] = None
+    popularity: Optional[int] = None
+    monthly_listeners: Optional[int] = None
+
+
+class SpotifyMetricGrowth(BaseModel):
+    start: int
+    end: int
+    first_day: date
+    last_day: date
+    change: int
+    growth_pct: Optional[float] = None  # None when it started at 0
+    per_day: float
+
+
+class SpotifyTrendOut(BaseModel):
+    artist_profile_id: str
+    days: int
+    # Daily for the last 90 days, weekly (dated Mondays) before that
+    points: list[SpotifyMetricPointOut] = []
+    followers: Optional[SpotifyMetricGrowth] = None
+    popularity: Optional[SpotifyMetricGrowth] = None
+    monthly_listeners: Optional[SpotifyMetricGrowth] = None
+
+
 class SpotifySetArtistId(BaseModel):
     spotify_artist_id: str
@@ -39,4 +39,7 @@ class VenueProfileOut(BaseModel):
 
     amenities: Dict
     genres: List[str]
+    # The next few upcoming events only; page through the rest with
+    # GET /venue-profile/{id}/events
     events: List[EventOut] = Field(default_factory=list)
+    has_more_events: bool = False
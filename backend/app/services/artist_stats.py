@@ -0,0 +1,96 @@
+from sqlalchemy import and_, case, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.artist_stats import ArtistStats
+from app.models.gig import Gig, GigStatus
+
+
+def _stats_select(artist_profile_id: str):
+    verified = and_(
+        Gig.artist_confirmed == True,  # noqa: E712
+        Gig.venue_confirmed == True,  # noqa: E712
+    )
+    return (
+        select(
+            literal(artist_profile_id).label("artist_profile_id"),
+            func.count(Gig.id).label("total_gigs"),
+            func.count(case((verified, Gig.id))).label("verified_gigs"),
+            func.coalesce(func.sum(Gig.attendance), 0).label("attendance_sum"),
+            func.count(Gig.attendance).label("attendance_count"),
+            func.coalesce(func.sum(Gig.tickets_sold), 0).label("tickets_sold_sum"),
+            func.count(Gig.tickets_sold).label("tickets_sold_count"),
+            func.count(func.distinct(Gig.venue_profile_id)).label("unique_venues_count"),
+        )
+        .where(
+            Gig.artist_profile_id == artist_profile_id,
+            Gig.status == GigStatus.completed,
+        )
+    )
+
+
+def refresh_artist_stats(db: Session, artist_profile_id: str) -> None:
+    """
+    Recompute one artist's stats row inside the caller's transaction.
+
+    The aggregate only touches that artist's completed gigs, so the cost is
+    paid once per gig write instead of on every public stats read.
+    """
+    db.flush()
+    stmt = insert(ArtistStats).from_select(
+        [
+            "artist_profile_id",
+            "total_gigs",
+            "verified_gigs",
+            "attendance_sum",
+            "attendance_count",
+            "tickets_sold_sum",
+            "tickets_sold_count",
+            "unique_venues_count",
+        ],
+        _stats_select(artist_profile_id),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArtistStats.artist_profile_id],
+        set_={
+            "total_gigs": stmt.excluded.total_gigs,
+            "verified_gigs": stmt.excluded.verified_gigs,
+            "attendance_sum": stmt.excluded.attendance_sum,
+            "attendance_count": stmt.excluded.attendance_count,
+            "tickets_sold_sum": stmt.excluded.tickets_sold_sum,
+            "tickets_sold_count": stmt.excluded.tickets_sold_count,
+            "unique_venues_count": stmt.excluded.unique_venues_count,
+            "revision": ArtistStats.revision + 1,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def bump_venue_artists_revisions(db: Session, venue_profile_id: str) -> None:
+    """
+    Bump the stats revision of every artist with a completed gig at the
+    venue, whose gig history shows the venue's name. The caller commits.
+    """
+    db.execute(
+        update(ArtistStats)
+        .where(
+            ArtistStats.artist_profile_id.in_(
+                select(Gig.artist_profile_id).where(
+                    Gig.venue_profile_id == venue_profile_id,
+                    Gig.status == GigStatus.completed,
+                )
+            )
+        )
+        # The stats themselves did not change
+        .values(revision=ArtistStats.revision + 1, updated_at=ArtistStats.updated_at)
+    )
+
+
+def get_or_create_artist_stats(db: Session, artist_profile_id: str) -> ArtistStats:
+    stats = db.get(ArtistStats, artist_profile_id)
+    if stats is None:
+        refresh_artist_stats(db, artist_profile_id)
+        db.commit()
+        stats = db.get(ArtistStats, artist_profile_id)
+    return stats
@@ -0,0 +1,204 @@
+"""
+Public calendar feeds (.ics and JSON) for events and artist gigs.
+
+Rows are read with a server-side cursor in FEED_ROW_BATCH batches and
+rendered one VEVENT at a time, so a large calendar never materializes as ORM
+objects. Rendered bodies are cached per entity and format in ``feed_cache``;
+write paths call the ``invalidate_*`` helpers after committing, and the TTL
+bounds staleness across API workers, which each hold their own cache.
+"""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from icalendar import Event as ICalEvent, vRecur
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import ResponseCache
+from app.models.event import Event
+from app.models.gig import Gig, GigStatus
+from app.models.venue import VenueProfile
+
+FEED_CACHE_TTL_SECONDS = 300
+FEED_ROW_BATCH = 500
+# The platform-wide feed covers this many days ahead
+PUBLIC_FEED_DAYS = 365
+
+FEED_MEDIA_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "json": "application/json",
+}
+
+PRODID = "-//GigConnector//Calendar Feeds//EN"
+# DTSTAMP fallback for rows without created_at; fixed so the ETag stays stable
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+feed_cache = ResponseCache(ttl_seconds=FEED_CACHE_TTL_SECONDS)
+
+
+def invalidate_event_feeds(*venue_profile_ids: str) -> None:
+    """Call after committing event writes for these venues."""
+    keys = [("events", "ics"), ("events", "json")]
+    for venue_profile_id in venue_profile_ids:
+        keys += [("venue", venue_profile_id, "ics"), ("venue", venue_profile_id, "json")]
+    feed_cache.invalidate(*keys)
+
+
+def invalidate_gig_feeds(*artist_profile_ids: str) -> None:
+    """Call after committing gig writes for these artists."""
+    keys = []
+    for artist_profile_id in artist_profile_ids:
+        keys += [("artist", artist_profile_id, "ics"), ("artist", artist_profile_id, "json")]
+    feed_cache.invalidate(*keys)
+
+
+def _location(*parts: str | None) -> str:
+    return ", ".join(p for p in parts if p)
+
+
+def _calendar(name: str, vevents: Iterable[ICalEvent]) -> bytes:
+    chunks = [
+        b"BEGIN:VCALENDAR\r\n",
+        b"VERSION:2.0\r\n",
+        f"PRODID:{PRODID}\r\n".encode(),
+        b"CALSCALE:GREGORIAN\r\n",
+        # X-WR-CALNAME is what most calendar apps show as the feed's title
+        f"X-WR-CALNAME:{name}\r\n".encode(),
+    ]
+    chunks.extend(v.to_ical() for v in vevents)
+    chunks.append(b"END:VCALENDAR\r\n")
+    return b"".join(chunks)
+
+
+def _event_rows(db: Session, venue_profile_id: str | None):
+    q = (
+        select(
+            Event.id,
+            Event.title,
+            Event.description,
+            Event.date,
+            Event.rrule,
+            Event.created_at,
+            Event.venue_profile_id,
+            VenueProfile.venue_name,
+            VenueProfile.city,
+            VenueProfile.state,
+        )
+        .join(VenueProfile, VenueProfile.id == Event.venue_profile_id)
+        .order_by(Event.date, Event.id)
+        .execution_options(yield_per=FEED_ROW_BATCH)
+    )
+    if venue_profile_id:
+        q = q.where(Event.venue_profile_id == venue_profile_id)
+    else:
+        # Upcoming one-off events, and series that have not ended yet
+        today = date.today()
+        q = q.where(
+            Event.date <= today + timedelta(days=PUBLIC_FEED_DAYS),
+            or_(
+                and_(Event.rrule.is_(None), Event.date >= today),
+                and_(
+                    Event.rrule.isnot(None),
+                    or_(Event.series_until.is_(None), Event.series_until >= today),
+                ),
+            ),
+        )
+    return db.execute(q)
+
+
+def _event_vevent(row) -> ICalEvent:
+    v = ICalEvent()
+    v.add("uid", f"event-{row.id}@gigconnector")
+    v.add("dtstamp", row.created_at or _EPOCH)
+    v.add("dtstart", row.date)
+    v.add("dtend", row.date + timedelta(days=1))
+    if row.rrule:
+        # Series are published as series; calendar apps expand them
+        v.add("rrule", vRecur.from_ical(row.rrule))
+    v.add("summary", row.title)
+    if row.description:
+        v.add("description", row.description)
+    v.add("location", _location(row.venue_name, row.city, row.state))
+    return v
+
+
+def render_events(db: Session, fmt: str, venue_profile_id: str | None = None) -> bytes:
+    """Events of one venue, or upcoming events platform-wide, as .ics or JSON."""
+    rows = _event_rows(db, venue_profile_id)
+    if fmt == "ics":
+        return _calendar("Events", (_event_vevent(r) for r in rows))
+    return json.dumps(
+        [
+            {
+                "id": r.id,
+                "title": r.title,
+                "description": r.description,
+                "date": r.date.isoformat(),
+                "rrule": r.rrule,
+                "venue_id": r.venue_profile_id,
+                "venue_name": r.venue_name,
+                "city": r.city,
+                "state": r.state,
+            }
+            for r in rows
+        ]
+    ).encode()
+
+
+def _gig_rows(db: Session, artist_profile_id: str):
+    q = (
+        select(
+            Gig.id,
+            Gig.title,
+            Gig.date,
+            Gig.status,
+            Gig.created_at,
+            Gig.venue_profile_id,
+            VenueProfile.venue_name,
+            VenueProfile.city,
+            VenueProfile.state,
+        )
+        .join(VenueProfile, VenueProfile.id == Gig.venue_profile_id)
+        .where(
+            Gig.artist_profile_id == artist_profile_id,
+            Gig.status != GigStatus.cancelled,
+        )
+        .order_by(Gig.date, Gig.id)
+        .execution_options(yield_per=FEED_ROW_BATCH)
+    )
+    return db.execute(q)
+
+
+def _gig_vevent(row) -> ICalEvent:
+    v = ICalEvent()
+    v.add("uid", f"gig-{row.id}@gigconnector")
+    v.add("dtstamp", row.created_at or _EPOCH)
+    v.add("dtstart", row.date)
+    v.add("dtend", row.date + timedelta(days=1))
+    v.add("summary", f"{row.title} @ {row.venue_name}")
+    v.add("location", _location(row.venue_name, row.city, row.state))
+    return v
+
+
+def render_artist_gigs(db: Session, fmt: str, artist_profile_id: str) -> bytes:
+    """An artist's non-cancelled gigs as .ics or JSON."""
+    rows = _gig_rows(db, artist_profile_id)
+    if fmt == "ics":
+        return _calendar("Gigs", (_gig_vevent(r) for r in rows))
+    return json.dumps(
+        [
+            {
+                "id": r.id,
+                "title": r.title,
+                "date": r.date.isoformat(),
+                "status": r.status.value,
+                "venue_id": r.venue_profile_id,
+                "venue_name": r.venue_name,
+                "city": r.city,
+                "state": r.state,
+            }
+            for r in rows
+        ]
+    ).encode()
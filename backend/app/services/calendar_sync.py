@@ -0,0 +1,340 @@
+"""
+Sync of subscribed calendar feeds.
+
+A scheduled job claims the feeds that are due, fetches them concurrently with
+conditional requests (If-None-Match / If-Modified-Since) while no transaction
+is open, and for every feed that changed applies only the difference to its
+events, matched by VEVENT UID, in a short transaction of its own. Requests to
+any one host are capped, and failing feeds back off exponentially.
+
+Each feed host is resolved once and the request goes to the address that was
+checked, so a second lookup can't rebind it elsewhere. Hosts that resolve to
+private or loopback addresses are refused unless
+CALENDAR_FEEDS_ALLOW_PRIVATE_HOSTS is set, which is also how the syncer is
+pointed at a local stand-in server. ``transport`` lets callers swap the HTTP
+transport.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.recurrence import series_until
+from app.models.calendar_feed import CalendarFeed
+from app.models.event import Event
+from app.services.calendar_export import invalidate_event_feeds
+from app.services.event_import import INSERT_BATCH_SIZE, InvalidCalendarError, parse_ics
+from app.services.event_occurrences import materialize_occurrences
+
+logger = logging.getLogger(__name__)
+
+FEEDS_PER_TICK = 50
+FETCH_TIMEOUT_SECONDS = 15.0
+# Claimed feeds are not due again for this long, so a worker that dies
+# mid-fetch only delays them
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_FEED_BYTES = 10 * 1024 * 1024
+# First retry after a failure; doubles per consecutive failure
+RETRY_BASE_SECONDS = 60
+
+
+class FeedFetchError(Exception):
+    """A feed could not be fetched (bad status, too large, refused host)."""
+
+
+@dataclass
+class FeedFetchResult:
+    not_modified: bool
+    body: bytes = b""
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class FeedDiff:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+async def _resolve_host(host: str) -> str:
+    """The address to connect to for ``host``, after checking every address it has."""
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None)
+    except OSError:
+        raise FeedFetchError(f"Could not resolve {host}")
+    if not infos:
+        raise FeedFetchError(f"Could not resolve {host}")
+    if not settings.CALENDAR_FEEDS_ALLOW_PRIVATE_HOSTS:
+        for info in infos:
+            if not ipaddress.ip_address(info[4][0]).is_global:
+                raise FeedFetchError(f"{host} resolves to a non-public address")
+    return infos[0][4][0]
+
+
+async def fetch_feed(
+    client: httpx.AsyncClient,
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> FeedFetchResult:
+    """
+    Conditionally GET one feed, streaming the body up to MAX_FEED_BYTES.
+
+    The request is sent to the address ``_resolve_host`` checked; Host and
+    TLS SNI (and so certificate verification) still use the feed's hostname.
+    """
+    parsed = httpx.URL(url)
+    if not parsed.host:
+        raise FeedFetchError("Feed URL has no host")
+    address = await _resolve_host(parsed.host)
+    headers = {"Host": parsed.netloc.decode("ascii")}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    async with client.stream(
+        "GET",
+        parsed.copy_with(host=address),
+        headers=headers,
+        extensions={"sni_hostname": parsed.host},
+    ) as resp:
+        if resp.status_code == 304:
+            return FeedFetchResult(not_modified=True)
+        if resp.status_code != 200:
+            raise FeedFetchError(f"Feed returned HTTP {resp.status_code}")
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in resp.aiter_bytes():
+            size += len(chunk)
+            if size > MAX_FEED_BYTES:
+                raise FeedFetchError("Feed is larger than 10 MB")
+            chunks.append(chunk)
+        return FeedFetchResult(
+            not_modified=False,
+            body=b"".join(chunks),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+
+
+async def _fetch_all(
+    feeds: list[tuple[str, str, str | None, str | None]],
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, FeedFetchResult | Exception]:
+    """Fetch (feed_id, url, etag, last_modified) feeds, at most N per host at once."""
+    per_host: dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(settings.CALENDAR_SYNC_PER_HOST_LIMIT)
+    )
+
+    async with httpx.AsyncClient(
+        timeout=FETCH_TIMEOUT_SECONDS,
+        follow_redirects=False,
+        transport=transport,
+    ) as client:
+
+        async def one(url: str, etag: str | None, last_modified: str | None):
+            async with per_host[urlsplit(url).hostname or ""]:
+                try:
+                    return await fetch_feed(client, url, etag, last_modified)
+                except (httpx.HTTPError, FeedFetchError) as exc:
+                    return exc
+
+        results = await asyncio.gather(*(one(url, et, lm) for _, url, et, lm in feeds))
+    return {feed_id: result for (feed_id, _, _, _), result in zip(feeds, results)}
+
+
+def _event_key(event: dict[str, Any]) -> str:
+    # Feeds should give every VEVENT a UID; fall back to what makes it unique
+    return event["uid"] or f"{event['date'].isoformat()}|{event['title']}"
+
+
+def apply_feed_diff(db: Session, feed: CalendarFeed, events: list[dict[str, Any]]) -> FeedDiff:
+    """
+    Make ``feed``'s stored events match ``events`` (from parse_ics).
+
+    Only new UIDs are inserted, only UIDs whose title, description, date or
+    recurrence changed are updated, and UIDs no longer in the feed are deleted. Inserts
+    and updates that would duplicate another event of the venue (same title
+    and date) are skipped. The caller commits.
+    """
+    incoming: dict[str, dict[str, Any]] = {}
+    for event in events:
+        incoming.setdefault(_event_key(event), event)
+
+    existing = {
+        row.source_uid: row
+        for row in db.execute(
+            select(
+                Event.id, Event.source_uid, Event.title, Event.description, Event.date, Event.rrule
+            ).where(Event.source_feed_id == feed.id)
+        )
+    }
+
+    new = [(uid, e) for uid, e in incoming.items() if uid not in existing]
+    changed = [
+        (existing[uid].id, e)
+        for uid, e in incoming.items()
+        if uid in existing
+        and (existing[uid].title, existing[uid].description, existing[uid].date, existing[uid].rrule)
+        != (e["title"], e["description"], e["date"], e["rrule"])
+    ]
+    gone = [row.id for uid, row in existing.items() if uid not in incoming]
+
+    diff = FeedDiff()
+    # Series whose cached occurrences must be rebuilt
+    reexpand: list[str] = []
+    for start in range(0, len(new), INSERT_BATCH_SIZE):
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "venue_profile_id": feed.venue_profile_id,
+                "title": e["title"],
+                "description": e["description"],
+                "date": e["date"],
+                "rrule": e["rrule"],
+                "series_until": series_until(e["rrule"], e["date"]) if e["rrule"] else None,
+                "source_feed_id": feed.id,
+                "source_uid": uid,
+            }
+            for uid, e in new[start : start + INSERT_BATCH_SIZE]
+        ]
+        stmt = insert(Event).values(rows).on_conflict_do_nothing().returning(Event.id, Event.rrule)
+        inserted = db.execute(stmt).all()
+        diff.inserted += len(inserted)
+        reexpand += [event_id for event_id, rrule in inserted if rrule]
+
+    for event_id, e in changed:
+        try:
+            with db.begin_nested():
+                db.execute(
+                    update(Event)
+                    .where(Event.id == event_id)
+                    .values(
+                        title=e["title"],
+                        description=e["description"],
+                        date=e["date"],
+                        rrule=e["rrule"],
+                        series_until=series_until(e["rrule"], e["date"]) if e["rrule"] else None,
+                    )
+                )
+            diff.updated += 1
+            reexpand.append(event_id)
+        except IntegrityError:
+            logger.info("Feed %s: skipped update of %s, duplicates another event", feed.id, event_id)
+
+    for start in range(0, len(gone), INSERT_BATCH_SIZE):
+        result = db.execute(delete(Event).where(Event.id.in_(gone[start : start + INSERT_BATCH_SIZE])))
+        diff.deleted += result.rowcount
+
+    materialize_occurrences(db, reexpand)
+    return diff
+
+
+def _retry_delay(failure_count: int) -> timedelta:
+    seconds = RETRY_BASE_SECONDS * 2 ** min(failure_count - 1, 20)
+    return timedelta(seconds=min(seconds, settings.CALENDAR_FEED_MAX_BACKOFF_SECONDS))
+
+
+def _record_failure(feed: CalendarFeed, error: str, now: datetime) -> None:
+    feed.failure_count += 1
+    feed.last_error = error[:500]
+    feed.next_sync_at = now + _retry_delay(feed.failure_count)
+
+
+def _claim_due_feeds(db: Session, now: datetime) -> list[tuple[str, str, str | None, str | None]]:
+    """
+    Lease up to FEEDS_PER_TICK due feeds to this run and commit. SKIP LOCKED
+    and the lease keep a concurrent run off the same feeds.
+    """
+    feeds = (
+        db.execute(
+            select(CalendarFeed)
+            .where(CalendarFeed.next_sync_at <= now)
+            .order_by(CalendarFeed.next_sync_at)
+            .limit(FEEDS_PER_TICK)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    claimed = [(f.id, f.url, f.etag, f.last_modified) for f in feeds]
+    for feed in feeds:
+        feed.next_sync_at = now + CLAIM_LEASE
+    db.commit()
+    return claimed
+
+
+def sync_calendar_feeds(
+    db: Session,
+    transport: httpx.AsyncBaseTransport | None = None,
+    now: datetime | None = None,
+) -> int:
+    """
+    Sync up to FEEDS_PER_TICK due feeds. Returns the number of events
+    inserted, updated or deleted.
+
+    Commits as it goes: the claim first, then each feed's diff, so no
+    transaction or row lock is held across the network. The claim also keeps
+    runs that don't go through the scheduler's lock apart.
+    Runs from the scheduler's worker thread, so it drives its own event loop
+    for the concurrent fetches.
+    """
+    now = now or datetime.now(timezone.utc)
+    claimed = _claim_due_feeds(db, now)
+    if not claimed:
+        return 0
+
+    results = asyncio.run(_fetch_all(claimed, transport))
+
+    changed = 0
+    for feed_id, _, _, _ in claimed:
+        result = results[feed_id]
+        parsed = None
+        error = None
+        if isinstance(result, Exception):
+            error = str(result) or repr(result)
+        elif not result.not_modified:
+            try:
+                parsed = parse_ics(result.body)
+            except InvalidCalendarError as exc:
+                error = str(exc)
+
+        feed = db.get(CalendarFeed, feed_id)
+        if feed is None:
+            # Unsubscribed while it was being fetched
+            db.rollback()
+            continue
+        if error is not None:
+            _record_failure(feed, error, now)
+            db.commit()
+            continue
+
+        diff = None
+        if parsed is not None:
+            diff = apply_feed_diff(db, feed, parsed.events)
+            changed += diff.inserted + diff.updated + diff.deleted
+            feed.etag = result.etag
+            feed.last_modified = result.last_modified
+        feed.failure_count = 0
+        feed.last_error = None
+        feed.last_synced_at = now
+        feed.next_sync_at = now + timedelta(seconds=settings.CALENDAR_FEED_REFRESH_SECONDS)
+        db.commit()
+        if diff is not None and (diff.inserted or diff.updated or diff.deleted):
+            invalidate_event_feeds(feed.venue_profile_id)
+    return changed
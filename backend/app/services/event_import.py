@@ -0,0 +1,346 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from icalendar import Calendar
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.recurrence import InvalidRecurrenceError, build_rule, normalize_rrule, series_until
+from app.db.session import SessionLocal
+from app.models.event import Event
+from app.models.event_import_job import EventImportJob
+from app.services.calendar_export import invalidate_event_feeds
+from app.services.event_occurrences import materialize_occurrences
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement (7 bind params each, well under Postgres' limit)
+INSERT_BATCH_SIZE = 1000
+# Background jobs keep at most this many error messages
+MAX_JOB_ERRORS = 100
+
+UNFINISHED_STATUSES = ("pending", "running")
+
+# Background imports run here, never on the event loop or the request
+# threadpool. The executor's own queue is unbounded and each queued job holds
+# its upload in memory, so queued plus running jobs are capped by _slots.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.EVENT_IMPORT_WORKERS,
+    thread_name_prefix="event-import",
+)
+_slots = threading.BoundedSemaphore(settings.EVENT_IMPORT_QUEUE_SIZE)
+_futures: dict[str, Future] = {}
+_futures_lock = threading.Lock()
+
+
+class InvalidCalendarError(ValueError):
+    """The uploaded bytes are not a parseable iCalendar file."""
+
+
+class ImportQueueFullError(Exception):
+    """This worker already holds EVENT_IMPORT_QUEUE_SIZE background imports."""
+
+
+@dataclass
+class ParsedCalendar:
+    # Each event is {"uid", "title", "description", "date", "rrule"}; uid and
+    # rrule may be None
+    events: list[dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def parse_ics(contents: bytes) -> ParsedCalendar:
+    """
+    Extract importable VEVENTs from an .ics file.
+
+    CPU-bound and blocking: call it from a worker thread, not the event loop.
+    Events without a usable title or date are counted as skipped.
+    """
+    try:
+        cal = Calendar.from_ical(contents)
+    except Exception:
+        raise InvalidCalendarError("Invalid .ics file. Could not parse calendar data.")
+
+    parsed = ParsedCalendar()
+    for i, component in enumerate(cal.walk()):
+        if component.name != "VEVENT":
+            continue
+
+        # A changed or moved single occurrence of a series; series are stored
+        # whole, so it can't be applied
+        if component.get("RECURRENCE-ID"):
+            label = str(component.get("SUMMARY") or f"#{i + 1}").strip()
+            parsed.errors.append(
+                f"Event '{label[:50]}': changes to a single occurrence are not supported, skipped"
+            )
+            parsed.skipped += 1
+            continue
+
+        # SUMMARY -> title
+        raw_title = component.get("SUMMARY")
+        if not raw_title:
+            parsed.errors.append(f"Event #{i + 1}: missing title, skipped")
+            parsed.skipped += 1
+            continue
+        title = str(raw_title).strip()
+        if not title:
+            parsed.errors.append(f"Event #{i + 1}: empty title, skipped")
+            parsed.skipped += 1
+            continue
+        if len(title) > 200:
+            title = title[:200]
+            parsed.errors.append(f"Event '{title[:30]}...': title truncated to 200 characters")
+
+        # DTSTART -> date
+        dt_prop = component.get("DTSTART")
+        if not dt_prop:
+            parsed.errors.append(f"Event '{title[:50]}': missing date, skipped")
+            parsed.skipped += 1
+            continue
+        dt_val = dt_prop.dt
+        if isinstance(dt_val, datetime):
+            event_date = dt_val.date()
+        elif isinstance(dt_val, date):
+            event_date = dt_val
+        else:
+            parsed.errors.append(f"Event '{title[:50]}': unrecognized date format, skipped")
+            parsed.skipped += 1
+            continue
+
+        # DESCRIPTION -> description (optional)
+        raw_desc = component.get("DESCRIPTION")
+        description = str(raw_desc).strip() if raw_desc else ""
+
+        # RRULE -> rrule (optional); the series is stored once
+        rrule = None
+        raw_rrule = component.get("RRULE")
+        if isinstance(raw_rrule, list):
+            raw_rrule = raw_rrule[0]
+        if raw_rrule:
+            try:
+                rrule = normalize_rrule(raw_rrule.to_ical().decode())
+                build_rule(rrule, event_date)
+            except (InvalidRecurrenceError, UnicodeDecodeError):
+                rrule = None
+                parsed.errors.append(
+                    f"Event '{title[:50]}': unsupported recurrence, imported as a single event"
+                )
+        if rrule and (component.get("EXDATE") or component.get("RDATE")):
+            parsed.errors.append(
+                f"Event '{title[:50]}': added or excluded dates are not supported, "
+                "imported with every occurrence of its rule"
+            )
+
+        raw_uid = component.get("UID")
+        parsed.events.append(
+            {
+                "uid": str(raw_uid).strip() if raw_uid else None,
+                "title": title,
+                "description": description,
+                "date": event_date,
+                "rrule": rrule,
+            }
+        )
+    return parsed
+
+
+def insert_events(db: Session, venue_profile_id: str, events: list[dict[str, Any]]) -> int:
+    """
+    Insert ``events`` for a venue, skipping any that already exist.
+
+    Duplicates (same venue, title and date, whether already stored or repeated
+    within ``events``) are dropped by uq_events_venue_title_date via
+    ON CONFLICT DO NOTHING, so existing events are never loaded. Returns the
+    number of rows inserted. The caller commits.
+    """
+    imported = 0
+    for start in range(0, len(events), INSERT_BATCH_SIZE):
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "venue_profile_id": venue_profile_id,
+                "title": e["title"],
+                "description": e["description"],
+                "date": e["date"],
+                "rrule": e["rrule"],
+                "series_until": series_until(e["rrule"], e["date"]) if e["rrule"] else None,
+            }
+            for e in events[start : start + INSERT_BATCH_SIZE]
+        ]
+        stmt = (
+            insert(Event)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_events_venue_title_date")
+            .returning(Event.id, Event.rrule)
+        )
+        inserted = db.execute(stmt).all()
+        imported += len(inserted)
+        materialize_occurrences(db, [event_id for event_id, rrule in inserted if rrule])
+    return imported
+
+
+def _cap_errors(errors: list[str]) -> list[str]:
+    if len(errors) <= MAX_JOB_ERRORS:
+        return errors
+    return errors[:MAX_JOB_ERRORS] + [f"... and {len(errors) - MAX_JOB_ERRORS} more"]
+
+
+def run_import_job(job_id: str, contents: bytes) -> None:
+    """
+    Parse and import one uploaded calendar for an EventImportJob.
+
+    Events are inserted INSERT_BATCH_SIZE at a time, committing the job's
+    counters after every batch so GET /events/import/{job_id} can report
+    progress while the import runs.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(EventImportJob, job_id)
+        # Gone, or failed as an orphan while it waited in the queue
+        if job is None or job.status != "pending":
+            return
+        job.status = "running"
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+
+        try:
+            parsed = parse_ics(contents)
+        except InvalidCalendarError as exc:
+            job.status = "failed"
+            job.errors = [str(exc)]
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+            return
+
+        job.parsed = len(parsed.events) + parsed.skipped
+        job.skipped = parsed.skipped
+        job.errors = _cap_errors(parsed.errors)
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+
+        for start in range(0, len(parsed.events), INSERT_BATCH_SIZE):
+            batch = parsed.events[start : start + INSERT_BATCH_SIZE]
+            imported = insert_events(db, job.venue_profile_id, batch)
+            job.imported += imported
+            job.skipped += len(batch) - imported
+            job.heartbeat_at = datetime.now(timezone.utc)
+            db.commit()
+
+        job.status = "completed"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        invalidate_event_feeds(job.venue_profile_id)
+    except Exception:
+        logger.exception("Event import job %s failed", job_id)
+        db.rollback()
+        job = db.get(EventImportJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.errors = _cap_errors(list(job.errors) + ["Import failed unexpectedly"])
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+    finally:
+        db.close()
+
+
+def reserve_import_slot() -> None:
+    """
+    Take a place in this worker's import queue, or raise ImportQueueFullError.
+    Pass it on with ``submit_import_job`` or give it back with
+    ``release_import_slot``.
+    """
+    if not _slots.acquire(blocking=False):
+        raise ImportQueueFullError("Too many imports in progress")
+
+
+def release_import_slot() -> None:
+    _slots.release()
+
+
+def submit_import_job(job_id: str, contents: bytes) -> None:
+    """
+    Queue ``run_import_job`` on the import worker pool, using a slot taken
+    with ``reserve_import_slot``; the slot is freed when the job ends. The
+    job row must be committed.
+    """
+    future = _executor.submit(run_import_job, job_id, contents)
+    with _futures_lock:
+        _futures[job_id] = future
+
+    def done(_: Future) -> None:
+        release_import_slot()
+        with _futures_lock:
+            _futures.pop(job_id, None)
+
+    future.add_done_callback(done)
+
+
+def count_unfinished_jobs(db: Session, venue_profile_id: str) -> int:
+    return (
+        db.query(func.count(EventImportJob.id))
+        .filter(
+            EventImportJob.venue_profile_id == venue_profile_id,
+            EventImportJob.status.in_(UNFINISHED_STATUSES),
+        )
+        .scalar()
+    )
+
+
+def _fail_jobs(db: Session, criteria: list, error: str) -> int:
+    result = db.execute(
+        update(EventImportJob)
+        .where(EventImportJob.status.in_(UNFINISHED_STATUSES), *criteria)
+        .values(
+            status="failed",
+            errors=[error],
+            finished_at=datetime.now(timezone.utc),
+        )
+    )
+    return result.rowcount
+
+
+def fail_orphaned_import_jobs(db: Session) -> int:
+    """
+    Fail pending or running jobs with no progress for
+    EVENT_IMPORT_STALE_SECONDS: their worker restarted and the upload, which
+    only lived in its memory, is gone. Running jobs record a heartbeat at
+    every step, so only orphans go quiet that long. The caller commits.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.EVENT_IMPORT_STALE_SECONDS)
+    return _fail_jobs(
+        db,
+        [func.coalesce(EventImportJob.heartbeat_at, EventImportJob.created_at) < cutoff],
+        "Import was interrupted by a server restart. Upload the file again.",
+    )
+
+
+def shutdown_import_executor() -> None:
+    """
+    Stop the import pool: queued jobs are cancelled and marked failed, jobs
+    already running are left to finish.
+    """
+    with _futures_lock:
+        futures = list(_futures.items())
+    # Outside the lock: cancel() runs the done callback, which takes it
+    cancelled = [job_id for job_id, f in futures if f.cancel()]
+    _executor.shutdown(wait=False, cancel_futures=True)
+    if not cancelled:
+        return
+    db = SessionLocal()
+    try:
+        _fail_jobs(
+            db,
+            [EventImportJob.id.in_(cancelled)],
+            "Import was cancelled by a server shutdown. Upload the file again.",
+        )
+        db.commit()
+    finally:
+        db.close()
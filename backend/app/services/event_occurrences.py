@@ -0,0 +1,178 @@
+"""
+Occurrences of recurring events.
+
+A series is one ``events`` row with an rrule. The next
+EVENT_OCCURRENCE_CACHE_DAYS of occurrences are materialized in
+``event_occurrences`` (rebuilt on every series write and rolled forward by a
+scheduled job), so the common "upcoming events" reads are index scans. A
+query whose window reaches past that, or into the past, gets the remaining
+occurrences expanded lazily from the rrule, only as far as the page needs.
+"""
+
+import heapq
+from datetime import date, timedelta
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy import delete, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.recurrence import occurrence_dates
+from app.models.event import Event
+from app.models.event_occurrence import EventOccurrence
+from app.models.venue import VenueProfile
+
+# Materialized beyond what reads use, so a late refresh never leaves a gap
+CACHE_MARGIN_DAYS = 7
+INSERT_BATCH_SIZE = 1000
+
+
+def cached_window(today: date | None = None) -> tuple[date, date]:
+    """The date range reads take from event_occurrences."""
+    today = today or date.today()
+    return today, today + timedelta(days=settings.EVENT_OCCURRENCE_CACHE_DAYS)
+
+
+def materialize_occurrences(
+    db: Session,
+    event_ids: Iterable[str] | None = None,
+    today: date | None = None,
+) -> int:
+    """
+    Rebuild the cached occurrences of the given series, or with no
+    ``event_ids`` drop expired rows and extend every running series to the
+    end of the window. Returns the number of rows inserted. The caller commits.
+    """
+    start, end = cached_window(today)
+    end += timedelta(days=CACHE_MARGIN_DAYS)
+
+    q = select(Event.id, Event.rrule, Event.date).where(
+        Event.rrule.isnot(None),
+        Event.date <= end,
+        or_(Event.series_until.is_(None), Event.series_until >= start),
+    )
+    if event_ids is None:
+        db.execute(delete(EventOccurrence).where(EventOccurrence.date < start))
+        series = db.execute(q).all()
+    else:
+        ids = list(event_ids)
+        series = []
+        for i in range(0, len(ids), INSERT_BATCH_SIZE):
+            batch = ids[i : i + INSERT_BATCH_SIZE]
+            db.execute(delete(EventOccurrence).where(EventOccurrence.event_id.in_(batch)))
+            series += db.execute(q.where(Event.id.in_(batch))).all()
+
+    rows = [
+        {"event_id": event_id, "date": d}
+        for event_id, rrule, dtstart in series
+        for d in occurrence_dates(rrule, dtstart, start, end)
+    ]
+    inserted = 0
+    for i in range(0, len(rows), INSERT_BATCH_SIZE):
+        stmt = (
+            insert(EventOccurrence)
+            .values(rows[i : i + INSERT_BATCH_SIZE])
+            .on_conflict_do_nothing()
+            .returning(EventOccurrence.event_id)
+        )
+        inserted += len(db.execute(stmt).all())
+    return inserted
+
+
+def _uncached(
+    event_id: str,
+    rrule: str,
+    dtstart: date,
+    lower: date,
+    end: date | None,
+    window: tuple[date, date],
+) -> Iterator[tuple[date, str]]:
+    # Occurrences in [lower, end] that fall outside the cached window
+    cache_start, cache_end = window
+    if lower < cache_start:
+        before = cache_start - timedelta(days=1)
+        for d in occurrence_dates(rrule, dtstart, lower, min(end, before) if end else before):
+            yield d, event_id
+    for d in occurrence_dates(rrule, dtstart, max(lower, cache_end + timedelta(days=1)), end):
+        yield d, event_id
+
+
+def occurrence_page(
+    db: Session,
+    criteria: list,
+    start: date | None,
+    end: date | None,
+    after: tuple[date, str] | None,
+    limit: int,
+) -> list[tuple[date, str]]:
+    """
+    Up to ``limit`` + 1 (date, event_id) pairs in (date, id) order, the extra
+    one telling the caller there is a next page: one-off events plus
+    occurrences of recurring ones, within [start, end] and after the
+    ``after`` keyset cursor.
+
+    ``criteria`` filter Event and VenueProfile (which is joined). One-off
+    events and cached occurrences come from a single UNION query; the
+    matching series are only expanded when the page can contain dates
+    outside the cached window.
+    """
+    window = cached_window()
+
+    def bounded(q, date_col, id_col):
+        q = q.join(VenueProfile, VenueProfile.id == Event.venue_profile_id).where(*criteria)
+        if start:
+            q = q.where(date_col >= start)
+        if end:
+            q = q.where(date_col <= end)
+        if after:
+            q = q.where(tuple_(date_col, id_col) > tuple_(*after))
+        return q
+
+    single = bounded(
+        select(Event.date.label("date"), Event.id.label("event_id")).where(Event.rrule.is_(None)),
+        Event.date,
+        Event.id,
+    )
+    cached = bounded(
+        select(EventOccurrence.date, EventOccurrence.event_id)
+        .join(Event, Event.id == EventOccurrence.event_id)
+        .where(EventOccurrence.date.between(*window)),
+        EventOccurrence.date,
+        EventOccurrence.event_id,
+    )
+    u = union_all(single, cached).subquery()
+    rows = [
+        (d, event_id)
+        for d, event_id in db.execute(
+            select(u.c.date, u.c.event_id).order_by(u.c.date, u.c.event_id).limit(limit + 1)
+        )
+    ]
+
+    lower = max(filter(None, [start, after[0] if after else None]), default=None)
+    page_in_window = (
+        lower is not None
+        and lower >= window[0]
+        and len(rows) > limit
+        and rows[-1][0] <= window[1]
+    )
+    if page_in_window:
+        return rows
+
+    series_q = select(Event.id, Event.rrule, Event.date).where(Event.rrule.isnot(None))
+    series_q = series_q.join(VenueProfile, VenueProfile.id == Event.venue_profile_id).where(*criteria)
+    if end:
+        series_q = series_q.where(Event.date <= end)
+    if lower:
+        series_q = series_q.where(
+            or_(Event.series_until.is_(None), Event.series_until >= lower)
+        )
+    streams = [
+        _uncached(event_id, rrule, dtstart, max(lower or dtstart, dtstart), end, window)
+        for event_id, rrule, dtstart in db.execute(series_q)
+    ]
+    merged = heapq.merge(rows, *streams)
+    if after:
+        merged = (r for r in merged if r > after)
+    return list(islice(merged, limit + 1))
@@ -0,0 +1,82 @@
+from datetime import date
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.artist import ArtistProfile
+from app.models.gig import Gig, GigStatus
+from app.models.venue import VenueProfile
+from app.services.calendar_export import invalidate_gig_feeds
+from app.services.relationship_log import log_relationship_actions
+
+
+def close_out_past_gigs(db: Session, today: date | None = None) -> int:
+    """
+    Move every past-dated upcoming gig to pending_closeout.
+
+    One set-based UPDATE ... FROM ... RETURNING does the transition and hands
+    back what the relationship log needs, which is then bulk-inserted. The
+    caller commits. Returns the number of gigs transitioned.
+    """
+    today = today or date.today()
+    # Core tables rather than ORM entities: ORM-enabled UPDATE drops RETURNING
+    # columns that belong to the joined FROM tables.
+    gigs = Gig.__table__
+    artists = ArtistProfile.__table__
+    venues = VenueProfile.__table__
+    stmt = (
+        update(gigs)
+        .where(
+            gigs.c.status == GigStatus.upcoming,
+            gigs.c.date < today,
+            artists.c.id == gigs.c.artist_profile_id,
+            venues.c.id == gigs.c.venue_profile_id,
+        )
+        .values(status=GigStatus.pending_closeout, version=gigs.c.version + 1)
+        .returning(
+            gigs.c.id,
+            gigs.c.title,
+            gigs.c.date,
+            gigs.c.created_by_user_id,
+            gigs.c.artist_profile_id,
+            artists.c.user_id.label("artist_user_id"),
+            artists.c.name.label("artist_name"),
+            venues.c.user_id.label("venue_user_id"),
+            venues.c.venue_name.label("venue_name"),
+        )
+    )
+    rows = db.execute(stmt).all()
+
+    entries = []
+    for row in rows:
+        # Attribute the transition to the gig's creator, addressed to the other party
+        if row.created_by_user_id == row.artist_user_id:
+            target_user_id, target_name, target_role = (
+                row.venue_user_id, row.venue_name, "venue"
+            )
+        else:
+            target_user_id, target_name, target_role = (
+                row.artist_user_id, row.artist_name, "artist"
+            )
+        entries.append(
+            {
+                "actor_user_id": row.created_by_user_id,
+                "target_user_id": target_user_id,
+                "action": "gig_status_updated",
+                "entity_type": "gig",
+                "entity_id": row.id,
+                "details": {
+                    "gig_title": row.title,
+                    "gig_date": str(row.date),
+                    "status": GigStatus.pending_closeout.value,
+                    "target_name": target_name,
+                    "target_role": target_role,
+                    "automatic": True,
+                },
+            }
+        )
+    log_relationship_actions(db, entries)
+    # Before the scheduler commits; a read racing it is only stale until the
+    # feed cache TTL
+    invalidate_gig_feeds(*{row.artist_profile_id for row in rows})
+    return len(rows)
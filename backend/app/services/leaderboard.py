@@ -0,0 +1,155 @@
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Date, and_, case, cast, delete, func, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.artist_venue_pair import ArtistVenuePair
+from app.models.gig import Gig, GigStatus
+from app.models.profile_monthly_stats import ProfileMonthlyStats
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def refresh_monthly_buckets(db: Session, gigs: Iterable) -> None:
+    """
+    Recompute the profile_monthly_stats buckets touched by ``gigs``.
+
+    ``gigs`` are objects with artist_profile_id, venue_profile_id and date.
+    Each written gig affects exactly one artist bucket and one venue bucket;
+    those are deleted (so a bucket that drops to zero disappears) and rebuilt
+    from that profile-month's gigs inside the caller's transaction.
+    """
+    gigs = list(gigs)
+    db.flush()
+    verified = and_(
+        Gig.artist_confirmed == True,  # noqa: E712
+        Gig.venue_confirmed == True,  # noqa: E712
+    )
+    month_expr = cast(func.date_trunc("month", Gig.date), Date)
+
+    for entity_type, profile_col in (
+        ("artist", Gig.artist_profile_id),
+        ("venue", Gig.venue_profile_id),
+    ):
+        keys = {(getattr(g, profile_col.key), g.date.replace(day=1)) for g in gigs}
+        if not keys:
+            continue
+        profile_ids = sorted({pid for pid, _ in keys})
+        first_month = min(m for _, m in keys)
+        end = _next_month(max(m for _, m in keys))
+
+        db.execute(
+            delete(ProfileMonthlyStats).where(
+                ProfileMonthlyStats.entity_type == entity_type,
+                tuple_(ProfileMonthlyStats.profile_id, ProfileMonthlyStats.month).in_(
+                    sorted(keys)
+                ),
+            )
+        )
+
+        source = (
+            select(
+                literal(entity_type),
+                profile_col,
+                month_expr,
+                func.count(Gig.id),
+                func.count(case((verified, Gig.id))),
+                func.coalesce(func.sum(Gig.attendance), 0),
+                func.count(Gig.attendance),
+                func.coalesce(func.sum(Gig.tickets_sold), 0),
+                func.count(Gig.tickets_sold),
+                func.coalesce(func.sum(Gig.gross_revenue_cents), 0),
+                func.count(Gig.gross_revenue_cents),
+            )
+            .where(
+                profile_col.in_(profile_ids),
+                Gig.date >= first_month,
+                Gig.date < end,
+                Gig.status != GigStatus.cancelled,
+            )
+            .group_by(profile_col, month_expr)
+        )
+        stmt = insert(ProfileMonthlyStats).from_select(
+            [
+                "entity_type",
+                "profile_id",
+                "month",
+                "gig_count",
+                "verified_count",
+                "attendance_sum",
+                "attendance_count",
+                "tickets_sum",
+                "tickets_count",
+                "revenue_sum",
+                "revenue_count",
+            ],
+            source,
+        )
+        # The date range can cover untouched months of the same profiles;
+        # those rows already exist and are simply rewritten with equal values.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["entity_type", "profile_id", "month"],
+            set_={
+                col: stmt.excluded[col]
+                for col in (
+                    "gig_count",
+                    "verified_count",
+                    "attendance_sum",
+                    "attendance_count",
+                    "tickets_sum",
+                    "tickets_count",
+                    "revenue_sum",
+                    "revenue_count",
+                )
+            },
+        )
+        db.execute(stmt)
+
+
+def refresh_artist_venue_pairs(db: Session, gigs: Iterable) -> None:
+    """
+    Recount the artist_venue_pairs rows of ``gigs``' artist/venue pairs, in
+    the caller's transaction. Only creating or cancelling a gig changes
+    them.
+    """
+    pairs = sorted({(g.artist_profile_id, g.venue_profile_id) for g in gigs})
+    if not pairs:
+        return
+    db.flush()
+    db.execute(
+        delete(ArtistVenuePair).where(
+            tuple_(ArtistVenuePair.artist_profile_id, ArtistVenuePair.venue_profile_id).in_(pairs)
+        )
+    )
+    # Served by uq_gig_artist_venue_date
+    source = (
+        select(Gig.artist_profile_id, Gig.venue_profile_id, func.count(Gig.id))
+        .where(
+            tuple_(Gig.artist_profile_id, Gig.venue_profile_id).in_(pairs),
+            Gig.status != GigStatus.cancelled,
+        )
+        .group_by(Gig.artist_profile_id, Gig.venue_profile_id)
+    )
+    db.execute(
+        insert(ArtistVenuePair).from_select(
+            ["artist_profile_id", "venue_profile_id", "gig_count"], source
+        )
+    )
+
+
+def refresh_leaderboards(db: Session) -> int:
+    """
+    Rebuild the leaderboard materialized views from the monthly buckets.
+
+    CONCURRENTLY keeps the old contents readable while the new ones are built,
+    so public leaderboard reads never block on a refresh. The caller commits.
+    """
+    db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_rollup"))
+    db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_cities"))
+    return 0
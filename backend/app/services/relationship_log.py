@@ -1,6 +1,7 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.relationship_log import RelationshipLog
@@ -26,3 +27,25 @@ def log_relationship_action(
         details=details or {},
     )
     db.add(log)
+
+
+def log_relationship_actions(db: Session, entries: list[dict[str, Any]]) -> None:
+    """Bulk-insert many log rows in one multi-row INSERT.
+
+    Each entry takes the same keyword arguments as ``log_relationship_action``.
+    """
+    if not entries:
+        return
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "actor_user_id": e["actor_user_id"],
+            "target_user_id": e["target_user_id"],
+            "action": e["action"],
+            "entity_type": e["entity_type"],
+            "entity_id": e["entity_id"],
+            "details": e.get("details") or {},
+        }
+        for e in entries
+    ]
+    db.execute(insert(RelationshipLog).values(rows))
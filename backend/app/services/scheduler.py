@@ -0,0 +1,133 @@
+"""
+In-process periodic job scheduler.
+
+Each API worker runs the same loop, so every job run is guarded by a
+session-level Postgres advisory lock: one worker does the work and the
+others skip that tick. The lock is held on a connection of its own for the
+whole run, so neither a job's own commits nor the rollback after a failure
+release it before the run is recorded. Each run that executes is recorded in ``job_runs``,
+which ``prune_job_runs`` trims to JOB_RUN_RETENTION_DAYS.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval_seconds: float
+    # Receives an open session and returns the number of rows it affected.
+    # It may commit as it goes (to lease rows before slow network calls, say):
+    # the job's lock is not tied to that session, and no other worker runs
+    # the job until this run returns.
+    func: Callable[[Session], int]
+
+
+_jobs: list[PeriodicJob] = []
+_tasks: list[asyncio.Task] = []
+
+
+def register_job(name: str, interval_seconds: float, func: Callable[[Session], int]) -> None:
+    _jobs.append(PeriodicJob(name=name, interval_seconds=interval_seconds, func=func))
+
+
+@contextmanager
+def _job_lock(name: str) -> Iterator[bool]:
+    """Try the advisory lock for ``name``; yields whether it was taken."""
+    with engine.connect() as conn:
+        key = func.hashtext(name)
+        acquired = conn.execute(select(func.pg_try_advisory_lock(key))).scalar()
+        # Idle, not idle in transaction, while the job runs
+        conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(select(func.pg_advisory_unlock(key)))
+                conn.commit()
+
+
+def run_job_once(job: PeriodicJob) -> bool:
+    """Run ``job`` if no other worker holds its lock. Returns True if it ran."""
+    with _job_lock(job.name) as acquired:
+        if not acquired:
+            return False
+        _run_locked(job)
+        return True
+
+
+def _run_locked(job: PeriodicJob) -> None:
+    db = SessionLocal()
+    try:
+        started_at = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        rows_affected = 0
+        error = None
+        try:
+            rows_affected = job.func(db)
+        except Exception as exc:
+            db.rollback()
+            error = repr(exc)[:500]
+            logger.exception("Scheduled job %s failed", job.name)
+        duration_ms = int((time.perf_counter() - t0) * 1000)
+
+        db.add(
+            JobRun(
+                id=str(uuid.uuid4()),
+                job_name=job.name,
+                started_at=started_at,
+                duration_ms=duration_ms,
+                rows_affected=rows_affected,
+                error=error,
+            )
+        )
+        db.commit()
+        logger.info(
+            "Scheduled job %s: %d rows in %d ms", job.name, rows_affected, duration_ms
+        )
+    finally:
+        db.close()
+
+
+def prune_job_runs(db: Session) -> int:
+    """Delete job_runs older than JOB_RUN_RETENTION_DAYS. The caller commits."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+    result = db.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+    return result.rowcount
+
+
+async def _run_forever(job: PeriodicJob) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(run_job_once, job)
+        except Exception:
+            logger.exception("Scheduled job %s could not run", job.name)
+        await asyncio.sleep(job.interval_seconds)
+
+
+def start_scheduler() -> None:
+    for job in _jobs:
+        _tasks.append(asyncio.create_task(_run_forever(job)))
+
+
+async def stop_scheduler() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
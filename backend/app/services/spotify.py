@@ -1,19 +1,75 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from urllib.parse import urlencode
 
 import httpx
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.models.spotify_connection import SpotifyConnection
 from app.core.config import settings
 from app.core.encryption import decrypt_token, encrypt_token
+from app.db.session import SessionLocal
+from app.services.spotify_metrics import record_snapshot
+
+logger = logging.getLogger(__name__)
 
 SPOTIFY_AUTH_URL = "https://accounts.spotify.com/authorize"
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 SPOTIFY_API_BASE = "https://api.spotify.com/v1"
 SCOPES = "user-read-private user-top-read"
 DATA_TTL_HOURS = 24
+REQUEST_TIMEOUT_SECONDS = 10.0
+# Overall budget for one fetch_and_cache_spotify_data call
+FETCH_BUDGET_SECONDS = 15.0
+
+# Process-wide API budget: SPOTIFY_API_CALLS_PER_MINUTE with bursts of up
+# to API_BURST calls; a 429 is retried after its Retry-After, MAX_ATTEMPTS
+# tries in all
+API_BURST = 20
+MAX_ATTEMPTS = 3
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+
+# /artists?ids= takes at most this many ids per call
+ARTISTS_PER_REQUEST = 50
+# Top tracks, releases and the account profile change slowly; the
+# background refresher refetches them (DETAIL_CALLS per connection) only
+# this often, and artist metadata in /artists?ids= batches every time
+DETAILS_TTL_DAYS = 7
+DETAIL_CALLS = 3
+
+# Background refresher: connections fetched at once, candidates considered
+# per tick, how far ahead of expiry data is refreshed, and how long a
+# failed refresh waits
+REFRESH_CONCURRENCY = 5
+REFRESH_CANDIDATES = 1000
+REFRESH_LEAD_SECONDS = 3600
+REFRESH_RETRY_SECONDS = 900
+
+# Access tokens are refreshed once they expire within this many seconds;
+# the background job renews them TOKEN_REFRESH_AHEAD_SECONDS ahead instead
+TOKEN_MIN_VALIDITY_SECONDS = 60
+TOKEN_REFRESH_AHEAD_SECONDS = 600
+TOKEN_REFRESH_BATCH = 50
+# How long a caller waits for another worker's refresh of the same token
+TOKEN_WAIT_SECONDS = 10.0
+TOKEN_POLL_SECONDS = 0.2
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+# (token, monotonic expiry) of the client-credentials token
+_app_token: tuple[str, float] | None = None
+# In-flight token refreshes per event loop, by connection id
+_token_refreshes: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Task]
+] = weakref.WeakKeyDictionary()
 
 
 def get_authorize_url(state: str) -> str:
@@ -28,147 +84,555 @@ def get_authorize_url(state: str) -> str:
     return f"{SPOTIFY_AUTH_URL}?{urlencode(params)}"
 
 
-def exchange_code_for_tokens(code: str) -> dict[str, Any]:
-    resp = httpx.post(
-        SPOTIFY_TOKEN_URL,
-        data={
-            "grant_type": "authorization_code",
-            "code": code,
-            "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
-            "client_id": settings.SPOTIFY_CLIENT_ID,
-            "client_secret": settings.SPOTIFY_CLIENT_SECRET,
-        },
-        timeout=10.0,
-    )
+def get_client() -> httpx.AsyncClient:
+    """
+    The long-lived Spotify client of the running event loop, so calls reuse
+    pooled keep-alive connections instead of opening one per request.
+
+    Pooled connections belong to the loop that opened them, so the app loop
+    and the refresher's loop each get their own; ``close_client`` closes the
+    current loop's one (the app's at shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return client
+
+
+async def close_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class _TokenBucket:
+    """Call budget shared by every event loop and thread of the process."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        # Take a token, or return how long to wait before trying again
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. for a 429's Retry-After."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+_api_budget = _TokenBucket(settings.SPOTIFY_API_CALLS_PER_MINUTE, API_BURST)
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return max(float(resp.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+async def _request(method: str, url: str, budgeted: bool = True, **kwargs) -> httpx.Response:
+    """
+    Send a Spotify request on the shared client. Web API calls wait for the
+    process-wide budget; a 429 pauses that budget for everyone for its
+    Retry-After and is retried. Raises for any other error status.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        if budgeted:
+            await _api_budget.acquire()
+        resp = await get_client().request(method, url, **kwargs)
+        if resp.status_code != 429 or attempt == MAX_ATTEMPTS - 1:
+            break
+        delay = _retry_after(resp)
+        logger.warning("Spotify rate limited %s, retrying in %.1fs", url, delay)
+        if budgeted:
+            _api_budget.pause(delay)
+        else:
+            await asyncio.sleep(delay)
     resp.raise_for_status()
-    return resp.json()
+    return resp
 
 
-def refresh_access_token(refresh_token: str) -> dict[str, Any]:
-    resp = httpx.post(
+async def _token_request(data: dict[str, Any]) -> dict[str, Any]:
+    # The accounts service is not metered by the Web API budget
+    resp = await _request(
+        "POST",
         SPOTIFY_TOKEN_URL,
+        budgeted=False,
         data={
-            "grant_type": "refresh_token",
-            "refresh_token": refresh_token,
+            **data,
             "client_id": settings.SPOTIFY_CLIENT_ID,
             "client_secret": settings.SPOTIFY_CLIENT_SECRET,
         },
-        timeout=10.0,
     )
-    resp.raise_for_status()
     return resp.json()
 
 
-def _ensure_valid_token(db: Session, conn: SpotifyConnection) -> str:
-    now = datetime.now(timezone.utc)
-    if conn.token_expires_at > now + timedelta(minutes=1):
-        return decrypt_token(conn.access_token)
+async def exchange_code_for_tokens(code: str) -> dict[str, Any]:
+    return await _token_request(
+        {
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
+        }
+    )
 
-    token_data = refresh_access_token(decrypt_token(conn.refresh_token))
+
+async def refresh_access_token(refresh_token: str) -> dict[str, Any]:
+    return await _token_request({"grant_type": "refresh_token", "refresh_token": refresh_token})
+
+
+async def get_app_token() -> str:
+    """
+    A client-credentials token for public catalog data (artists, tracks,
+    albums), cached until shortly before it expires.
+    """
+    global _app_token
+    if _app_token and _app_token[1] > time.monotonic() + TOKEN_MIN_VALIDITY_SECONDS:
+        return _app_token[0]
+    token_data = await _token_request({"grant_type": "client_credentials"})
+    _app_token = (token_data["access_token"], time.monotonic() + token_data["expires_in"])
+    return _app_token[0]
+
+
+def _apply_token_data(conn: SpotifyConnection, token_data: dict[str, Any], now: datetime) -> None:
     conn.access_token = encrypt_token(token_data["access_token"])
     conn.token_expires_at = now + timedelta(seconds=token_data["expires_in"])
+    # Spotify may rotate the refresh token; the old one stops working
     if "refresh_token" in token_data:
         conn.refresh_token = encrypt_token(token_data["refresh_token"])
-    db.commit()
-    return token_data["access_token"]
 
 
-def _spotify_get(access_token: str, path: str) -> dict:
-    resp = httpx.get(
+def _token_fresh(conn: SpotifyConnection, now: datetime) -> bool:
+    return conn.token_expires_at > now + timedelta(seconds=TOKEN_MIN_VALIDITY_SECONDS)
+
+
+def _lock_connection(db: Session, connection_id: str) -> SpotifyConnection | None:
+    return db.execute(
+        select(SpotifyConnection)
+        .where(SpotifyConnection.id == connection_id)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+
+async def _refresh_token_single_flight(connection_id: str) -> str:
+    """
+    Refresh one connection's token so that only one caller anywhere hits
+    the token endpoint.
+
+    The row is taken with SELECT ... FOR UPDATE SKIP LOCKED in a session of
+    its own, held across the token call and committed with the new tokens.
+    A worker that finds the row locked does not queue behind the lock: it
+    polls until the holder's new token is visible. The session is
+    synchronous, so each database step runs in a worker thread.
+    """
+    deadline = time.monotonic() + TOKEN_WAIT_SECONDS
+    while True:
+        db = SessionLocal()
+        try:
+            conn = await asyncio.to_thread(_lock_connection, db, connection_id)
+            if conn is not None:
+                now = datetime.now(timezone.utc)
+                # Someone may have refreshed it since the caller read the row
+                if not _token_fresh(conn, now):
+                    token_data = await refresh_access_token(decrypt_token(conn.refresh_token))
+                    _apply_token_data(conn, token_data, now)
+                access_token = decrypt_token(conn.access_token)
+                await asyncio.to_thread(db.commit)
+                return access_token
+
+            # Locked: another worker is refreshing it right now
+            conn = await asyncio.to_thread(db.get, SpotifyConnection, connection_id)
+            if conn is None:
+                raise LookupError(f"Spotify connection {connection_id} no longer exists")
+            if _token_fresh(conn, datetime.now(timezone.utc)):
+                return decrypt_token(conn.access_token)
+        finally:
+            await asyncio.to_thread(db.close)
+        if time.monotonic() > deadline:
+            raise asyncio.TimeoutError("Timed out waiting for a Spotify token refresh")
+        await asyncio.sleep(TOKEN_POLL_SECONDS)
+
+
+async def _ensure_valid_token(db: Session, conn: SpotifyConnection) -> str:
+    if _token_fresh(conn, datetime.now(timezone.utc)):
+        return decrypt_token(conn.access_token)
+
+    # Callers on this loop share one in-flight refresh per connection;
+    # shielded so one caller's timeout does not cancel it for the others.
+    inflight = _token_refreshes.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(conn.id)
+    if task is None:
+        task = inflight[conn.id] = asyncio.create_task(_refresh_token_single_flight(conn.id))
+        task.add_done_callback(lambda _t, cid=conn.id: inflight.pop(cid, None))
+    access_token = await asyncio.shield(task)
+    # The new tokens were committed by another session
+    db.expire(conn, ["access_token", "refresh_token", "token_expires_at"])
+    return access_token
+
+
+async def spotify_get(access_token: str, path: str, params: dict[str, str] | None = None) -> dict:
+    resp = await _request(
+        "GET",
         f"{SPOTIFY_API_BASE}{path}",
         headers={"Authorization": f"Bearer {access_token}"},
-        timeout=10.0,
+        params=params,
     )
-    resp.raise_for_status()
     return resp.json()
 
 
-def fetch_and_cache_spotify_data(db: Session, conn: SpotifyConnection) -> dict:
-    access_token = _ensure_valid_token(db, conn)
+async def fetch_artists(access_token: str, artist_ids: list[str]) -> dict[str, dict]:
+    """
+    Artist objects by id, fetched ARTISTS_PER_REQUEST at a time through
+    /artists?ids=. Ids whose batch failed, or that Spotify does not know,
+    are missing from the result.
+    """
+    chunks = [
+        artist_ids[i : i + ARTISTS_PER_REQUEST]
+        for i in range(0, len(artist_ids), ARTISTS_PER_REQUEST)
+    ]
+    results = await asyncio.gather(
+        *(spotify_get(access_token, "/artists", {"ids": ",".join(c)}) for c in chunks),
+        return_exceptions=True,
+    )
+    artists: dict[str, dict] = {}
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            logger.warning("Spotify artist batch of %d failed: %r", len(chunk), result)
+            continue
+        for artist in result.get("artists", []):
+            if artist:
+                artists[artist["id"]] = artist
+    return artists
 
-    data: dict[str, Any] = {}
 
-    me = _spotify_get(access_token, "/me")
-    data["display_name"] = me.get("display_name")
-    data["spotify_url"] = me.get("external_urls", {}).get("spotify")
-    if conn.spotify_data and "monthly_listeners" in conn.spotify_data:
-        data["monthly_listeners"] = conn.spotify_data.get("monthly_listeners")
+def _artist_fields(artist: dict) -> dict[str, Any]:
+    return {
+        "followers": artist.get("followers", {}).get("total"),
+        "genres": artist.get("genres", []),
+        "popularity": artist.get("popularity"),
+        "images": artist.get("images", []),
+        "artist_name": artist.get("name"),
+        "artist_url": artist.get("external_urls", {}).get("spotify"),
+    }
 
-    if conn.spotify_artist_id:
-        artist = _spotify_get(access_token, f"/artists/{conn.spotify_artist_id}")
-        data["followers"] = artist.get("followers", {}).get("total")
-        data["genres"] = artist.get("genres", [])
-        data["popularity"] = artist.get("popularity")
-        data["images"] = artist.get("images", [])
-        data["artist_name"] = artist.get("name")
-        data["artist_url"] = artist.get("external_urls", {}).get("spotify")
 
-        top_tracks_resp = _spotify_get(
-            access_token,
-            f"/artists/{conn.spotify_artist_id}/top-tracks?market=US",
+def _tracks(top_tracks_resp: dict) -> list[dict[str, Any]]:
+    tracks = []
+    for t in top_tracks_resp.get("tracks", [])[:10]:
+        tracks.append(
+            {
+                "name": t.get("name"),
+                "preview_url": t.get("preview_url"),
+                "album_name": t.get("album", {}).get("name"),
+                "album_image": (
+                    t.get("album", {}).get("images", [{}])[0].get("url")
+                    if t.get("album", {}).get("images")
+                    else None
+                ),
+                "duration_ms": t.get("duration_ms"),
+                "track_url": t.get("external_urls", {}).get("spotify"),
+            }
         )
-        tracks = []
-        for t in top_tracks_resp.get("tracks", [])[:10]:
-            tracks.append(
-                {
-                    "name": t.get("name"),
-                    "preview_url": t.get("preview_url"),
-                    "album_name": t.get("album", {}).get("name"),
-                    "album_image": (
-                        t.get("album", {}).get("images", [{}])[0].get("url")
-                        if t.get("album", {}).get("images")
-                        else None
-                    ),
-                    "duration_ms": t.get("duration_ms"),
-                    "track_url": t.get("external_urls", {}).get("spotify"),
-                }
-            )
-        data["top_tracks"] = tracks
+    return tracks
+
 
-        albums_resp = _spotify_get(
+def _releases(albums_resp: dict) -> list[dict[str, Any]]:
+    seen_albums: set[str] = set()
+    releases = []
+    for album in albums_resp.get("items", []):
+        album_id = album.get("id")
+        if not album_id or album_id in seen_albums:
+            continue
+        seen_albums.add(album_id)
+        releases.append(
+            {
+                "name": album.get("name"),
+                "release_date": album.get("release_date"),
+                "release_date_precision": album.get("release_date_precision"),
+                "album_type": album.get("album_type"),
+                "image": (
+                    album.get("images", [{}])[0].get("url")
+                    if album.get("images")
+                    else None
+                ),
+                "url": album.get("external_urls", {}).get("spotify"),
+            }
+        )
+    return releases[:8]
+
+
+async def _fetch_details(access_token: str, artist_id: str | None) -> dict[str, Any]:
+    # The account profile, plus the artist's top tracks and releases
+    if not artist_id:
+        me = await spotify_get(access_token, "/me")
+        return {
+            "display_name": me.get("display_name"),
+            "spotify_url": me.get("external_urls", {}).get("spotify"),
+            "followers": None,
+            "top_tracks": [],
+            "recent_releases": [],
+        }
+    me, top_tracks_resp, albums_resp = await asyncio.gather(
+        spotify_get(access_token, "/me"),
+        spotify_get(access_token, f"/artists/{artist_id}/top-tracks", {"market": "US"}),
+        spotify_get(
             access_token,
-            f"/artists/{conn.spotify_artist_id}/albums?include_groups=album,single&market=US&limit=10",
+            f"/artists/{artist_id}/albums",
+            {"include_groups": "album,single", "market": "US", "limit": "10"},
+        ),
+    )
+    return {
+        "display_name": me.get("display_name"),
+        "spotify_url": me.get("external_urls", {}).get("spotify"),
+        "top_tracks": _tracks(top_tracks_resp),
+        "recent_releases": _releases(albums_resp),
+    }
+
+
+def _store(db: Session, conn: SpotifyConnection, data: dict[str, Any], now: datetime) -> None:
+    conn.spotify_data = data
+    conn.data_fetched_at = now
+    conn.refresh_due_at = now + timedelta(hours=DATA_TTL_HOURS)
+    conn.followers = data.get("followers")
+    conn.popularity = data.get("popularity")
+    conn.genres = data.get("genres") or []
+    record_snapshot(db, conn.artist_profile_id, data, now.date())
+
+
+async def fetch_and_cache_spotify_data(db: Session, conn: SpotifyConnection) -> dict:
+    """
+    Refetch the connection's profile, artist, top tracks and releases.
+
+    Once the token is known the four API calls run concurrently, and the
+    whole fetch, token refresh included, must finish within
+    FETCH_BUDGET_SECONDS or it raises TimeoutError.
+    """
+    return await asyncio.wait_for(_fetch_and_cache(db, conn), FETCH_BUDGET_SECONDS)
+
+
+async def _fetch_and_cache(db: Session, conn: SpotifyConnection) -> dict:
+    access_token = await _ensure_valid_token(db, conn)
+
+    data: dict[str, Any] = {}
+    if conn.spotify_data and "monthly_listeners" in conn.spotify_data:
+        data["monthly_listeners"] = conn.spotify_data.get("monthly_listeners")
+
+    artist_id = conn.spotify_artist_id
+    if artist_id:
+        details, artist = await asyncio.gather(
+            _fetch_details(access_token, artist_id),
+            spotify_get(access_token, f"/artists/{artist_id}"),
         )
-        seen_albums: set[str] = set()
-        releases = []
-        for album in albums_resp.get("items", []):
-            album_id = album.get("id")
-            if not album_id or album_id in seen_albums:
-                continue
-            seen_albums.add(album_id)
-            releases.append(
-                {
-                    "name": album.get("name"),
-                    "release_date": album.get("release_date"),
-                    "release_date_precision": album.get("release_date_precision"),
-                    "album_type": album.get("album_type"),
-                    "image": (
-                        album.get("images", [{}])[0].get("url")
-                        if album.get("images")
-                        else None
-                    ),
-                    "url": album.get("external_urls", {}).get("spotify"),
-                }
-            )
-        data["recent_releases"] = releases[:8]
+        data.update(_artist_fields(artist))
     else:
-        data["monthly_listeners"] = data.get("monthly_listeners")
-        data["followers"] = None
-        data["top_tracks"] = []
-        data["recent_releases"] = []
+        details = await _fetch_details(access_token, None)
+        data.setdefault("monthly_listeners", None)
+    data.update(details)
 
-    conn.spotify_data = data
-    conn.data_fetched_at = datetime.now(timezone.utc)
-    db.commit()
+    await asyncio.to_thread(_store_fetched, db, conn, data, datetime.now(timezone.utc))
     return data
 
 
-def get_spotify_data_if_fresh(db: Session, conn: SpotifyConnection) -> dict:
-    now = datetime.now(timezone.utc)
-    if (
+def _store_fetched(db: Session, conn: SpotifyConnection, data: dict[str, Any], now: datetime) -> None:
+    _store(db, conn, data, now)
+    conn.details_fetched_at = now
+    db.commit()
+    # Reload here rather than lazily when the caller reads it on the loop
+    db.refresh(conn)
+
+
+def is_stale(conn: SpotifyConnection, now: datetime | None = None) -> bool:
+    now = now or datetime.now(timezone.utc)
+    return not (
         conn.data_fetched_at
         and conn.spotify_data
         and (now - conn.data_fetched_at).total_seconds() < DATA_TTL_HOURS * 3600
-    ):
-        return conn.spotify_data
-    return fetch_and_cache_spotify_data(db, conn)
+    )
+
+
+def request_refresh(db: Session, conn: SpotifyConnection) -> None:
+    """Queue ``conn`` for the background refresher's next tick."""
+    now = datetime.now(timezone.utc)
+    if conn.refresh_due_at is None or conn.refresh_due_at > now:
+        conn.refresh_due_at = now
+        db.commit()
+
+
+def _details_stale(conn: SpotifyConnection, now: datetime) -> bool:
+    return (
+        conn.details_fetched_at is None
+        or now - conn.details_fetched_at > timedelta(days=DETAILS_TTL_DAYS)
+    )
+
+
+async def _refresh_all(db: Session, conns: list[SpotifyConnection], now: datetime) -> int:
+    try:
+        artists = await fetch_artists(
+            await get_app_token(),
+            sorted({c.spotify_artist_id for c in conns if c.spotify_artist_id}),
+        )
+        sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+        async def one(conn: SpotifyConnection) -> bool:
+            async with sem:
+                try:
+                    data = dict(conn.spotify_data or {})
+                    if conn.spotify_artist_id:
+                        artist = artists.get(conn.spotify_artist_id)
+                        if artist is None:
+                            return False
+                        data.update(_artist_fields(artist))
+                    refresh_details = _details_stale(conn, now)
+                    if refresh_details:
+                        access_token = await _ensure_valid_token(db, conn)
+                        data.update(await _fetch_details(access_token, conn.spotify_artist_id))
+                    _store(db, conn, data, now)
+                    if refresh_details:
+                        conn.details_fetched_at = now
+                    db.commit()
+                    return True
+                except Exception:
+                    # The lease already pushed refresh_due_at out; retry then
+                    logger.warning("Spotify refresh of %s failed", conn.id, exc_info=True)
+                    db.rollback()
+                    return False
+
+        return sum(await asyncio.gather(*(one(c) for c in conns)))
+    finally:
+        await close_client()
+
+
+def refresh_due_connections(db: Session) -> int:
+    """
+    Refresh the connections whose data is due (queued by a read of stale
+    data) or about to expire, earliest first.
+
+    Artist metadata for the whole batch comes from /artists?ids=, one call
+    per ARTISTS_PER_REQUEST artists; only connections whose details are
+    older than DETAILS_TTL_DAYS cost DETAIL_CALLS calls of their own. Each
+    tick takes as many connections as fit in SPOTIFY_REFRESH_CALLS_PER_MINUTE
+    for one interval. Picked rows are leased with FOR UPDATE SKIP LOCKED and
+    their refresh_due_at pushed out by REFRESH_RETRY_SECONDS before any
+    fetch, so no two workers take the same row and a failed refresh is
+    retried later rather than on every tick. The lease commit leaves the
+    scheduler's job lock in place, so one worker at a time spends the budget
+    and the per-process API budget is also the global one. Returns the
+    number refreshed.
+    """
+    if not settings.SPOTIFY_CLIENT_ID:
+        return 0
+    budget = settings.SPOTIFY_REFRESH_CALLS_PER_MINUTE * settings.SPOTIFY_REFRESH_INTERVAL_SECONDS / 60
+
+    now = datetime.now(timezone.utc)
+    candidates = (
+        db.execute(
+            select(SpotifyConnection)
+            .where(SpotifyConnection.refresh_due_at <= now + timedelta(seconds=REFRESH_LEAD_SECONDS))
+            .order_by(SpotifyConnection.refresh_due_at)
+            .limit(REFRESH_CANDIDATES)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    conns: list[SpotifyConnection] = []
+    artist_ids: set[str] = set()
+    detail_calls = 0
+    for conn in candidates:
+        ids = artist_ids | {conn.spotify_artist_id} if conn.spotify_artist_id else artist_ids
+        calls = detail_calls + (DETAIL_CALLS if _details_stale(conn, now) else 0)
+        if calls + math.ceil(len(ids) / ARTISTS_PER_REQUEST) > budget:
+            break
+        conns.append(conn)
+        artist_ids, detail_calls = ids, calls
+    if not conns:
+        db.rollback()
+        return 0
+    for conn in conns:
+        conn.refresh_due_at = now + timedelta(seconds=REFRESH_RETRY_SECONDS)
+    db.commit()
+
+    # The scheduler runs jobs on a worker thread, so drive a loop here
+    return asyncio.run(_refresh_all(db, conns, now))
+
+
+async def _refresh_tokens(conns: list[SpotifyConnection], now: datetime) -> int:
+    sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    async def one(conn: SpotifyConnection) -> bool:
+        async with sem:
+            try:
+                token_data = await refresh_access_token(decrypt_token(conn.refresh_token))
+            except Exception:
+                logger.warning("Spotify token refresh of %s failed", conn.id, exc_info=True)
+                return False
+            _apply_token_data(conn, token_data, now)
+            return True
+
+    try:
+        return sum(await asyncio.gather(*(one(c) for c in conns)))
+    finally:
+        await close_client()
+
+
+def refresh_expiring_tokens(db: Session) -> int:
+    """
+    Renew access tokens that expire within TOKEN_REFRESH_AHEAD_SECONDS for
+    connections the data refresher is about to fetch with a user token,
+    i.e. whose details will be older than DETAILS_TTL_DAYS by then, so that
+    fetch never waits on the token endpoint. The rest only need the app
+    token.
+
+    Rows are locked FOR UPDATE SKIP LOCKED until the scheduler commits, the
+    same guard request-path refreshes take, so each token is refreshed once.
+    Returns the number renewed.
+    """
+    now = datetime.now(timezone.utc)
+    due_by = now + timedelta(seconds=REFRESH_LEAD_SECONDS)
+    conns = (
+        db.execute(
+            select(SpotifyConnection)
+            .where(
+                SpotifyConnection.token_expires_at
+                < now + timedelta(seconds=TOKEN_REFRESH_AHEAD_SECONDS),
+                SpotifyConnection.refresh_due_at <= due_by,
+                or_(
+                    SpotifyConnection.details_fetched_at.is_(None),
+                    SpotifyConnection.details_fetched_at
+                    < due_by - timedelta(days=DETAILS_TTL_DAYS),
+                ),
+            )
+            .order_by(SpotifyConnection.token_expires_at)
+            .limit(TOKEN_REFRESH_BATCH)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    if not conns:
+        return 0
+    # The scheduler runs jobs on a worker thread, so drive a loop here
+    return asyncio.run(_refresh_tokens(conns, now))
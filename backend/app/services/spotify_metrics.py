@@ -0,0 +1,155 @@
+"""
+Spotify metrics history (followers, popularity, monthly listeners).
+
+Every refresh upserts the artist's point for the day. A daily job folds
+points older than DAILY_RETENTION_DAYS into one per ISO week, so an artist
+costs at most ~90 + 52 rows a year.
+"""
+
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import Date, case, cast, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.spotify_metric_point import SpotifyMetricPoint
+
+DAILY_RETENTION_DAYS = 90
+# Each run folds only the days this far behind the cutoff: everything older
+# was folded by earlier runs, so the job never rescans the weekly history.
+# Covers the job missing a week of runs.
+FOLD_WINDOW_DAYS = 14
+METRICS = ("followers", "popularity", "monthly_listeners")
+
+
+def record_snapshot(db: Session, artist_profile_id: str, data: dict[str, Any], day: date) -> None:
+    """Upsert the day's point from freshly fetched spotify_data. The caller commits."""
+    values = {m: data.get(m) for m in METRICS}
+    if all(v is None for v in values.values()):
+        return
+    stmt = insert(SpotifyMetricPoint).values(artist_profile_id=artist_profile_id, day=day, **values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["artist_profile_id", "day"],
+            set_={m: stmt.excluded[m] for m in METRICS},
+        )
+    )
+
+
+def downsample_metric_points(db: Session) -> int:
+    """
+    Fold daily points older than DAILY_RETENTION_DAYS into weekly ones.
+
+    Each week's point, dated its Monday, takes the values of the latest
+    point of that week (these are levels, not counts). Only days within
+    FOLD_WINDOW_DAYS of the cutoff are read. Idempotent: a week straddling
+    the cutoff is folded again as its later days age out. The caller
+    commits. Returns the number of daily points removed.
+    """
+    cutoff = date.today() - timedelta(days=DAILY_RETENTION_DAYS)
+    window = SpotifyMetricPoint.day.between(
+        cutoff - timedelta(days=FOLD_WINDOW_DAYS), cutoff - timedelta(days=1)
+    )
+    week = cast(func.date_trunc("week", SpotifyMetricPoint.day), Date)
+
+    ranked = (
+        select(
+            SpotifyMetricPoint.artist_profile_id,
+            week.label("week"),
+            *(getattr(SpotifyMetricPoint, m) for m in METRICS),
+            func.row_number()
+            .over(
+                partition_by=(SpotifyMetricPoint.artist_profile_id, week),
+                order_by=SpotifyMetricPoint.day.desc(),
+            )
+            .label("pos"),
+        )
+        # Weeks already reduced to their Monday point are left alone
+        .where(
+            window,
+            tuple_(SpotifyMetricPoint.artist_profile_id, week).in_(
+                select(SpotifyMetricPoint.artist_profile_id, week).where(
+                    window, SpotifyMetricPoint.day != week
+                )
+            ),
+        )
+        .subquery()
+    )
+    latest_in_week = select(
+        ranked.c.artist_profile_id, ranked.c.week, *(ranked.c[m] for m in METRICS)
+    ).where(ranked.c.pos == 1)
+    stmt = insert(SpotifyMetricPoint).from_select(
+        ["artist_profile_id", "day", *METRICS], latest_in_week
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["artist_profile_id", "day"],
+            set_={m: stmt.excluded[m] for m in METRICS},
+        )
+    )
+    result = db.execute(
+        delete(SpotifyMetricPoint).where(window, SpotifyMetricPoint.day != week)
+    )
+    return result.rowcount
+
+
+def metric_points(db: Session, artist_profile_id: str, since: date) -> list[SpotifyMetricPoint]:
+    return (
+        db.execute(
+            select(SpotifyMetricPoint)
+            .where(
+                SpotifyMetricPoint.artist_profile_id == artist_profile_id,
+                SpotifyMetricPoint.day >= since,
+            )
+            .order_by(SpotifyMetricPoint.day)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def metric_growth(db: Session, artist_profile_id: str, since: date) -> dict[str, dict | None]:
+    """
+    Per metric, its first and last known values since ``since`` and the
+    growth between them. The endpoints come from one query over the
+    window's points; a metric with fewer than two points maps to None.
+    """
+    day = SpotifyMetricPoint.day
+    columns = []
+    for m in METRICS:
+        col = getattr(SpotifyMetricPoint, m)
+        known_day = case((col.isnot(None), day))
+        # Points without the metric sort last either way
+        oldest = {"order_by": (col.is_(None), day)}
+        newest = {"order_by": (col.is_(None), day.desc())}
+        columns += [
+            func.first_value(col).over(**oldest).label(f"{m}_start"),
+            func.first_value(col).over(**newest).label(f"{m}_end"),
+            func.first_value(known_day, type_=Date).over(**oldest).label(f"{m}_first_day"),
+            func.first_value(known_day, type_=Date).over(**newest).label(f"{m}_last_day"),
+        ]
+    row = db.execute(
+        select(*columns)
+        .where(SpotifyMetricPoint.artist_profile_id == artist_profile_id, day >= since)
+        .limit(1)
+    ).first()
+
+    growth: dict[str, dict | None] = {}
+    for m in METRICS:
+        if row is None or row._mapping[f"{m}_first_day"] == row._mapping[f"{m}_last_day"]:
+            growth[m] = None
+            continue
+        start, end = row._mapping[f"{m}_start"], row._mapping[f"{m}_end"]
+        first_day, last_day = row._mapping[f"{m}_first_day"], row._mapping[f"{m}_last_day"]
+        change = end - start
+        growth[m] = {
+            "start": start,
+            "end": end,
+            "first_day": first_day,
+            "last_day": last_day,
+            "change": change,
+            "growth_pct": change * 100.0 / start if start else None,
+            "per_day": change / (last_day - first_day).days,
+        }
+    return growth
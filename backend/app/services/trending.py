@@ -0,0 +1,99 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import delete, extract, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.trending_score import TrendingScore
+
+# Points per event, before decay
+VERIFIED_GIG_WEIGHT = 5.0
+ATTENDANCE_WEIGHT = 1.0  # times ln(1 + attendance)
+BOOKMARK_WEIGHT = 1.0
+MATCH_WEIGHT = 2.0
+
+# Rows whose decayed score falls below this are dropped by the prune job
+PRUNE_BELOW_SCORE = 0.01
+
+DECAY_RATE = math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)  # per second
+
+
+def rank_key_at(score: float, at: datetime) -> float:
+    return math.log(score) + DECAY_RATE * at.timestamp()
+
+
+def decayed_score(rank_key: float, now: datetime | None = None) -> float:
+    """A stored rank_key's score as of ``now``."""
+    now = now or datetime.now(timezone.utc)
+    return math.exp(rank_key - DECAY_RATE * now.timestamp())
+
+
+def verified_gig_weight(attendance: int | None) -> float:
+    return VERIFIED_GIG_WEIGHT + ATTENDANCE_WEIGHT * math.log1p(attendance or 0)
+
+
+def record_trending(
+    db: Session,
+    bumps: Iterable[tuple[str, str, float]],
+    now: datetime | None = None,
+) -> None:
+    """
+    Add (entity_type, profile_id, points) bumps to the trending scores.
+
+    Each profile's row is decayed to the later of its stored time and ``now``
+    and the new points are added, all inside one INSERT ... ON CONFLICT, so
+    nothing is ever recomputed from history. Bumps for the same profile are
+    summed first; rows are written in key order so concurrent writers lock
+    them in the same order. The caller commits.
+    """
+    totals: dict[tuple[str, str], float] = defaultdict(float)
+    for entity_type, profile_id, points in bumps:
+        if profile_id and points > 0:
+            totals[(entity_type, profile_id)] += points
+    if not totals:
+        return
+
+    now = now or datetime.now(timezone.utc)
+    rows = [
+        {
+            "entity_type": entity_type,
+            "profile_id": profile_id,
+            "score": points,
+            "updated_at": now,
+            "rank_key": rank_key_at(points, now),
+        }
+        for (entity_type, profile_id), points in sorted(totals.items())
+    ]
+
+    stmt = insert(TrendingScore).values(rows)
+    new = stmt.excluded
+    # Rows can arrive slightly out of order across transactions, so decay
+    # both sides to whichever timestamp is later.
+    at = func.greatest(TrendingScore.updated_at, new.updated_at)
+
+    def decayed_to_at(score, since):
+        return score * func.exp(-DECAY_RATE * extract("epoch", at - since))
+
+    score = decayed_to_at(TrendingScore.score, TrendingScore.updated_at) + decayed_to_at(
+        new.score, new.updated_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["entity_type", "profile_id"],
+        set_={
+            "score": score,
+            "updated_at": at,
+            "rank_key": func.ln(score) + DECAY_RATE * extract("epoch", at),
+        },
+    )
+    db.execute(stmt)
+
+
+def prune_trending_scores(db: Session) -> int:
+    """Delete rows that have decayed to noise. The caller commits."""
+    cutoff = rank_key_at(PRUNE_BELOW_SCORE, datetime.now(timezone.utc))
+    result = db.execute(delete(TrendingScore).where(TrendingScore.rank_key < cutoff))
+    return result.rowcount
@@ -0,0 +1,79 @@
+"""
+Venue coordinates.
+
+Venues store the latitude and longitude of their zip code, so a radius
+filter is a bounding-box query on venue_profiles instead of a zip lookup per
+venue per request. A scheduled job resolves venues whose zip code has not
+been geocoded yet, GEOCODE_BATCH per tick with at most GEOCODE_CONCURRENCY
+lookups in flight. Venues whose lookup failed are left pending and retried
+on a later tick.
+"""
+
+import asyncio
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.zipcode import ZipCodeLookupError, ZipCodeResult, fetch_zipcode
+from app.models.venue import VenueProfile
+
+GEOCODE_BATCH = 200
+GEOCODE_CONCURRENCY = 8
+
+
+async def _lookup_all(zip_codes: list[str]) -> dict[str, ZipCodeResult | None]:
+    """Results for the zip codes that resolved or are unknown; failed lookups are left out."""
+    sem = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+    results: dict[str, ZipCodeResult | None] = {}
+
+    async def one(zip_code: str) -> None:
+        async with sem:
+            try:
+                results[zip_code] = await fetch_zipcode(zip_code)
+            except ZipCodeLookupError:
+                pass
+
+    await asyncio.gather(*(one(z) for z in zip_codes))
+    return results
+
+
+def geocode_venues(db: Session) -> int:
+    """
+    Resolve coordinates for up to GEOCODE_BATCH venues whose zip code changed
+    since it was last geocoded. Unknown zip codes are marked geocoded without
+    coordinates. Returns the number of venues updated. The caller commits.
+
+    Runs from the scheduler's worker thread, so it drives its own event loop
+    for the lookups.
+    """
+    pending = db.execute(
+        select(VenueProfile.id, VenueProfile.zip_code)
+        .where(
+            VenueProfile.zip_code.isnot(None),
+            or_(
+                VenueProfile.geocoded_zip.is_(None),
+                VenueProfile.geocoded_zip != VenueProfile.zip_code,
+            ),
+        )
+        .limit(GEOCODE_BATCH)
+    ).all()
+    if not pending:
+        return 0
+
+    coords = asyncio.run(_lookup_all(sorted({zip_code for _, zip_code in pending})))
+    resolved = [(venue_id, zip_code) for venue_id, zip_code in pending if zip_code in coords]
+    for venue_id, zip_code in resolved:
+        c = coords[zip_code]
+        db.execute(
+            update(VenueProfile)
+            # The zip code may have changed again while we looked it up
+            .where(VenueProfile.id == venue_id, VenueProfile.zip_code == zip_code)
+            .values(
+                latitude=c.lat if c else None,
+                longitude=c.lng if c else None,
+                geocoded_zip=zip_code,
+                # Not a profile edit
+                updated_at=VenueProfile.updated_at,
+            )
+        )
+    return len(resolved)
@@ -0,0 +1,122 @@
+"""
+Shared fixtures.
+
+The app targets Postgres; tests run against an in-memory SQLite database
+with the few Postgres functions its SQL uses registered on each connection.
+What only Postgres does (row locks, for instance) is asserted on the
+statements the app emits, rendered for Postgres by the ``statements``
+fixture.
+"""
+
+import os
+
+# Before anything imports app.core.config
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+from datetime import date  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import Date, create_engine, event  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlalchemy.sql.elements import Cast  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.api.deps import get_db  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def _date_trunc(unit: str, value) -> str | None:
+    if value is None:
+        return None
+    d = date.fromisoformat(str(value)[:10])
+    if unit == "month":
+        d = d.replace(day=1)
+    elif unit == "week":
+        d = date.fromordinal(d.toordinal() - d.weekday())
+    return d.isoformat()
+
+
+def _register_pg_functions(dbapi_connection, connection_record) -> None:
+    dbapi_connection.create_function("date_trunc", 2, _date_trunc)
+
+
+@compiles(Cast, "sqlite")
+def _cast_on_sqlite(element, compiler, **kw) -> str:
+    # SQLite stores dates as ISO strings, which is what date_trunc returns;
+    # CAST(... AS DATE) would turn them into a number
+    if isinstance(element.type, Date):
+        return compiler.process(element.clause, **kw)
+    return compiler.visit_cast(element, **kw)
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(eng, "connect", _register_pg_functions)
+    Base.metadata.create_all(eng)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def auth():
+    """``auth(user_id)`` -> request headers authenticating as that user."""
+
+    def headers(user_id: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    return headers
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed on ``engine`` from here on, rendered for Postgres."""
+    recorded: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        compiled = context.compiled if context is not None else None
+        if compiled is not None and compiled.statement is not None:
+            statement = str(compiled.statement.compile(dialect=postgresql.dialect()))
+        recorded.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
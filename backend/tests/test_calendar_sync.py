@@ -0,0 +1,150 @@
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.config import settings
+from app.models.calendar_feed import CalendarFeed
+from app.models.event import Event
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services.calendar_sync import sync_calendar_feeds
+
+
+def _ics(*events: tuple[str, str, str]) -> bytes:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//test//EN"]
+    for uid, day, summary in events:
+        lines += ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTART;VALUE=DATE:{day}", f"SUMMARY:{summary}", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode()
+
+
+class FeedServer:
+    """A local stand-in for a venue's calendar host, serving one feed."""
+
+    def __init__(self) -> None:
+        self.body = b""
+        self.etag = '"v1"'
+        self.requests: list[dict[str, str]] = []
+        self.on_request = lambda: None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.requests.append(dict(self.headers))
+                server.on_request()
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/calendar")
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, host: str = "127.0.0.1") -> str:
+        return f"http://{host}:{self.port}/calendar.ics"
+
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+@pytest.fixture
+def add_feed(db):
+    db.add(User(id="venue-user", email="venue@example.com", password_hash="x", role=UserRole.venue))
+    db.add(VenueProfile(id="venue-1", user_id="venue-user", venue_name="The Venue"))
+    db.commit()
+
+    def add(url: str) -> CalendarFeed:
+        feed = CalendarFeed(
+            id="feed-1",
+            venue_profile_id="venue-1",
+            url=url,
+            next_sync_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+        db.add(feed)
+        db.commit()
+        return feed
+
+    return add
+
+
+@pytest.fixture
+def allow_private(monkeypatch):
+    monkeypatch.setattr(settings, "CALENDAR_FEEDS_ALLOW_PRIVATE_HOSTS", True)
+
+
+def _titles(db) -> list[str]:
+    return sorted(t for (t,) in db.query(Event.title).filter(Event.source_feed_id == "feed-1"))
+
+
+def test_sync_applies_feed_changes(db, feed_server, add_feed, allow_private):
+    feed = add_feed(feed_server.url())
+    feed_server.body = _ics(("a", "20260301", "Open mic"), ("b", "20260302", "Jazz night"))
+    open_during_fetch: list[bool] = []
+    feed_server.on_request = lambda: open_during_fetch.append(db.in_transaction())
+
+    assert sync_calendar_feeds(db) == 2
+    assert open_during_fetch == [False]
+    assert _titles(db) == ["Jazz night", "Open mic"]
+    db.refresh(feed)
+    assert feed.etag == '"v1"'
+    assert feed.failure_count == 0
+
+    # Unchanged: the validator comes back and nothing is rewritten
+    later = datetime.now(timezone.utc) + timedelta(days=1)
+    assert sync_calendar_feeds(db, now=later) == 0
+    assert feed_server.requests[-1]["If-None-Match"] == '"v1"'
+
+    feed_server.etag = '"v2"'
+    feed_server.body = _ics(("a", "20260301", "Open mic"), ("c", "20260303", "Blues jam"))
+    assert sync_calendar_feeds(db, now=later + timedelta(days=1)) == 2
+    assert _titles(db) == ["Blues jam", "Open mic"]
+
+
+def test_request_goes_to_the_checked_address(db, feed_server, add_feed, allow_private, monkeypatch):
+    real_getaddrinfo = socket.getaddrinfo
+    lookups: list[str] = []
+
+    def fake_getaddrinfo(host, *args, **kwargs):
+        if host == "feeds.test":
+            lookups.append(host)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 0))]
+        return real_getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    add_feed(feed_server.url("feeds.test"))
+    feed_server.body = _ics(("a", "20260301", "Open mic"))
+
+    assert sync_calendar_feeds(db) == 1
+    # Resolved once, by the check; the connection reused its answer
+    assert lookups == ["feeds.test"]
+    assert feed_server.requests[0]["Host"] == f"feeds.test:{feed_server.port}"
+
+
+def test_private_host_is_refused(db, feed_server, add_feed):
+    feed = add_feed(feed_server.url())
+
+    assert sync_calendar_feeds(db) == 0
+
+    db.refresh(feed)
+    assert feed.failure_count == 1
+    assert "non-public" in feed.last_error
+    assert feed_server.requests == []
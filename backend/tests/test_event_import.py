@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.event_import_job import EventImportJob
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services import event_import
+
+ICS = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//EN
+BEGIN:VEVENT
+UID:one@example.com
+DTSTART;VALUE=DATE:20260301
+SUMMARY:Open mic
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+@pytest.fixture
+def venue(db, monkeypatch, session_factory):
+    monkeypatch.setattr(event_import, "SessionLocal", session_factory)
+    db.add(User(id="venue-user", email="venue@example.com", password_hash="x", role=UserRole.venue))
+    db.add(VenueProfile(id="venue-1", user_id="venue-user", venue_name="The Venue"))
+    db.commit()
+    return "venue-1"
+
+
+def _upload(client, auth):
+    return client.post(
+        "/events/import",
+        params={"background": "true"},
+        files={"file": ("events.ics", ICS, "text/calendar")},
+        headers=auth("venue-user"),
+    )
+
+
+def _job(venue_id: str, status: str, heartbeat_at: datetime | None = None) -> EventImportJob:
+    return EventImportJob(
+        id=str(uuid.uuid4()),
+        venue_profile_id=venue_id,
+        created_by_user_id="venue-user",
+        status=status,
+        errors=[],
+        heartbeat_at=heartbeat_at,
+    )
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_background_import_completes_and_frees_its_slot(client, auth, venue, db, monkeypatch):
+    # ON CONFLICT ON CONSTRAINT is Postgres-only; stand in for the insert
+    monkeypatch.setattr(event_import, "insert_events", lambda db, venue_id, events: len(events))
+    monkeypatch.setattr(event_import, "_slots", threading.BoundedSemaphore(1))
+
+    resp = _upload(client, auth)
+
+    assert resp.status_code == 202
+    _wait_for(lambda: not event_import._futures)
+    db.expire_all()
+    job = db.get(EventImportJob, resp.json()["id"])
+    assert job.status == "completed"
+    assert job.imported == 1
+    # The slot went back: another job can be reserved
+    event_import.reserve_import_slot()
+    event_import.release_import_slot()
+
+
+def test_full_queue_is_rejected(client, auth, venue, db, monkeypatch):
+    monkeypatch.setattr(event_import, "_slots", threading.BoundedSemaphore(1))
+    event_import.reserve_import_slot()
+
+    resp = _upload(client, auth)
+
+    assert resp.status_code == 429
+    assert "Retry-After" in resp.headers
+    assert db.query(EventImportJob).count() == 0
+
+
+def test_venue_with_too_many_unfinished_jobs_is_rejected(client, auth, venue, db, monkeypatch):
+    monkeypatch.setattr(event_import.settings, "EVENT_IMPORT_MAX_UNFINISHED_PER_VENUE", 2)
+    db.add_all([_job(venue, "pending"), _job(venue, "running"), _job(venue, "completed")])
+    db.commit()
+
+    resp = _upload(client, auth)
+
+    assert resp.status_code == 429
+    assert db.query(EventImportJob).count() == 3
+
+
+def test_orphaned_jobs_are_failed(venue, db):
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=event_import.settings.EVENT_IMPORT_STALE_SECONDS + 60)
+    orphan, live, done = _job(venue, "running", stale), _job(venue, "running", now), _job(venue, "completed", stale)
+    db.add_all([orphan, live, done])
+    db.commit()
+
+    assert event_import.fail_orphaned_import_jobs(db) == 1
+    db.commit()
+
+    db.expire_all()
+    assert (orphan.status, live.status, done.status) == ("failed", "running", "completed")
+    assert orphan.finished_at is not None
+
+
+def test_shutdown_fails_queued_jobs(venue, db, monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_run(job_id: str, contents: bytes) -> None:
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(event_import, "_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(event_import, "_slots", threading.BoundedSemaphore(2))
+    monkeypatch.setattr(event_import, "run_import_job", blocking_run)
+    running, queued = _job(venue, "running"), _job(venue, "pending")
+    db.add_all([running, queued])
+    db.commit()
+    for job in (running, queued):
+        event_import.reserve_import_slot()
+        event_import.submit_import_job(job.id, ICS)
+    started.wait(5)
+
+    event_import.shutdown_import_executor()
+    release.set()
+
+    db.expire_all()
+    assert queued.status == "failed"
+    assert running.status == "running"
+    _wait_for(lambda: not event_import._futures)
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.zipcode import ZipCodeLookupError, ZipCodeResult
+from app.models.event import Event
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services import venue_geocoding
+
+MANHATTAN = ZipCodeResult(lat=40.7506, lng=-73.9972, city="New York", state="NY")
+BROOKLYN = ZipCodeResult(lat=40.6782, lng=-73.9442, city="Brooklyn", state="NY")
+BOSTON = ZipCodeResult(lat=42.3601, lng=-71.0589, city="Boston", state="MA")
+ZIPS = {"10001": MANHATTAN, "11201": BROOKLYN, "02108": BOSTON}
+
+
+@pytest.fixture
+def venues(db):
+    tomorrow = date.today() + timedelta(days=1)
+    for i, (zip_code, c) in enumerate(ZIPS.items()):
+        db.add(User(id=f"venue-user-{i}", email=f"v{i}@example.com", password_hash="x", role=UserRole.venue))
+        db.add(
+            VenueProfile(
+                id=f"venue-{zip_code}",
+                user_id=f"venue-user-{i}",
+                venue_name=c.city,
+                zip_code=zip_code,
+                latitude=c.lat,
+                longitude=c.lng,
+                geocoded_zip=zip_code,
+            )
+        )
+        db.add(
+            Event(
+                id=f"event-{zip_code}",
+                venue_profile_id=f"venue-{zip_code}",
+                title=f"Show in {c.city}",
+                description="",
+                date=tomorrow,
+            )
+        )
+    db.commit()
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Zip codes looked up, in order; unknown zips resolve to None."""
+    seen: list[str] = []
+
+    async def fake_lookup(zip_code: str):
+        seen.append(zip_code)
+        return ZIPS.get(zip_code)
+
+    monkeypatch.setattr("app.api.routes.events.lookup_zipcode", fake_lookup)
+    monkeypatch.setattr(venue_geocoding, "fetch_zipcode", fake_lookup)
+    return seen
+
+
+def test_near_filters_on_stored_coordinates(client, venues, lookups):
+    resp = client.get("/events", params={"near": "10001", "radius": 25})
+
+    assert resp.status_code == 200
+    assert sorted(e["venue_id"] for e in resp.json()) == ["venue-10001", "venue-11201"]
+    # Only the center is looked up, never the venues
+    assert lookups == ["10001"]
+
+
+def test_near_unknown_zip_is_rejected(client, venues, lookups):
+    resp = client.get("/events", params={"near": "99999"})
+
+    assert resp.status_code == 400
+
+
+def test_geocode_venues_bounds_concurrency(db, monkeypatch):
+    in_flight = peak = 0
+
+    async def slow_lookup(zip_code: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ZipCodeResult(lat=40.0, lng=-74.0, city="", state="")
+
+    monkeypatch.setattr(venue_geocoding, "fetch_zipcode", slow_lookup)
+    for i in range(30):
+        db.add(User(id=f"u{i}", email=f"u{i}@example.com", password_hash="x", role=UserRole.venue))
+        db.add(VenueProfile(id=f"v{i}", user_id=f"u{i}", venue_name="V", zip_code=f"{10000 + i}"))
+    db.commit()
+
+    assert venue_geocoding.geocode_venues(db) == 30
+    db.commit()
+
+    assert peak <= venue_geocoding.GEOCODE_CONCURRENCY
+    assert db.query(VenueProfile).filter(VenueProfile.latitude.is_(None)).count() == 0
+    # Nothing left to do until a zip code changes
+    assert venue_geocoding.geocode_venues(db) == 0
+
+
+def test_geocode_venues_retries_failed_lookups(db, monkeypatch):
+    failing = True
+
+    async def flaky_lookup(zip_code: str):
+        if zip_code == "10001" and failing:
+            raise ZipCodeLookupError(zip_code)
+        return ZIPS.get(zip_code)
+
+    monkeypatch.setattr(venue_geocoding, "fetch_zipcode", flaky_lookup)
+    for i, zip_code in enumerate(["10001", "99999"]):
+        db.add(User(id=f"u{i}", email=f"u{i}@example.com", password_hash="x", role=UserRole.venue))
+        db.add(VenueProfile(id=f"v{zip_code}", user_id=f"u{i}", venue_name="V", zip_code=zip_code))
+    db.commit()
+
+    assert venue_geocoding.geocode_venues(db) == 1
+    db.commit()
+    # The unknown zip is settled; the failed one stays pending
+    assert db.get(VenueProfile, "v99999").geocoded_zip == "99999"
+    assert db.get(VenueProfile, "v10001").geocoded_zip is None
+
+    failing = False
+    assert venue_geocoding.geocode_venues(db) == 1
+    db.commit()
+    venue = db.get(VenueProfile, "v10001")
+    db.refresh(venue)
+    assert (venue.latitude, venue.geocoded_zip) == (MANHATTAN.lat, "10001")
@@ -0,0 +1,189 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.artist import ArtistProfile
+from app.models.gig import Gig, GigStatus
+from app.models.relationship_log import RelationshipLog
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services.calendar_export import feed_cache
+
+
+@pytest.fixture
+def gig(db):
+    db.add_all(
+        [
+            User(id="artist-user", email="artist@example.com", password_hash="x", role=UserRole.artist),
+            User(id="venue-user", email="venue@example.com", password_hash="x", role=UserRole.venue),
+            ArtistProfile(id="artist-1", user_id="artist-user", name="The Artists"),
+            VenueProfile(id="venue-1", user_id="venue-user", venue_name="The Venue"),
+            Gig(
+                id="gig-1",
+                artist_profile_id="artist-1",
+                venue_profile_id="venue-1",
+                title="Friday show",
+                date=date(2026, 1, 9),
+                status=GigStatus.upcoming,
+                created_by_user_id="artist-user",
+            ),
+        ]
+    )
+    db.commit()
+    return SimpleNamespace(id="gig-1", artist_user_id="artist-user", venue_user_id="venue-user")
+
+
+@pytest.fixture
+def cached_feed():
+    """
+    The artist's JSON gig feed, cached with a stale body. ``stale()`` is True
+    while that body is still cached; ``reseed()`` caches it again.
+    """
+    key = ("artist", "artist-1", "json")
+
+    def reseed():
+        feed_cache.invalidate(key)
+        feed_cache.get_or_compute(key, lambda: b"stale")
+
+    reseed()
+    yield SimpleNamespace(
+        reseed=reseed,
+        stale=lambda: feed_cache.get_or_compute(key, lambda: b"fresh").body == b"stale",
+    )
+    feed_cache.clear()
+
+
+def _shape(sql: str) -> str:
+    """'SELECT gigs' / 'UPDATE gigs' / 'INSERT INTO relationship_logs' ..."""
+    words = sql.split()
+    verb = words[0]
+    if verb == "SELECT":
+        table = words[words.index("FROM") + 1]
+        return f"SELECT {table}" + (" FOR UPDATE" if "FOR UPDATE" in sql else "")
+    if verb == "UPDATE":
+        return f"UPDATE {words[1]}" + (" RETURNING" if "RETURNING" in sql else "")
+    if verb in ("INSERT", "DELETE"):
+        return f"{verb} {words[2]}"
+    return verb
+
+
+# Everything a single-gig mutation does after authenticating the caller
+# (SELECT users): lock and load the gig with both parties, write it back with
+# RETURNING, then the log row, the stats upsert and both profiles' monthly
+# buckets.
+MUTATION_STATEMENTS = [
+    "SELECT users",
+    "SELECT gigs FOR UPDATE",
+    "UPDATE gigs RETURNING",
+    "INSERT relationship_logs",
+    "INSERT artist_stats",
+    "DELETE profile_monthly_stats",
+    "INSERT profile_monthly_stats",
+    "DELETE profile_monthly_stats",
+    "INSERT profile_monthly_stats",
+]
+
+
+def test_update_metrics_statement_count(client, auth, gig, statements):
+    resp = client.patch(
+        f"/gigs/{gig.id}/metrics",
+        json={"attendance": 120, "tickets_sold": 100},
+        headers=auth(gig.artist_user_id),
+    )
+
+    assert resp.status_code == 200
+    assert [_shape(s) for s in statements] == MUTATION_STATEMENTS
+
+
+def test_confirm_gig_statement_count(client, auth, gig, statements):
+    client.patch(
+        f"/gigs/{gig.id}/metrics",
+        json={"attendance": 120},
+        headers=auth(gig.artist_user_id),
+    )
+    statements.clear()
+
+    resp = client.post(f"/gigs/{gig.id}/confirm", headers=auth(gig.artist_user_id))
+
+    assert resp.status_code == 200
+    assert resp.json()["artist_confirmed"] is True
+    assert [_shape(s) for s in statements] == MUTATION_STATEMENTS
+
+
+def test_update_gig_status_statement_count(client, auth, gig, statements):
+    resp = client.patch(
+        f"/gigs/{gig.id}/status",
+        json={"status": "completed"},
+        headers=auth(gig.venue_user_id),
+    )
+
+    assert resp.status_code == 200
+    assert [_shape(s) for s in statements] == MUTATION_STATEMENTS
+
+
+def test_batch_metrics_with_expected_version(client, auth, gig, db):
+    resp = client.patch(
+        "/gigs/batch/metrics",
+        json={"items": [{"gig_id": gig.id, "attendance": 80, "expected_version": 1}]},
+        headers=auth(gig.artist_user_id),
+    )
+
+    assert resp.status_code == 200
+    result = resp.json()["results"][0]
+    assert result["ok"] is True
+    assert result["gig"]["version"] == 2
+    assert db.get(Gig, gig.id).attendance == 80
+    log = db.query(RelationshipLog).filter(RelationshipLog.entity_id == gig.id).one()
+    assert log.details["changes"] == {"attendance": 80}
+
+
+def test_batch_metrics_rejects_stale_version(client, auth, gig, db):
+    resp = client.patch(
+        "/gigs/batch/metrics",
+        json={"items": [{"gig_id": gig.id, "attendance": 80, "expected_version": 7}]},
+        headers=auth(gig.artist_user_id),
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["failed"] == 1
+    assert db.get(Gig, gig.id).attendance is None
+
+
+def test_batch_metrics_invalidates_gig_feed(client, auth, gig, cached_feed):
+    client.patch(
+        "/gigs/batch/metrics",
+        json={"items": [{"gig_id": gig.id, "attendance": 80}]},
+        headers=auth(gig.artist_user_id),
+    )
+
+    assert not cached_feed.stale()
+
+
+def test_batch_confirm_invalidates_gig_feed(client, auth, gig, cached_feed):
+    client.patch(f"/gigs/{gig.id}/metrics", json={"attendance": 80}, headers=auth(gig.artist_user_id))
+    cached_feed.reseed()
+
+    resp = client.post("/gigs/batch/confirm", json={"gig_ids": [gig.id]}, headers=auth(gig.venue_user_id))
+
+    assert resp.json()["succeeded"] == 1
+    assert not cached_feed.stale()
+
+
+
+def test_renaming_a_venue_changes_the_stats_etag(client, auth, gig, db):
+    db.get(Gig, gig.id).status = GigStatus.completed
+    db.commit()
+    first = client.get("/gigs/stats/artist-1")
+    etag = first.headers["ETag"]
+
+    client.post(
+        "/venue-profile",
+        json={"venue_name": "The New Venue", "address": ""},
+        headers=auth(gig.venue_user_id),
+    )
+    resp = client.get("/gigs/stats/artist-1", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert resp.json()["gig_history"][0]["venue_name"] == "The New Venue"
@@ -0,0 +1,95 @@
+from datetime import date
+
+import pytest
+
+from app.api.routes import leaderboards
+from app.models.artist import ArtistProfile
+from app.models.artist_venue_pair import ArtistVenuePair
+from app.models.gig import Gig, GigStatus
+from app.models.leaderboard import leaderboard_rollup, views_metadata
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services.leaderboard import refresh_artist_venue_pairs
+
+
+@pytest.fixture
+def rollup(engine):
+    """Five venues in the 'all' window, with 1..5 gigs and attendance for all but the first."""
+    views_metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            leaderboard_rollup.insert(),
+            [
+                {
+                    "entity_type": "venue",
+                    "profile_id": f"venue-{i}",
+                    "time_window": "all",
+                    "name": f"Venue {i}",
+                    "city": "",
+                    "state": "",
+                    "city_key": "",
+                    "state_key": "",
+                    "total_gigs": i,
+                    "verified_gigs": i,
+                    "total_attendance": 100 * i if i > 1 else None,
+                }
+                for i in range(1, 6)
+            ],
+        )
+    yield
+    leaderboards._cache.clear()
+
+
+def _order_by(sql: str) -> str:
+    return " ".join(sql.split("ORDER BY", 1)[1].split("LIMIT", 1)[0].split())
+
+
+def test_sorts_match_the_nulls_last_indexes(client, rollup, statements):
+    client.get("/leaderboards", params={"sort": "total_gigs"})
+    resp = client.get("/leaderboards/rank/venue-3", params={"metric": "total_attendance", "neighbors": 1})
+
+    assert [n["profile_id"] for n in resp.json()["neighbors"]] == ["venue-4", "venue-3", "venue-2"]
+    orders = [_order_by(s) for s in statements if "ORDER BY" in s]
+    assert orders == [
+        # The top lists, for venues and artists
+        "leaderboard_rollup.total_gigs DESC NULLS LAST, leaderboard_rollup.profile_id",
+        "leaderboard_rollup.total_gigs DESC NULLS LAST, leaderboard_rollup.profile_id",
+        # Rank neighbours above (a backward walk) and below
+        "leaderboard_rollup.total_attendance ASC NULLS FIRST, leaderboard_rollup.profile_id DESC",
+        "leaderboard_rollup.total_attendance DESC NULLS LAST, leaderboard_rollup.profile_id",
+    ]
+
+
+def test_artist_venue_pairs_count_non_cancelled_gigs(db):
+    db.add_all(
+        [
+            User(id="artist-user", email="a@example.com", password_hash="x", role=UserRole.artist),
+            User(id="venue-user", email="v@example.com", password_hash="x", role=UserRole.venue),
+            ArtistProfile(id="artist-1", user_id="artist-user", name="A"),
+            VenueProfile(id="venue-1", user_id="venue-user", venue_name="V"),
+        ]
+    )
+    gigs = [
+        Gig(
+            id=f"gig-{day}",
+            artist_profile_id="artist-1",
+            venue_profile_id="venue-1",
+            title="Show",
+            date=date(2026, 1, day),
+            status=GigStatus.upcoming,
+            created_by_user_id="artist-user",
+        )
+        for day in (9, 16)
+    ]
+    db.add_all(gigs)
+    refresh_artist_venue_pairs(db, gigs)
+    db.commit()
+    assert db.get(ArtistVenuePair, ("artist-1", "venue-1")).gig_count == 2
+
+    for gig in gigs:
+        gig.status = GigStatus.cancelled
+        refresh_artist_venue_pairs(db, [gig])
+        db.commit()
+
+    # A pair with no gigs left is gone, so it no longer counts as a counterpart
+    assert db.query(ArtistVenuePair).count() == 0
@@ -0,0 +1,112 @@
+import time
+from datetime import date
+
+import pytest
+
+from app.core.recurrence import (
+    MAX_RRULE_COUNT,
+    InvalidRecurrenceError,
+    build_rule,
+    occurrence_dates,
+    series_until,
+)
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+from app.services.event_import import parse_ics
+
+START = date(2026, 1, 5)  # a Monday
+
+
+def test_series_until_of_bounded_rules():
+    assert series_until("FREQ=WEEKLY;COUNT=3", START) == date(2026, 1, 19)
+    assert series_until("FREQ=DAILY;UNTIL=20260110T000000Z", START) == date(2026, 1, 10)
+    assert series_until("FREQ=WEEKLY", START) is None
+
+
+def test_far_until_is_capped_at_the_horizon():
+    t0 = time.perf_counter()
+    last = series_until("FREQ=DAILY;UNTIL=99991231T000000Z", START)
+
+    assert last == date(2031, 1, 5)
+    assert list(occurrence_dates("FREQ=DAILY;UNTIL=99991231T000000Z", START, date(2031, 1, 1)))[-1] == last
+    assert time.perf_counter() - t0 < 1
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        f"FREQ=DAILY;COUNT={MAX_RRULE_COUNT + 1}",
+        "FREQ=DAILY;COUNT=0",
+        "FREQ=WEEKLY;INTERVAL=0",
+        "FREQ=WEEKLY;INTERVAL=-1",
+        "FREQ=WEEKLY;INTERVAL=X",
+        "FREQ=WEEKLY;INTERVAL=1,2",
+        # Can never occur; dateutil would scan to year 9999 to find out
+        "FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30",
+        "FREQ=DAILY;BYSETPOS=2",
+        "FREQ=MONTHLY;BYDAY=6MO",
+        "FREQ=MONTHLY;BYDAY=5MO;BYMONTHDAY=1",
+        "FREQ=YEARLY;BYMONTH=1;BYDAY=53MO",
+        # First occurs in 2044, past the horizon
+        "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29;BYDAY=MO",
+    ],
+)
+def test_unbounded_or_empty_rules_are_rejected(value):
+    t0 = time.perf_counter()
+    with pytest.raises(InvalidRecurrenceError):
+        build_rule(value, START)
+    assert time.perf_counter() - t0 < 1
+
+
+def test_supported_rules_still_parse():
+    for value in (
+        "FREQ=MONTHLY;BYDAY=-1FR",
+        "FREQ=MONTHLY;BYMONTHDAY=13;BYDAY=FR",
+        "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29",
+        "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;WKST=SU",
+    ):
+        build_rule(value, START)
+
+
+def test_parse_ics_flags_what_it_cannot_store():
+    parsed = parse_ics(
+        b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//EN
+BEGIN:VEVENT
+UID:series@example.com
+DTSTART;VALUE=DATE:20260105
+RRULE:FREQ=WEEKLY
+EXDATE;VALUE=DATE:20260112
+SUMMARY:Jazz night
+END:VEVENT
+BEGIN:VEVENT
+UID:series@example.com
+RECURRENCE-ID;VALUE=DATE:20260119
+DTSTART;VALUE=DATE:20260120
+SUMMARY:Jazz night (moved)
+END:VEVENT
+END:VCALENDAR
+"""
+    )
+
+    assert [e["title"] for e in parsed.events] == ["Jazz night"]
+    assert parsed.events[0]["rrule"] == "FREQ=WEEKLY"
+    assert parsed.skipped == 1
+    assert len(parsed.errors) == 2
+    assert "excluded dates" in parsed.errors[0]
+    assert "single occurrence" in parsed.errors[1]
+
+
+def test_zero_interval_is_rejected_on_create(client, auth, db):
+    db.add(User(id="venue-user", email="venue@example.com", password_hash="x", role=UserRole.venue))
+    db.add(VenueProfile(id="venue-1", user_id="venue-user", venue_name="The Venue"))
+    db.commit()
+
+    resp = client.post(
+        "/events",
+        json={"title": "Open mic", "description": "", "date": "2026-01-05", "rrule": "FREQ=WEEKLY;INTERVAL=0"},
+        headers=auth("venue-user"),
+    )
+
+    assert resp.status_code == 422
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.models.job_run import JobRun
+from app.services import scheduler
+from app.services.scheduler import PeriodicJob, prune_job_runs, run_job_once
+
+
+def test_prune_job_runs_keeps_recent_runs(db):
+    now = datetime.now(timezone.utc)
+    retention = timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+    for i, started_at in enumerate(
+        [now - retention - timedelta(days=1), now - retention + timedelta(hours=1), now]
+    ):
+        db.add(JobRun(id=f"run-{i}", job_name="gig_closeout", started_at=started_at, duration_ms=5))
+    db.commit()
+
+    assert prune_job_runs(db) == 1
+    db.commit()
+    assert sorted(r.id for r in db.query(JobRun)) == ["run-1", "run-2"]
+
+
+def test_failed_job_is_recorded_before_its_lock_is_released(session_factory, monkeypatch):
+    runs_at_unlock: list[int] = []
+
+    @contextmanager
+    def fake_lock(name: str):
+        yield True
+        check = session_factory()
+        runs_at_unlock.append(check.query(JobRun).filter(JobRun.job_name == name).count())
+        check.close()
+
+    def failing_job(db) -> int:
+        # Commits as it goes, then fails
+        db.commit()
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(scheduler, "_job_lock", fake_lock)
+    monkeypatch.setattr(scheduler, "SessionLocal", session_factory)
+
+    assert run_job_once(PeriodicJob(name="flaky", interval_seconds=60, func=failing_job))
+
+    assert runs_at_unlock == [1]
+    run = session_factory().query(JobRun).one()
+    assert "boom" in run.error
+
+
+def test_job_lock_is_held_across_the_jobs_own_commits(session_factory, monkeypatch):
+    held: list[bool] = []
+    lock = {"held": False}
+
+    @contextmanager
+    def fake_lock(name: str):
+        lock["held"] = True
+        yield True
+        lock["held"] = False
+
+    def leasing_job(db) -> int:
+        # Like spotify_refresh: commit a lease, then do the slow part
+        db.commit()
+        held.append(lock["held"])
+        return 0
+
+    monkeypatch.setattr(scheduler, "_job_lock", fake_lock)
+    monkeypatch.setattr(scheduler, "SessionLocal", session_factory)
+
+    run_job_once(PeriodicJob(name="spotify_refresh", interval_seconds=60, func=leasing_job))
+
+    assert held == [True]
+    assert not lock["held"]
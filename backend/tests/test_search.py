@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.artist import ArtistProfile
+from app.models.spotify_connection import SpotifyConnection
+from app.models.user import User, UserRole
+
+# name -> (followers, popularity); None for an artist without a connection
+ARTISTS = {
+    "big": (50_000, 70),
+    "small": (500, 30),
+    "tied": (800, 30),
+    "unconnected": None,
+}
+
+
+@pytest.fixture
+def artists(db):
+    db.add(User(id="searcher", email="s@example.com", password_hash="x", role=UserRole.venue))
+    for name, spotify in ARTISTS.items():
+        db.add(User(id=f"user-{name}", email=f"{name}@example.com", password_hash="x", role=UserRole.artist))
+        db.add(ArtistProfile(id=name, user_id=f"user-{name}", name=name))
+        if spotify:
+            followers, popularity = spotify
+            db.add(
+                SpotifyConnection(
+                    id=f"conn-{name}",
+                    artist_profile_id=name,
+                    spotify_user_id=name,
+                    access_token="x",
+                    refresh_token="x",
+                    token_expires_at=datetime.now(timezone.utc),
+                    followers=followers,
+                    popularity=popularity,
+                )
+            )
+    db.commit()
+
+
+def _search(client, auth, **params) -> list[str]:
+    resp = client.get("/search/artists", params=params, headers=auth("searcher"))
+    assert resp.status_code == 200
+    return [a["id"] for a in resp.json()]
+
+
+def test_min_followers_and_popularity_skip_unconnected_artists(client, auth, artists):
+    assert sorted(_search(client, auth, min_followers=800)) == ["big", "tied"]
+    assert _search(client, auth, min_popularity=50) == ["big"]
+    assert sorted(_search(client, auth, min_followers=0)) == ["big", "small", "tied"]
+
+
+def test_negative_min_followers_is_rejected(client, auth, artists):
+    resp = client.get("/search/artists", params={"min_followers": -1}, headers=auth("searcher"))
+
+    assert resp.status_code == 422
+
+
+def test_spotify_popularity_sort_lists_unconnected_artists_last(client, auth, artists):
+    # Ties on popularity break on followers
+    assert _search(client, auth, sort="spotify_popularity") == ["big", "tied", "small", "unconnected"]
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.models.artist import ArtistProfile
+from app.models.spotify_connection import SpotifyConnection
+from app.models.user import User, UserRole
+from app.services import spotify
+
+
+def test_refresh_expiring_tokens_skips_connections_with_fresh_details(db, monkeypatch):
+    renewed: list[str] = []
+
+    async def fake_refresh(refresh_token: str) -> dict:
+        renewed.append(refresh_token)
+        return {"access_token": f"new-{refresh_token}", "expires_in": 3600}
+
+    monkeypatch.setattr(spotify, "refresh_access_token", fake_refresh)
+    now = datetime.now(timezone.utc)
+    fresh = now - timedelta(days=1)
+    stale = now - timedelta(days=spotify.DETAILS_TTL_DAYS + 1)
+    # name -> (details_fetched_at, refresh_due_at)
+    cases = {
+        "never-fetched": (None, now),
+        "stale-details": (stale, now),
+        "fresh-details": (fresh, now),
+        "not-due": (stale, now + timedelta(days=1)),
+    }
+    for name, (details_fetched_at, refresh_due_at) in cases.items():
+        db.add(User(id=f"user-{name}", email=f"{name}@example.com", password_hash="x", role=UserRole.artist))
+        db.add(ArtistProfile(id=f"artist-{name}", user_id=f"user-{name}", name=name))
+        db.add(
+            SpotifyConnection(
+                id=name,
+                artist_profile_id=f"artist-{name}",
+                spotify_user_id=name,
+                access_token="old",
+                refresh_token=name,
+                token_expires_at=now + timedelta(seconds=60),
+                details_fetched_at=details_fetched_at,
+                refresh_due_at=refresh_due_at,
+            )
+        )
+    db.commit()
+
+    assert spotify.refresh_expiring_tokens(db) == 2
+    db.commit()
+
+    assert sorted(renewed) == ["never-fetched", "stale-details"]
+    assert db.get(SpotifyConnection, "fresh-details").access_token == "old"
+
+
+def test_concurrent_callers_share_one_token_refresh(db, session_factory, monkeypatch):
+    calls: list[str] = []
+
+    async def fake_refresh(refresh_token: str) -> dict:
+        calls.append(refresh_token)
+        # Long enough for every caller to arrive while it is in flight
+        await asyncio.sleep(0.05)
+        return {"access_token": "new", "expires_in": 3600}
+
+    token_fresh = spotify._token_fresh
+
+    def aware_token_fresh(conn, now):
+        # SQLite drops the time zone that Postgres keeps
+        return token_fresh(
+            SimpleNamespace(token_expires_at=conn.token_expires_at.replace(tzinfo=timezone.utc)), now
+        )
+
+    monkeypatch.setattr(spotify, "refresh_access_token", fake_refresh)
+    monkeypatch.setattr(spotify, "SessionLocal", session_factory)
+    monkeypatch.setattr(spotify, "_token_fresh", aware_token_fresh)
+    db.add(User(id="user-1", email="a@example.com", password_hash="x", role=UserRole.artist))
+    db.add(ArtistProfile(id="artist-1", user_id="user-1", name="A"))
+    conn = SpotifyConnection(
+        id="conn-1",
+        artist_profile_id="artist-1",
+        spotify_user_id="spotify-1",
+        access_token="old",
+        refresh_token="refresh-1",
+        token_expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    db.add(conn)
+    db.commit()
+    db.refresh(conn)
+
+    async def callers():
+        return await asyncio.gather(*(spotify._ensure_valid_token(db, conn) for _ in range(5)))
+
+    assert asyncio.run(callers()) == ["new"] * 5
+    assert calls == ["refresh-1"]
+    assert db.get(SpotifyConnection, "conn-1").access_token != "old"
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.artist import ArtistProfile
+from app.models.spotify_metric_point import SpotifyMetricPoint
+from app.models.user import User, UserRole
+from app.services.spotify_metrics import (
+    DAILY_RETENTION_DAYS,
+    FOLD_WINDOW_DAYS,
+    downsample_metric_points,
+    metric_growth,
+)
+
+
+@pytest.fixture
+def artist(db):
+    db.add(User(id="artist-user", email="a@example.com", password_hash="x", role=UserRole.artist))
+    db.add(ArtistProfile(id="artist-1", user_id="artist-user", name="A"))
+    db.commit()
+    return "artist-1"
+
+
+def _points(db, artist_id: str) -> dict[date, tuple]:
+    return {
+        p.day: (p.followers, p.popularity)
+        for p in db.query(SpotifyMetricPoint).filter_by(artist_profile_id=artist_id)
+    }
+
+
+def test_downsample_folds_a_week_into_its_monday(db, artist):
+    cutoff = date.today() - timedelta(days=DAILY_RETENTION_DAYS)
+    # The latest Monday whose whole week is in the fold window
+    sunday = cutoff - timedelta(days=1)
+    while sunday.weekday() != 6:
+        sunday -= timedelta(days=1)
+    monday = sunday - timedelta(days=6)
+    assert monday >= cutoff - timedelta(days=FOLD_WINDOW_DAYS)
+    folded_earlier = monday - timedelta(weeks=4)
+    recent = cutoff + timedelta(days=3)
+    for day, followers, popularity in [
+        (folded_earlier, 50, 10),
+        (monday + timedelta(days=1), 100, 20),
+        (monday + timedelta(days=3), 120, 25),
+        (recent, 200, 30),
+    ]:
+        db.add(
+            SpotifyMetricPoint(
+                artist_profile_id=artist, day=day, followers=followers, popularity=popularity
+            )
+        )
+    db.commit()
+
+    assert downsample_metric_points(db) == 2
+    db.commit()
+
+    assert _points(db, artist) == {
+        folded_earlier: (50, 10),
+        # The week's latest point, dated its Monday
+        monday: (120, 25),
+        recent: (200, 30),
+    }
+    # Running again changes nothing
+    assert downsample_metric_points(db) == 0
+
+
+def test_metric_growth_uses_each_metrics_known_endpoints(db, artist):
+    start = date.today() - timedelta(days=20)
+    for offset, followers, popularity in [(0, 100, None), (4, 150, 40), (8, None, 50)]:
+        db.add(
+            SpotifyMetricPoint(
+                artist_profile_id=artist,
+                day=start + timedelta(days=offset),
+                followers=followers,
+                popularity=popularity,
+            )
+        )
+    db.commit()
+
+    growth = metric_growth(db, artist, start)
+
+    assert growth["followers"] == {
+        "start": 100,
+        "end": 150,
+        "first_day": start,
+        "last_day": start + timedelta(days=4),
+        "change": 50,
+        "growth_pct": 50.0,
+        "per_day": 12.5,
+    }
+    assert (growth["popularity"]["start"], growth["popularity"]["end"]) == (40, 50)
+    assert growth["popularity"]["first_day"] == start + timedelta(days=4)
+    assert growth["monthly_listeners"] is None
+    assert metric_growth(db, artist, date.today()) == dict.fromkeys(growth)
@@ -0,0 +1,113 @@
+"""
+Benchmark: a venue with thousands of events.
+
+The profile read embeds only the next PROFILE_EVENTS_LIMIT events from one
+bounded query, so its cost must not grow with the venue's history; the full
+list is paged from GET /venue-profile/{id}/events. Timings are logged
+(``pytest --log-cli-level=INFO``); the assertions are on work done, which
+doesn't flake.
+"""
+
+import logging
+import time
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.api.routes.venues import PROFILE_EVENTS_LIMIT
+from app.models.event import Event
+from app.models.user import User, UserRole
+from app.models.venue import VenueProfile
+
+logger = logging.getLogger(__name__)
+
+BIG_VENUE_EVENTS = 1200
+PAGE_SIZE = 200
+
+
+def _add_venue(db, venue_id: str, n_events: int) -> None:
+    db.add(User(id=f"user-{venue_id}", email=f"{venue_id}@example.com", password_hash="x", role=UserRole.venue))
+    db.add(VenueProfile(id=venue_id, user_id=f"user-{venue_id}", venue_name=venue_id, city="Austin"))
+    db.flush()
+    today = date.today()
+    db.execute(
+        insert(Event),
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "venue_profile_id": venue_id,
+                "title": f"Show {i}",
+                "description": "",
+                "date": today + timedelta(days=i),
+            }
+            for i in range(n_events)
+        ],
+    )
+
+
+@pytest.fixture
+def venues(db):
+    _add_venue(db, "big-venue", BIG_VENUE_EVENTS)
+    _add_venue(db, "small-venue", 3)
+    db.commit()
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def test_profile_read_is_bounded_and_paging_covers_the_rest(client, venues, statements):
+    client.get("/venue-profile/small-venue")
+    statements.clear()
+    client.get("/venue-profile/small-venue")
+    small_statements = len(statements)
+    statements.clear()
+
+    resp, profile_ms = _timed(lambda: client.get("/venue-profile/big-venue"))
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["events"]) == PROFILE_EVENTS_LIMIT
+    assert body["has_more_events"] is True
+    # No more queries than for a venue with three events (whose short page
+    # also has to look for recurring series past the cached window)
+    assert len(statements) <= small_statements
+
+    def page_all() -> tuple[list[str], int]:
+        ids: list[str] = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/venue-profile/big-venue/events", params=params)
+            assert page.status_code == 200
+            ids += [e["id"] for e in page.json()]
+            pages += 1
+            cursor = page.headers.get("X-Next-Cursor")
+            if not cursor:
+                return ids, pages
+
+    (ids, pages), paging_ms = _timed(page_all)
+
+    assert len(ids) == len(set(ids)) == BIG_VENUE_EVENTS
+    assert pages == -(-BIG_VENUE_EVENTS // PAGE_SIZE)
+    logger.info(
+        "profile read: %.1f ms; paging %d events: %.1f ms over %d pages",
+        profile_ms, BIG_VENUE_EVENTS, paging_ms, pages,
+    )
+
+
+def test_venue_search_does_not_load_events(client, auth, venues, statements):
+    headers = auth("user-small-venue")
+    resp, search_ms = _timed(
+        lambda: client.get("/search/venues", params={"city": "Austin"}, headers=headers)
+    )
+
+    assert resp.status_code == 200
+    assert {v["id"] for v in resp.json()} >= {"big-venue", "small-venue"}
+    assert not any(" events" in s.split("WHERE")[0] for s in statements)
+    logger.info("venue search over a %d-event venue: %.1f ms", BIG_VENUE_EVENTS, search_ms)
@@ -9,9 +9,17 @@ export default function SpotifyConnectButton() {
   const [err, setErr] = useState<string | null>(null);
 
   useEffect(() => {
-    apiFetch<SpotifyConnection>("/spotify/connection")
-      .then(setConnection)
-      .catch(() => {});
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const load = (retry: boolean) =>
+      apiFetch<SpotifyConnection>("/spotify/connection")
+        .then((c) => {
+          setConnection(c);
+          // Stale data is refreshed in the background; pick it up shortly
+          if (c.stale && retry) timer = setTimeout(() => load(false), 10000);
+        })
+        .catch(() => {});
+    load(true);
+    return () => clearTimeout(timer);
   }, []);
 
   const connect = async () => {
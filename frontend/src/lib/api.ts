@@ -116,4 +116,30 @@ export async function apiUpload<T>(path: string, formData: FormData): Promise<T>
   return data as T;
 }
 
-export { apiFetch };
+/**
+ * GET every page of a keyset-paginated list endpoint, following the
+ * X-Next-Cursor header until the last page.
+ */
+async function apiFetchAll<T>(path: string, pageSize = 200): Promise<T[]> {
+  const sep = path.includes("?") ? "&" : "?";
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = `limit=${pageSize}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+    const res = await fetch(`${API_URL}${path}${sep}${query}`, { credentials: "include" });
+
+    const text = await res.text();
+    const data = text ? JSON.parse(text) : null;
+
+    if (!res.ok) {
+      const msg = data?.detail ?? `Request failed: ${res.status}`;
+      throw new Error(msg);
+    }
+
+    items.push(...(data as T[]));
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
+export { apiFetch, apiFetchAll };
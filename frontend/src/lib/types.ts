@@ -21,6 +21,7 @@ export type VenueEvent = {
   title: string;
   description: string;
   date: string;
+  rrule?: string | null;
 };
 
 export type EventImportResult = {
@@ -38,6 +39,7 @@ export type VenueEventPublic = {
   venue_name: string;
   city: string;
   state: string;
+  rrule?: string | null;
 };
 
 export type Venue = {
@@ -54,6 +56,7 @@ export type Venue = {
   amenities: Record<string, unknown>;
   genres: string[];
   events: VenueEvent[];
+  has_more_events?: boolean;
 };
 
 export type Bookmark = {
@@ -63,7 +66,7 @@ export type Bookmark = {
   created_at: string;
 };
 
-export type GigStatus = "upcoming" | "completed" | "cancelled";
+export type GigStatus = "upcoming" | "pending_closeout" | "completed" | "cancelled";
 
 export type Gig = {
   id: string;
@@ -80,6 +83,7 @@ export type Gig = {
   gross_revenue_cents: number | null;
   artist_confirmed: boolean;
   venue_confirmed: boolean;
+  version: number;
   created_by_user_id: string;
   created_at: string;
   updated_at: string;
@@ -142,4 +146,5 @@ export type SpotifyConnection = {
   spotify_artist_id: string | null;
   spotify_data: Record<string, unknown>;
   data_fetched_at: string | null;
+  stale?: boolean;
 };
@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from "react";
 import type { CSSProperties } from "react";
 import { Link, useNavigate } from "react-router-dom";
-import { apiFetch } from "../lib/api";
+import { apiFetchAll } from "../lib/api";
 import { getRole } from "../lib/auth";
 import type { Gig, GigStatus } from "../lib/types";
 import { Card, Panel } from "../ui/Card";
@@ -14,7 +14,7 @@ type SeriesPoint = {
 };
 
 const statusClass = (s: GigStatus) =>
-  s === "upcoming"
+  s === "upcoming" || s === "pending_closeout"
     ? "pill statusUpcoming"
     : s === "completed"
       ? "pill statusCompleted"
@@ -210,7 +210,7 @@ export default function Dashboard() {
       setBusy(true);
       setErr(null);
       try {
-        const data = await apiFetch<Gig[]>("/gigs");
+        const data = await apiFetchAll<Gig>("/gigs");
         setGigs(data);
       } catch (e: any) {
         setErr(e.message ?? "Failed to load gigs");
@@ -123,7 +123,7 @@ export default function GigDetail() {
   }
 
   const statusClass = (s: GigStatus) =>
-    s === "upcoming"
+    s === "upcoming" || s === "pending_closeout"
       ? "pill statusUpcoming"
       : s === "completed"
         ? "pill statusCompleted"
@@ -315,7 +315,7 @@ export default function GigDetail() {
             )}
 
             {/* Status buttons */}
-            {gig.status === "upcoming" && (
+            {(gig.status === "upcoming" || gig.status === "pending_closeout") && (
               <>
                 <div className="divider" />
                 <div className="btnRow">
@@ -1,6 +1,6 @@
 import { type FormEvent, useEffect, useRef, useState } from "react";
 import { Link, useLocation, useNavigate } from "react-router-dom";
-import { apiFetch } from "../lib/api";
+import { apiFetch, apiFetchAll } from "../lib/api";
 import { getRole } from "../lib/auth";
 import type { Artist, Gig, GigStatus, Venue } from "../lib/types";
 import { Panel, Card } from "../ui/Card";
@@ -67,7 +67,7 @@ export default function Gigs() {
     setBusy(true);
     setErr(null);
     try {
-      const data = await apiFetch<Gig[]>("/gigs");
+      const data = await apiFetchAll<Gig>("/gigs");
       setGigs(data);
     } catch (e: any) {
       setErr(e.message ?? "Failed to load gigs");
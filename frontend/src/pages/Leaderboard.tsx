@@ -13,7 +13,8 @@ type VenueEntry = {
   total_attendance: number | null;
   avg_attendance: number | null;
   total_tickets_sold: number | null;
-  unique_artists: number;
+  total_revenue_cents: number | null;
+  unique_artists: number | null;
 };
 
 type ArtistEntry = {
@@ -26,7 +27,8 @@ type ArtistEntry = {
   total_attendance: number | null;
   avg_attendance: number | null;
   total_tickets_sold: number | null;
-  unique_venues: number;
+  total_revenue_cents: number | null;
+  unique_venues: number | null;
 };
 
 type LeaderboardData = {
@@ -211,7 +213,7 @@ export default function Leaderboard() {
                     <div className="lbStatLabel">Tickets</div>
                   </div>
                   <div className="lbStat">
-                    <div className="lbStatValue">{v.unique_artists}</div>
+                    <div className="lbStatValue">{v.unique_artists ?? "--"}</div>
                     <div className="lbStatLabel">Artists</div>
                   </div>
                   <div className="lbStat">
@@ -281,7 +283,7 @@ export default function Leaderboard() {
                     <div className="lbStatLabel">Tickets</div>
                   </div>
                   <div className="lbStat">
-                    <div className="lbStatValue">{a.unique_venues}</div>
+                    <div className="lbStatValue">{a.unique_venues ?? "--"}</div>
                     <div className="lbStatLabel">Venues</div>
                   </div>
                   <div className="lbStat">
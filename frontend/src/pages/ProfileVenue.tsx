@@ -101,9 +101,12 @@ export default function ProfileVenue() {
           genre_names: v.genres,
         }));
         setSelectedGenres(v.genres);
-        setEvents(v.events ?? []);
       })
       .catch(() => {});
+    // The profile only embeds the next few events; manage the full list
+    apiFetch<VenueEvent[]>("/events/mine")
+      .then(setEvents)
+      .catch(() => {});
   }, []);
 
   const onSubmit = async (e: FormEvent) => {
@@ -178,8 +181,8 @@ export default function ProfileVenue() {
       setImportErr("Please select a valid .ics (iCalendar) file.");
       return;
     }
-    if (file.size > 2 * 1024 * 1024) {
-      setImportErr("File is too large. Maximum size is 2 MB.");
+    if (file.size > 10 * 1024 * 1024) {
+      setImportErr("File is too large. Maximum size is 10 MB.");
       return;
     }
 
@@ -37,6 +37,8 @@ type ArtistResult = {
   distance_miles?: number | null;
   verified_gig_count: number;
   verified_avg_attendance: number | null;
+  spotify_followers: number | null;
+  spotify_popularity: number | null;
 };
 
 function csvToList(v: string) {
@@ -63,6 +65,8 @@ export default function SearchArtists() {
   const [distance, setDistance] = useState(params.get("distance_miles") ?? "25");
   const [maxRate, setMaxRate] = useState(params.get("max_rate") ?? "");
   const [minVerifiedGigs, setMinVerifiedGigs] = useState(params.get("min_verified_gigs") ?? "");
+  const [minFollowers, setMinFollowers] = useState(params.get("min_followers") ?? "");
+  const [minPopularity, setMinPopularity] = useState(params.get("min_popularity") ?? "");
   const [sort, setSort] = useState(params.get("sort") ?? "distance");
   const [genreDropdownOpen, setGenreDropdownOpen] = useState(false);
   const genreDropdownRef = useRef<HTMLDivElement>(null);
@@ -80,6 +84,8 @@ export default function SearchArtists() {
     genres.forEach((g) => p.append("genres", g));
     if (maxRate) p.set("max_rate", maxRate);
     if (minVerifiedGigs) p.set("min_verified_gigs", minVerifiedGigs);
+    if (minFollowers) p.set("min_followers", minFollowers);
+    if (minPopularity) p.set("min_popularity", minPopularity);
 
     // distance filters only if we have zip code
     if (distance && zipCode) {
@@ -88,7 +94,7 @@ export default function SearchArtists() {
     }
     p.set("sort", sort);
     return `/search/artists?${p.toString()}`;
-  }, [query, genres, zipCode, distance, maxRate, minVerifiedGigs, sort]);
+  }, [query, genres, zipCode, distance, maxRate, minVerifiedGigs, minFollowers, minPopularity, sort]);
 
   const syncUrl = () => {
     const p = new URLSearchParams();
@@ -98,6 +104,8 @@ export default function SearchArtists() {
     if (distance) p.set("distance_miles", distance);
     if (maxRate) p.set("max_rate", maxRate);
     if (minVerifiedGigs) p.set("min_verified_gigs", minVerifiedGigs);
+    if (minFollowers) p.set("min_followers", minFollowers);
+    if (minPopularity) p.set("min_popularity", minPopularity);
     if (sort) p.set("sort", sort);
     setParams(p, { replace: true });
   };
@@ -236,6 +244,22 @@ export default function SearchArtists() {
                 placeholder="e.g., 3"
               />
             </Field>
+            <Field label="Min Spotify followers">
+              <input
+                className="input"
+                value={minFollowers}
+                onChange={(e) => setMinFollowers(e.target.value)}
+                placeholder="e.g., 1000"
+              />
+            </Field>
+            <Field label="Min Spotify popularity" hint="0-100">
+              <input
+                className="input"
+                value={minPopularity}
+                onChange={(e) => setMinPopularity(e.target.value)}
+                placeholder="e.g., 30"
+              />
+            </Field>
           </div>
 
           <Field label="Sort by">
@@ -248,6 +272,7 @@ export default function SearchArtists() {
               <option value="draw">Self-reported draw</option>
               <option value="rate">Rate (lowest first)</option>
               <option value="verified_draw">Verified draw (highest first)</option>
+              <option value="spotify_popularity">Spotify popularity (highest first)</option>
             </select>
           </Field>
         </div>
@@ -297,6 +322,13 @@ export default function SearchArtists() {
                     Minimum rate: {a.min_rate}
                   </div>
 
+                  {a.spotify_followers != null && (
+                    <div className="smallMuted" style={{ marginTop: 4 }}>
+                      Spotify: {a.spotify_followers.toLocaleString()} followers
+                      {a.spotify_popularity != null ? ` • popularity ${a.spotify_popularity}` : ""}
+                    </div>
+                  )}
+
                   {a.verified_gig_count > 0 && (
                     <div style={{ display: "flex", gap: 8, alignItems: "center", marginTop: 8 }}>
                       <span className="verifiedBadge">
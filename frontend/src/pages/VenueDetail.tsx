@@ -212,7 +212,7 @@ export default function VenueDetail() {
                   <div className="sectionTitle">Upcoming Events</div>
                   <div style={{ display: "grid", gap: 8 }}>
                     {upcomingEvents.map((ev) => (
-                      <div className="card" key={ev.id}>
+                      <div className="card" key={`${ev.id}-${ev.date}`}>
                         <div style={{ display: "flex", justifyContent: "space-between", alignItems: "flex-start", gap: 8 }}>
                           <Link className="cardTitle" to={`/events/${ev.id}`}>{ev.title}</Link>
                           <div className="cardMeta">{ev.date}</div>
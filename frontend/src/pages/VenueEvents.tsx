@@ -89,7 +89,7 @@ export default function VenueEvents() {
         {!busy && !err && upcoming.length > 0 && (
           <div className="cardList">
             {upcoming.map((ev) => (
-              <Card key={ev.id}>
+              <Card key={`${ev.id}-${ev.date}`}>
                 <div style={{ display: "flex", justifyContent: "space-between", gap: 12, alignItems: "flex-start" }}>
                   <div style={{ minWidth: 0 }}>
                     <div style={{ display: "flex", gap: 10, alignItems: "baseline", flexWrap: "wrap" }}>
@@ -117,7 +117,7 @@ export default function VenueEvents() {
             <div className="sectionTitle">Past Events</div>
             <div className="cardList">
               {past.map((ev) => (
-                <Card key={ev.id}>
+                <Card key={`${ev.id}-${ev.date}`}>
                   <div style={{ display: "flex", justifyContent: "space-between", gap: 12, alignItems: "flex-start" }}>
                     <div style={{ minWidth: 0 }}>
                       <div style={{ display: "flex", gap: 10, alignItems: "baseline", flexWrap: "wrap" }}>